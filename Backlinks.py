@@ -0,0 +1,156 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import requests
+import pickle
+import os
+from urllib.parse import quote, unquote
+from CSRGraph import CSRGraph
+
+
+def title_to_url(title):
+    """Converts a Wikipedia page title into the URL form used by WikiCrawl.
+
+    Parameters
+    ----------
+    title : str
+        Page title as returned by the MediaWiki API, e.g. 'Alan Turing'.
+    Returns
+    -------
+    str
+        Full Wikipedia URL
+    """
+    return('https://en.wikipedia.org/wiki/' +
+           quote(title.replace(' ', '_'), safe=";@$!*(),/~:"))
+
+
+def url_to_title(url):
+    """Converts a Wikipedia URL back into a page title.
+
+    Parameters
+    ----------
+    url : str
+        Full Wikipedia URL
+    Returns
+    -------
+    str
+        Page title with spaces, e.g. 'Alan Turing'.
+    """
+    return(unquote(url[30:]).replace('_', ' '))
+
+
+class GraphBacklinks:
+    """Answers "What Links Here" From a Graph Built by WikiDump.
+    The directed graph built by WikiDump already holds every link it has seen,
+    so its predecessors are a reverse index of the crawled part of Wikipedia.
+    Pages the dump never crawled will have few or no backlinks.
+
+    Parameters
+    ----------
+    graph : networkx.DiGraph, CSRGraph or str
+        The graph built by WikiDump, the path to its *.pickle file or the
+        directory of a saved CSRGraph.
+    Examples
+    --------
+    >>> back = GraphBacklinks('Data/Full_WIKI.pickle')
+    >>> back.get_backlinks('https://en.wikipedia.org/wiki/Entscheidungsproblem')
+
+    """
+    def __init__(self, graph):
+        if isinstance(graph, str) and os.path.isdir(graph):
+            graph = CSRGraph.load(graph)
+        elif isinstance(graph, str):
+            with open(graph, 'rb') as handle:
+                graph = pickle.load(handle)
+        self._G = graph
+
+    def get_backlinks(self, url):
+        """Returns the pages in the graph that link to url.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page being linked to.
+        Returns
+        -------
+        list
+            List of URLs linking to url.
+        """
+        if url not in self._G:
+            return([])
+        return(list(self._G.predecessors(url)))
+
+
+class APIBacklinks:
+    """Answers "What Links Here" Through the MediaWiki Backlinks API.
+    Uses list=backlinks restricted to articles, following the API's continue
+    tokens until every backlink has been returned. Redirects to the page are
+    followed so their backlinks are included too.
+    The API counts every link on a page, including those in infoboxes,
+    navboxes and templates, while the forward search only follows links in
+    the body paragraphs. Some backlinks are therefore edges the forward
+    search would never take, and a bidirectional path through one can be
+    shorter than the one a breadth first search finds. GraphBacklinks built
+    from a WikiDump graph has the same links as the forward search.
+
+    Parameters
+    ----------
+    api_url : str
+        Endpoint of the MediaWiki Action API. Defaults to English Wikipedia.
+    fetcher : PageFetcher
+        The fetcher whose session and host routing are used. Default is None,
+        which uses a session of its own.
+    limit : int
+        Largest number of backlinks to return for a single page. Hub pages
+        have hundreds of thousands, default is 5,000.
+    Examples
+    --------
+    >>> back = APIBacklinks()
+    >>> back.get_backlinks('https://en.wikipedia.org/wiki/Entscheidungsproblem')
+
+    """
+    def __init__(self, api_url='https://en.wikipedia.org/w/api.php', fetcher=None, limit=5000):
+        self._api_url = api_url
+        self._limit = int(limit)
+        self._fetcher = fetcher
+        self._session = requests.Session()
+
+    def get_backlinks(self, url):
+        """Returns the articles that link to url.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page being linked to.
+        Returns
+        -------
+        list
+            List of URLs linking to url.
+        """
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'list': 'backlinks',
+            'bltitle': url_to_title(url),
+            'blnamespace': 0,
+            'bllimit': 'max',
+            'blredirect': 1
+        }
+        links = []
+        while len(links) < self._limit:
+            if self._fetcher is not None:
+                resp = self._fetcher.get(self._api_url, params=params).json()
+            else:
+                resp = self._session.get(self._api_url, params=params).json()
+            for x in resp.get('query', {}).get('backlinks', []):
+                # Pages Linking Through a Redirect Are Nested Under It
+                for r in x.get('redirlinks', []):
+                    links.append(title_to_url(r['title']))
+                if 'redirect' not in x:
+                    links.append(title_to_url(x['title']))
+            if 'continue' not in resp:
+                break
+            params.update(resp['continue'])
+        return(links[:self._limit])
@@ -0,0 +1,226 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+from collections import deque
+from contextlib import closing
+from multiprocessing import Pool
+from PageFetcher import PageFetcher
+from LinkSource import LinkReader
+from TitleIndex import TitleIndex
+from WikiCrawl import build_path, iter_retry
+
+# The BatchCrawl of Each Worker Process, Kept Between Sources
+_crawler = None
+
+
+def start_worker(settings):
+    """Creates the BatchCrawl used by a worker process."""
+    global _crawler
+    _crawler = BatchCrawl(**settings)
+
+
+def crawl_group(group):
+    """Answers the queries of one source in a worker process."""
+    return(_crawler.crawl_source(*group))
+
+
+class BatchCrawl:
+    """Answers Many Start/End Queries, Sharing One Crawl Per Start Page.
+    Groups the (start_url, end_url) pairs by start page and runs a single
+    breadth first search from each start page, which answers every end page
+    it reaches and stops once all of them are answered. Pages which fail
+    with an error worth retrying are read again once after the rest of their
+    level, and those which still fail are listed with the results. The links
+    of every page read are kept in a store shared by all start pages, so hub
+    pages reached from many starts are downloaded once. Nothing is printed,
+    each query gets a dict with its path, the number of clicks and the
+    number of pages the search read and downloaded.
+
+    Parameters
+    ----------
+    max_iter : int
+        The number of levels each search goes through before giving up on
+        the end pages it has not reached. Default is 6.
+    workers : int
+        The number of pages downloaded at once. Default is 8.
+    base_url : str
+        Sends requests for 'https://en.wikipedia.org' to another host, such
+        as a local stand-in server. Default is None.
+    cache : LinkCache
+        An on-disk cache of page titles and links, which is also how worker
+        processes share pages. Default is None.
+    parser : str
+        The LinkExtractor backend used to read links from pages. Default is
+        'lxml'.
+    link_source : str
+        Where the links of each page come from, 'html' or 'api', as for
+        WikiCrawl. Default is 'html'.
+    index : TitleIndex
+        The index of page titles and redirects. Default is None, which starts
+        an empty index.
+    processes : int
+        The number of processes the start pages are spread over. Each process
+        keeps its own link store, so share a cache between them. Default is
+        1, which answers everything in this process.
+    max_stored : int
+        The largest number of pages kept in the link store. The oldest are
+        dropped first. Default is 1,000,000.
+    Examples
+    --------
+    >>> batch = BatchCrawl(workers=16, cache=LinkCache('Data/linkcache.sqlite'))
+    >>> results = batch.run([('https://en.wiki.../Entscheidungsproblem',
+    >>> 'https://en.wiki.../My_Little_Pony:_Friendship_Is_Magic'),
+    >>> ('https://en.wiki.../Entscheidungsproblem', 'https://en.wiki.../Pony')])
+    >>> results[0]['clicks']
+    4
+
+    """
+    def __init__(self, max_iter=6, workers=8, base_url=None, cache=None, parser='lxml', link_source='html', index=None, processes=1, max_stored=1000000):
+        self._max_iter = int(max_iter)
+        self._processes = int(processes)
+        self._max_stored = max_stored
+        self._fetcher = PageFetcher(workers=workers, base_url=base_url)
+        self._index = index if index is not None else TitleIndex()
+        self._reader = LinkReader(self._fetcher, self._index, parser, link_source, cache=cache)
+        self._links = dict()
+        # What Each Worker Process Needs to Build Its Own BatchCrawl
+        self._settings = {'max_iter': max_iter, 'workers': workers, 'base_url': base_url,
+                          'cache': cache, 'parser': parser, 'link_source': link_source,
+                          'index': self._index, 'max_stored': max_stored}
+
+    def run(self, pairs):
+        """Answers every query.
+
+        Parameters
+        ----------
+        pairs : list
+            (start_url, end_url) tuples.
+        Returns
+        -------
+        list
+            One dict per pair, in the same order, holding 'start_url',
+            'end_url', 'path', 'titles', 'clicks', 'pages_fetched',
+            'pages_downloaded' and 'failed_urls'. 'path', 'titles' and
+            'clicks' are None if end_url was not reached within max_iter
+            clicks. 'failed_urls' lists the (url, error) of every page the
+            search from start_url could not read, which may have hidden a
+            shorter path.
+        """
+        groups = dict()
+        for start, end in pairs:
+            groups.setdefault(start, []).append(end)
+        found = dict()
+        if self._processes > 1:
+            with Pool(self._processes, initializer=start_worker, initargs=(self._settings,)) as pool:
+                for results in pool.imap_unordered(crawl_group, groups.items()):
+                    for r in results:
+                        found[(r['start_url'], r['end_url'])] = r
+        else:
+            for start, ends in groups.items():
+                for r in self.crawl_source(start, ends):
+                    found[(r['start_url'], r['end_url'])] = r
+        return([found[p] for p in pairs])
+
+    def crawl_source(self, start_url, end_urls):
+        """Runs a breadth first search from one start page until every end
+        page is reached or max_iter levels have been expanded.
+
+        Parameters
+        ----------
+        start_url : str
+            URL of the start page.
+        end_urls : list
+            URLs of the end pages to answer.
+        Returns
+        -------
+        list
+            One dict per end page, as returned by run.
+        """
+        downloads = self._reader.downloads
+        start = self._index.canonical(start_url)
+        targets = {self._index.canonical(x) for x in end_urls}
+        parents = {start: None}
+        reached = dict()
+        failed = []
+        read = 0
+        if start in targets:
+            reached[start] = (start, 0, 0)
+        frontier = deque([start])
+        for b in range(self._max_iter):
+            if len(frontier) == 0 or len(reached) == len(targets):
+                break
+            next_frontier = deque()
+            with closing(iter_retry(self.iter_links, frontier, failed)) as results:
+                for parent, urls in results:
+                    read += 1
+                    page = self._index.canonical(parent)
+                    if page != parent:
+                        # The Page Was a Redirect, so the Page It Leads to Was Reached
+                        if page in parents:
+                            continue
+                        # Reached in as Many Clicks as the Redirect, so Paths Go Through the Page Itself
+                        parents[page] = parents[parent]
+                        parent = page
+                        if page in targets:
+                            reached[page] = (page, read, self._reader.downloads - downloads)
+                    for x in urls:
+                        if x in parents:
+                            continue
+                        parents[x] = parent
+                        if x in targets and x not in reached:
+                            reached[x] = (x, read, self._reader.downloads - downloads)
+                        next_frontier.append(x)
+                    if len(reached) == len(targets):
+                        break
+            frontier = next_frontier
+        results = []
+        for end_url in end_urls:
+            url, fetched, downloaded = reached.get(self._index.canonical(end_url), (None, read, self._reader.downloads - downloads))
+            path = build_path(parents, url) if url is not None else None
+            results.append({
+                'start_url': start_url,
+                'end_url': end_url,
+                'path': path,
+                'titles': [self._index.title(x) for x in path] if path is not None else None,
+                'clicks': len(path) - 1 if path is not None else None,
+                'pages_fetched': fetched,
+                'pages_downloaded': downloaded,
+                'failed_urls': failed
+            })
+        return(results)
+
+    def iter_links(self, urls):
+        """Yields the links of many pages, first those already in the link
+        store and then those read concurrently, from the page HTML or from
+        the MediaWiki API in batches.
+
+        Parameters
+        ----------
+        urls : iterable
+            URLs of the pages to read.
+        Yields
+        ------
+        tuple
+            (url, links, error) where error is the exception raised reading
+            the page, or None if it succeeded.
+        """
+        todo = []
+        for url in urls:
+            if url in self._links:
+                yield((url, self._links[url], None))
+            else:
+                todo.append(url)
+        with closing(self._reader.iter_links(todo)) as results:
+            for url, links, error in results:
+                if error is None:
+                    self.store(url, links)
+                yield((url, links, error))
+
+    def store(self, url, links):
+        """Keeps the links of a page in the link store, dropping the oldest
+        page when it is full."""
+        if self._max_stored is not None and len(self._links) >= self._max_stored:
+            self._links.pop(next(iter(self._links)))
+        self._links[url] = links
@@ -0,0 +1,330 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import tempfile
+import contextlib
+import numpy as np
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from StandIn import WikiStandIn
+from WikiCrawl import WikiCrawl
+from WikiDump import WikiDump
+from ExportViz import ExportViz
+from CrawlFile import CrawlFile
+
+# Version of the Report Layout, Raised When Fields Change Meaning
+REPORT_VERSION = 1
+
+
+def power_law_graph(n, mean_links=20, exponent=2.5, max_links=1000, seed=0):
+    """Builds a synthetic link graph whose out-links and in-links both follow
+    a power law, the way Wikipedia's do. Each page also links to the next
+    one, so every page can be reached from every other.
+
+    Parameters
+    ----------
+    n : int
+        The number of pages, named 'Page_0' to 'Page_<n-1>'.
+    mean_links : int
+        The average number of links on a page. Default is 20.
+    exponent : float
+        Exponent of the power law, above 2. Default is 2.5.
+    max_links : int
+        The most links on one page. Default is 1,000.
+    seed : int
+        Random seed. Default is 0.
+    Returns
+    -------
+    dict
+        Maps each page name to the list of page names it links to, as
+        WikiStandIn takes.
+    """
+    rng = np.random.RandomState(seed)
+    alpha = exponent - 1
+    # Pareto Out-Degrees Scaled to the Mean, Less the Link to the Next Page
+    xmin = max(mean_links - 1, 1) * (alpha - 1) / alpha
+    degrees = np.minimum((rng.pareto(alpha, n) + 1) * xmin, min(max_links, n - 1)).astype(np.int64)
+    # Zipf In-Degrees Over a Random Order of the Pages
+    weights = np.empty(n)
+    weights[rng.permutation(n)] = np.arange(1, n + 1) ** (-1 / alpha)
+    targets = rng.choice(n, size=int(degrees.sum()), p=weights / weights.sum())
+    names = ['Page_{}'.format(i) for i in range(n)]
+    graph = dict()
+    start = 0
+    for i in range(n):
+        links = [(i + 1) % n] + targets[start:start + degrees[i]].tolist()
+        start += degrees[i]
+        graph[names[i]] = [names[x] for x in dict.fromkeys(links) if x != i]
+    return(graph)
+
+
+def serve(settings, conn):
+    """Builds the synthetic graph and serves it until told to stop, in its
+    own process so the server does not compete with the code being measured
+    for the interpreter lock. Answers 'count' on conn with the number of
+    requests served so far and 'links' with the number of links."""
+    graph = power_law_graph(settings['pages'], settings['mean_links'], settings['exponent'], seed=settings['seed'])
+    site = WikiStandIn(graph, latency=settings['latency'])
+    conn.send(site.start())
+    links = sum(len(x) for x in graph.values())
+    while True:
+        message = conn.recv()
+        if message == 'count':
+            conn.send(site.requests)
+        elif message == 'links':
+            conn.send(links)
+        else:
+            site.stop()
+            conn.send(None)
+            return
+
+
+def run_stage(bench, stage, args):
+    """Runs one stage of a benchmark in a fresh worker process and adds the
+    wall time and the peak resident memory of the process to its results."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = getattr(bench, stage)(*args)
+    results['seconds'] = time.perf_counter() - start
+    # ru_maxrss is in Kilobytes on Linux
+    results['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return(results)
+
+
+class Benchmark:
+    """End-to-End Benchmark of the Crawlers Against a Synthetic Wikipedia.
+    For each scale, generates a link graph with power-law degrees, serves it
+    as Wikipedia-shaped HTML and API JSON from a local WikiStandIn and runs
+    WikiCrawl.find_path on random pairs of pages, WikiDump.start_dump over
+    the whole graph and ExportViz on the largest crawl tree. The server runs
+    in its own process and every stage in a fresh one, so the peak memory of
+    each stage is measured on its own. The report is a JSON document meant
+    to be kept and compared between releases.
+
+    Parameters
+    ----------
+    scales : list
+        The numbers of pages in the graphs benchmarked. Default is
+        (1000, 10000).
+    queries : int
+        The number of find_path queries run at each scale. Default is 10.
+    latency : float
+        Seconds the server waits before answering each request. Default is
+        0, which measures the crawlers alone.
+    workers : int
+        The number of pages the crawlers download at once. Default is 8.
+    strategy : str
+        The WikiCrawl strategy used for the queries. Default is
+        'bidirectional'.
+    link_source : str
+        Where the crawlers read links from, 'html' or 'api'. Default is
+        'html'.
+    processes : int
+        The number of processes the crawlers parse pages in, as for
+        WikiDump. Default is None, which parses them on the download threads.
+    mean_links : int
+        The average number of links per page. Default is 20.
+    exponent : float
+        Exponent of the degree power law. Default is 2.5.
+    seed : int
+        Random seed of the graphs and queries. Default is 0.
+    Examples
+    --------
+    >>> bench = Benchmark(scales=[1000, 10000, 100000], latency=0.01)
+    >>> report = bench.run('Data/benchmark.json')
+    >>> report['scales'][0]['crawl']['latency_ms']['p50']
+
+    """
+    def __init__(self, scales=(1000, 10000), queries=10, latency=0.0, workers=8, strategy='bidirectional', link_source='html', processes=None, mean_links=20, exponent=2.5, seed=0):
+        self._scales = [int(x) for x in scales]
+        self._queries = int(queries)
+        self._latency = latency
+        self._workers = workers
+        self._strategy = strategy
+        self._link_source = link_source
+        self._processes = processes
+        self._mean_links = mean_links
+        self._exponent = exponent
+        self._seed = seed
+
+    def run(self, path=None):
+        """Benchmarks every scale.
+
+        Parameters
+        ----------
+        path : str
+            Where to write the report. Default is None, which only returns
+            it.
+        Returns
+        -------
+        dict
+            The report, holding the settings, the machine and one entry per
+            scale.
+        """
+        report = {
+            'version': REPORT_VERSION,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpus': os.cpu_count()},
+            'settings': {'queries': self._queries, 'latency': self._latency, 'workers': self._workers,
+                         'strategy': self._strategy, 'link_source': self._link_source,
+                         'processes': self._processes,
+                         'mean_links': self._mean_links, 'exponent': self._exponent, 'seed': self._seed},
+            'scales': [self.bench_scale(n) for n in self._scales]
+        }
+        if path is not None:
+            with open(path, 'w') as handle:
+                json.dump(report, handle, indent=1)
+        return(report)
+
+    def bench_scale(self, n):
+        """Benchmarks one scale, starting a server for it and running each
+        stage in a fresh process.
+
+        Parameters
+        ----------
+        n : int
+            The number of pages in the graph.
+        Returns
+        -------
+        dict
+            'pages', 'links' and the results of the 'crawl', 'dump' and
+            'export' stages.
+        """
+        ctx = mp.get_context('fork')
+        conn, child = ctx.Pipe()
+        settings = {'pages': n, 'mean_links': self._mean_links, 'exponent': self._exponent,
+                    'seed': self._seed, 'latency': self._latency}
+        start = time.perf_counter()
+        server = ctx.Process(target=serve, args=(settings, child), daemon=True)
+        server.start()
+        base_url = conn.recv()
+        conn.send('links')
+        result = {'pages': n, 'links': conn.recv(), 'generate_seconds': time.perf_counter() - start}
+        rng = np.random.RandomState(self._seed)
+        pairs = [tuple('https://en.wikipedia.org/wiki/Page_{}'.format(x) for x in rng.choice(n, 2, replace=False))
+                 for q in range(self._queries)]
+        workdir = tempfile.mkdtemp(prefix='wikiclicks-bench-')
+        try:
+            for stage, args in (('crawl', (base_url, pairs, workdir)), ('dump', (base_url, n, workdir)),
+                                ('export', (workdir,))):
+                conn.send('count')
+                before = conn.recv()
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    result[stage] = pool.submit(run_stage, self, stage, args).result()
+                conn.send('count')
+                result[stage]['requests'] = conn.recv() - before
+                if result[stage]['requests'] > 0:
+                    result[stage]['requests_per_second'] = result[stage]['requests'] / result[stage]['seconds']
+        finally:
+            conn.send('stop')
+            conn.recv()
+            server.join()
+            shutil.rmtree(workdir, ignore_errors=True)
+        return(result)
+
+    def crawl(self, base_url, pairs, workdir):
+        """Runs WikiCrawl.find_path on each pair and measures the latency of
+        each query."""
+        latencies = []
+        clicks = []
+        for start_url, end_url in pairs:
+            t = time.perf_counter()
+            wiki = WikiCrawl(start_url=start_url, end_url=end_url, save_path=workdir + '/',
+                             strategy=self._strategy, workers=self._workers, base_url=base_url,
+                             link_source=self._link_source, processes=self._processes)
+            wiki.find_path()
+            latencies.append(time.perf_counter() - t)
+            clicks.append(len(wiki.url_path) - 1 if hasattr(wiki, 'url_path') else None)
+        return({'queries': len(pairs), 'found': sum(x is not None for x in clicks),
+                'mean_clicks': float(np.mean([x for x in clicks if x is not None])) if any(x is not None for x in clicks) else None,
+                'latency_ms': self.percentiles(latencies)})
+
+    def dump(self, base_url, n, workdir):
+        """Runs WikiDump.start_dump over the whole graph, timing every
+        checkpoint, and adds the dump's own stage timers."""
+        dump = WikiDump(stop_count=n + 1, seed_page='https://en.wikipedia.org/wiki/Page_0',
+                        save_path=workdir + '/dump.pickle', save_increment=max(n // 10, 1),
+                        suppress_output=True, workers=self._workers, base_url=base_url,
+                        link_source=self._link_source, processes=self._processes)
+        checkpoints = []
+        checkpoint = dump.checkpoint
+
+        def timed():
+            t = time.perf_counter()
+            checkpoint()
+            checkpoints.append(time.perf_counter() - t)
+
+        dump.checkpoint = timed
+        t = time.perf_counter()
+        dump.start_dump()
+        seconds = time.perf_counter() - t
+        log = workdir + '/dump.log'
+        return({'pages_crawled': len(dump._viewed), 'nodes': len(dump._G),
+                'pages_per_second': len(dump._viewed) / seconds,
+                'checkpoint': {'count': len(checkpoints), 'total_seconds': float(sum(checkpoints)),
+                               'latency_ms': self.percentiles(checkpoints),
+                               'log_bytes': sum(os.path.getsize(os.path.join(log, x)) for x in os.listdir(log))},
+                'timers': dump.metrics.snapshot()['timers']})
+
+    def export(self, workdir):
+        """Runs ExportViz on the largest crawl tree saved by the queries,
+        pruned and whole."""
+        trees = [os.path.join(workdir, x) for x in os.listdir(workdir) if x.endswith('.crawl')]
+        trees = [x for x in trees if CrawlFile(x).header['completed']]
+        if len(trees) == 0:
+            return({'tree_pages': 0})
+        tree = max(trees, key=lambda x: CrawlFile(x).size())
+        exp = ExportViz(tree)
+        t = time.perf_counter()
+        exp.export_gexf(prune=True)
+        pruned = time.perf_counter() - t
+        t = time.perf_counter()
+        exp.export_stream(fmt='gexf')
+        whole = time.perf_counter() - t
+        return({'tree_pages': CrawlFile(tree).size(), 'pruned_seconds': pruned, 'stream_seconds': whole,
+                'stream_pages_per_second': CrawlFile(tree).size() / whole})
+
+    def percentiles(self, values):
+        """Returns the count, mean and 50th, 90th, 99th percentile and
+        largest of a list of durations in seconds, in milliseconds."""
+        if len(values) == 0:
+            return(None)
+        ms = np.array(values) * 1000
+        return({'count': len(ms), 'mean': float(ms.mean()), 'p50': float(np.percentile(ms, 50)),
+                'p90': float(np.percentile(ms, 90)), 'p99': float(np.percentile(ms, 99)),
+                'max': float(ms.max())})
+
+
+def main(argv=None):
+    """Command line entry point. Prints the report as JSON."""
+    parser = argparse.ArgumentParser(description='Benchmark the crawlers against a synthetic Wikipedia.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000], metavar='PAGES')
+    parser.add_argument('--queries', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--strategy', default='bidirectional', choices=['bfs', 'bidirectional'])
+    parser.add_argument('--link-source', default='html', choices=['html', 'api'])
+    parser.add_argument('--processes', type=int, default=None, help='processes parsing pages, default none')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='also write the report to this file')
+    args = parser.parse_args(argv)
+    bench = Benchmark(scales=args.scales, queries=args.queries, latency=args.latency, workers=args.workers,
+                      strategy=args.strategy, link_source=args.link_source, processes=args.processes,
+                      seed=args.seed)
+    print(json.dumps(bench.run(args.output), indent=1))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
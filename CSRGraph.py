@@ -0,0 +1,249 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import pickle
+import numpy as np
+import networkx as nx
+
+
+class CSRGraph:
+    """Compact Read-Only Link Graph Stored as Integer Arrays.
+    Holds the same directed graph as WikiDump's networkx DiGraph in a fraction
+    of the memory. Every URL gets an int32 id, its position in a sorted string
+    table, and the links are stored in compressed sparse row (CSR) form: the
+    links of page i are targets[offsets[i]:offsets[i+1]]. The reverse graph is
+    kept the same way for backlinks. Saved graphs are a directory of .npy
+    files which load memory-mapped, so a large graph opens in seconds and is
+    shared read-only between processes through the page cache.
+
+    Parameters
+    ----------
+    names : numpy.ndarray
+        uint8 array of every URL encoded as UTF-8, in sorted order.
+    name_offsets : numpy.ndarray
+        int64 array where URL i is names[name_offsets[i]:name_offsets[i+1]].
+    offsets : numpy.ndarray
+        int64 CSR row pointers of the links, one more than the node count.
+    targets : numpy.ndarray
+        int32 ids of the linked pages.
+    rev_offsets : numpy.ndarray
+        CSR row pointers of the backlinks. Default is None, which builds the
+        reverse graph the first time it is needed.
+    rev_targets : numpy.ndarray
+        int32 ids of the linking pages. Default is None.
+    Examples
+    --------
+    >>> # Convert a Previous WikiDump Pickle
+    >>> csr = CSRGraph.from_pickle('Data/Full_WIKI.pickle')
+    >>> csr.save('Data/Full_WIKI.csr')
+    >>>
+    >>> csr = CSRGraph.load('Data/Full_WIKI.csr')
+    >>> csr.successors('https://en.wikipedia.org/wiki/United_States')
+
+    """
+    FILES = ('names', 'name_offsets', 'offsets', 'targets', 'rev_offsets', 'rev_targets')
+
+    def __init__(self, names, name_offsets, offsets, targets, rev_offsets=None, rev_targets=None):
+        self._names = names
+        self._name_offsets = name_offsets
+        self._offsets = offsets
+        self._targets = targets
+        self._rev_offsets = rev_offsets
+        self._rev_targets = rev_targets
+
+    @classmethod
+    def from_networkx(cls, G):
+        """Builds a CSRGraph from a networkx DiGraph keyed by URL.
+
+        Parameters
+        ----------
+        G : networkx.DiGraph
+            The graph, such as WikiDump's _G.
+        Returns
+        -------
+        CSRGraph
+        """
+        urls = sorted(G.nodes())
+        ids = {u: i for i, u in enumerate(urls)}
+        encoded = [u.encode('utf-8') for u in urls]
+        name_offsets = np.zeros(len(urls)+1, dtype=np.int64)
+        np.cumsum([len(x) for x in encoded], out=name_offsets[1:])
+        names = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        m = G.number_of_edges()
+        src = np.fromiter((ids[u] for u, v in G.edges()), dtype=np.int32, count=m)
+        dst = np.fromiter((ids[v] for u, v in G.edges()), dtype=np.int32, count=m)
+        offsets, targets = cls.pack(src, dst, len(urls))
+        return(cls(names, name_offsets, offsets, targets))
+
+    @classmethod
+    def from_pickle(cls, path):
+        """Converts a graph pickled by WikiDump.
+
+        Parameters
+        ----------
+        path : str
+            Path of the *.pickle file holding the DiGraph.
+        Returns
+        -------
+        CSRGraph
+        """
+        with open(path, 'rb') as handle:
+            return(cls.from_networkx(pickle.load(handle)))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Opens a graph written by save.
+
+        Parameters
+        ----------
+        path : str
+            Directory the graph was saved to.
+        mmap : bool
+            True or False, default is True. If True the arrays are memory
+            mapped read-only instead of read into memory.
+        Returns
+        -------
+        CSRGraph
+        """
+        mode = 'r' if mmap is True else None
+        arrays = [np.load(os.path.join(path, x + '.npy'), mmap_mode=mode) for x in cls.FILES]
+        return(cls(*arrays))
+
+    @staticmethod
+    def pack(src, dst, n):
+        """Sorts an edge list into CSR arrays.
+
+        Parameters
+        ----------
+        src : numpy.ndarray
+            Source id of every edge.
+        dst : numpy.ndarray
+            Target id of every edge.
+        n : int
+            Number of nodes.
+        Returns
+        -------
+        tuple
+            (offsets, targets)
+        """
+        order = np.argsort(src, kind='stable')
+        offsets = np.zeros(n+1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        return((offsets, np.ascontiguousarray(dst[order], dtype=np.int32)))
+
+    def save(self, path):
+        """Writes the graph as .npy files, including the reverse graph.
+
+        Parameters
+        ----------
+        path : str
+            Directory to write to. It is created if needed.
+        """
+        self.reverse_arrays()
+        os.makedirs(path, exist_ok=True)
+        for x in self.FILES:
+            np.save(os.path.join(path, x + '.npy'), getattr(self, '_' + x))
+
+    def reverse_arrays(self):
+        """Returns the CSR arrays of the backlinks, building them if needed.
+
+        Returns
+        -------
+        tuple
+            (rev_offsets, rev_targets)
+        """
+        if self._rev_offsets is None:
+            n = self.number_of_nodes()
+            src = np.repeat(np.arange(n, dtype=np.int32), np.diff(self._offsets))
+            self._rev_offsets, self._rev_targets = self.pack(np.asarray(self._targets), src, n)
+        return((self._rev_offsets, self._rev_targets))
+
+    def number_of_nodes(self):
+        """Returns the number of pages in the graph."""
+        return(len(self._offsets) - 1)
+
+    def number_of_edges(self):
+        """Returns the number of links in the graph."""
+        return(len(self._targets))
+
+    def url(self, i):
+        """Returns the URL of node id i."""
+        return(bytes(self._names[self._name_offsets[i]:self._name_offsets[i+1]]).decode('utf-8'))
+
+    def index(self, url):
+        """Returns the id of a URL by binary search of the string table.
+
+        Parameters
+        ----------
+        url : str
+            Full Wikipedia URL
+        Returns
+        -------
+        int
+            The node id. Raises KeyError if the URL is not in the graph.
+        """
+        key = url.encode('utf-8')
+        lo, hi = 0, self.number_of_nodes()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            name = bytes(self._names[self._name_offsets[mid]:self._name_offsets[mid+1]])
+            if name < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.number_of_nodes() and self.url(lo) == url:
+            return(lo)
+        raise KeyError(url)
+
+    def __contains__(self, url):
+        try:
+            self.index(url)
+        except KeyError:
+            return(False)
+        return(True)
+
+    def successor_ids(self, i):
+        """Returns the ids linked from node id i."""
+        return(self._targets[self._offsets[i]:self._offsets[i+1]])
+
+    def predecessor_ids(self, i):
+        """Returns the ids linking to node id i."""
+        rev_offsets, rev_targets = self.reverse_arrays()
+        return(rev_targets[rev_offsets[i]:rev_offsets[i+1]])
+
+    def successors(self, url):
+        """Returns the URLs linked from a page."""
+        return([self.url(x) for x in self.successor_ids(self.index(url))])
+
+    def predecessors(self, url):
+        """Returns the URLs linking to a page."""
+        return([self.url(x) for x in self.predecessor_ids(self.index(url))])
+
+    def to_networkx(self, urls=None):
+        """Exports the graph, or the subgraph between some pages, as a
+        networkx DiGraph. Only use this for small subgraphs.
+
+        Parameters
+        ----------
+        urls : list
+            URLs of the pages to keep. Default is None, which exports every
+            page.
+        Returns
+        -------
+        networkx.DiGraph
+        """
+        if urls is None:
+            ids = np.arange(self.number_of_nodes())
+        else:
+            ids = np.array(sorted(self.index(u) for u in urls), dtype=np.int64)
+        keep = set(ids.tolist())
+        G = nx.DiGraph()
+        for i in ids:
+            G.add_node(self.url(i))
+            for j in self.successor_ids(i):
+                if int(j) in keep:
+                    G.add_edge(self.url(i), self.url(j))
+        return(G)
@@ -0,0 +1,250 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import pickle
+import networkx as nx
+from TitleIndex import merge_redirects
+
+
+class CheckpointLog:
+    """Append-Only Checkpoint Log for a Graph Being Crawled.
+    Instead of re-pickling the whole graph, each checkpoint writes only what
+    changed since the last one to a new numbered segment file: the pages added,
+    the links found on each crawled page, the pages marked as viewed with the
+    version of the page read and the pages found to be redirects. Pages read
+    again after they changed are recorded with the links replacing their
+    old ones. A segment is written to a temporary file, fsynced and then
+    atomically renamed into place, so a crash mid-write never damages what
+    was already saved. Should a segment still end in a torn record, as when
+    copied off a failing disk, replay stops at the last complete one.
+    Compaction folds every segment into a single snapshot, written the same
+    way, and removes the segments it covers.
+
+    Parameters
+    ----------
+    path : str
+        The directory holding the segments and snapshot. It is created if it
+        does not exist.
+    Examples
+    --------
+    >>> log = CheckpointLog('Data/Full_WIKI.log')
+    >>> log.record_page(url, links)
+    >>> log.checkpoint()
+    >>> G, viewed = log.replay()
+
+    """
+    def __init__(self, path):
+        self._path = path
+        os.makedirs(path, exist_ok=True)
+        self._pending = []
+        segments = self.segments()
+        self._next = segments[-1] + 1 if segments else self.snapshot_segment() + 1
+
+    def segments(self):
+        """Returns the numbers of the segments on disk, in order."""
+        return(sorted(int(x[8:-4]) for x in os.listdir(self._path)
+                      if x.startswith('segment-') and x.endswith('.log')))
+
+    def segment_path(self, number):
+        """Returns the file path of a segment."""
+        return(os.path.join(self._path, 'segment-{:08d}.log'.format(number)))
+
+    def snapshot_segment(self):
+        """Returns the last segment folded into the snapshot, or 0."""
+        marker = os.path.join(self._path, 'snapshot.segment')
+        if not os.path.exists(marker):
+            return(0)
+        with open(marker) as handle:
+            return(int(handle.read()))
+
+    def reset(self):
+        """Deletes every segment and the snapshot to start a new log."""
+        for x in os.listdir(self._path):
+            if x.startswith('segment-') or x.startswith('snapshot.') or x == 'refresh.time':
+                os.remove(os.path.join(self._path, x))
+        self._pending = []
+        self._next = 1
+
+    def record_node(self, url):
+        """Records a page added to the graph without any links yet."""
+        self._pending.append('N\t' + url + '\n')
+
+    def record_page(self, url, links, revision=None, replace=False):
+        """Records a crawled page and the links found on it.
+
+        Parameters
+        ----------
+        url : str
+            URL of the crawled page.
+        links : list
+            URLs linked from the page.
+        revision : str
+            The version of the page read, as given by PageFetcher.validator.
+            Default is None.
+        replace : bool
+            True if links replace every link recorded for the page before,
+            as when a page is read again after it changed. Default is False,
+            which adds them.
+        """
+        self._pending.append(('U\t' if replace is True else 'E\t') + '\t'.join([url] + list(links)) + '\n')
+        self._pending.append('V\t' + url + ('\t' + revision if revision is not None else '') + '\n')
+
+    def record_redirect(self, alias, target):
+        """Records that a page is a redirect and was merged into its target.
+
+        Parameters
+        ----------
+        alias : str
+            URL of the redirect.
+        target : str
+            URL of the page it redirects to.
+        """
+        self._pending.append('R\t' + alias + '\t' + target + '\n')
+
+    def record_refresh(self, when):
+        """Saves the time from which every crawled page is known to be up to
+        date, such as when the crawl or the last refresh started.
+
+        Parameters
+        ----------
+        when : float
+            Seconds since the epoch, as from time.time().
+        """
+        self.write_atomic(os.path.join(self._path, 'refresh.time'), repr(float(when)).encode())
+
+    def last_refresh(self):
+        """Returns the time saved by record_refresh, or None."""
+        marker = os.path.join(self._path, 'refresh.time')
+        if not os.path.exists(marker):
+            return(None)
+        with open(marker) as handle:
+            return(float(handle.read()))
+
+    def write_atomic(self, path, data):
+        """Writes bytes to path through a fsynced temporary file and an
+        atomic rename."""
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, path)
+        if hasattr(os, 'O_DIRECTORY'):
+            fd = os.open(self._path, os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def checkpoint(self):
+        """Writes everything recorded since the last checkpoint as a new
+        segment. Does nothing if nothing was recorded.
+
+        Returns
+        -------
+        int
+            The number of records written.
+        """
+        if len(self._pending) == 0:
+            return(0)
+        count = len(self._pending)
+        self.write_atomic(self.segment_path(self._next), ''.join(self._pending).encode('utf-8'))
+        self._next += 1
+        self._pending = []
+        return(count)
+
+    def replay(self):
+        """Rebuilds the graph and viewed pages from the snapshot, if there is
+        one, and the segments written after it.
+
+        Returns
+        -------
+        tuple
+            (G, viewed) where viewed maps each crawled page to the version
+            read, or 1 if none was recorded.
+        """
+        snapshot = os.path.join(self._path, 'snapshot.pickle')
+        G = nx.DiGraph()
+        viewed = dict()
+        if os.path.exists(snapshot):
+            with open(snapshot, 'rb') as handle:
+                G, viewed = pickle.load(handle)
+        done = self.snapshot_segment()
+        for number in self.segments():
+            if number <= done:
+                continue
+            with open(self.segment_path(number), encoding='utf-8', errors='replace') as handle:
+                for line in handle:
+                    # A Record Without Its Newline Was Torn Mid-Write
+                    if not line.endswith('\n'):
+                        break
+                    kind, *urls = line.rstrip('\n').split('\t')
+                    if kind == 'E':
+                        G.add_node(urls[0])
+                        for j in urls[1:]:
+                            G.add_edge(urls[0], j)
+                    elif kind == 'U':
+                        G.add_node(urls[0])
+                        G.remove_edges_from(list(G.out_edges(urls[0])))
+                        G.add_edges_from((urls[0], j) for j in urls[1:])
+                    elif kind == 'N':
+                        G.add_node(urls[0])
+                    elif kind == 'V':
+                        viewed[urls[0]] = urls[1] if len(urls) > 1 else 1
+                    elif kind == 'R':
+                        merge_redirects(G, {urls[0]: urls[1]})
+                        viewed.pop(urls[0], None)
+        return((G, viewed))
+
+    def redirects(self):
+        """Reads every redirect recorded in the log.
+
+        Returns
+        -------
+        dict
+            Maps the URL of each redirect to the URL it redirects to.
+        """
+        found = dict()
+        for number in self.segments():
+            with open(self.segment_path(number), encoding='utf-8', errors='replace') as handle:
+                for line in handle:
+                    if line.startswith('R\t') and line.endswith('\n'):
+                        kind, alias, target = line.rstrip('\n').split('\t')
+                        found[alias] = target
+        return(found)
+
+    def compact(self, G, viewed, refreshed=None):
+        """Folds the log into a snapshot of the graph and removes the
+        segments it replaces. Anything recorded but not yet checkpointed is
+        checkpointed first. The redirects are written again after the
+        snapshot, so redirects can still read them.
+
+        Parameters
+        ----------
+        G : networkx.DiGraph
+            The current graph, matching the log.
+        viewed : dict
+            The current viewed pages, matching the log.
+        refreshed : float
+            The time the graph was last brought up to date, as from
+            last_refresh of the log it was replayed from, saved as this
+            log's. Default is None, which keeps this log's.
+        """
+        self.checkpoint()
+        last = self._next - 1
+        redirects = self.redirects()
+        self.write_atomic(os.path.join(self._path, 'snapshot.pickle'),
+                          pickle.dumps((G, viewed), protocol=pickle.HIGHEST_PROTOCOL))
+        self.write_atomic(os.path.join(self._path, 'snapshot.segment'), str(last).encode())
+        if refreshed is not None:
+            self.record_refresh(refreshed)
+        for number in self.segments():
+            if number <= last:
+                os.remove(self.segment_path(number))
+        # Merging Them Again Changes Nothing, the Snapshot Has No Redirect Nodes
+        for alias in redirects:
+            self.record_redirect(alias, redirects[alias])
+        self.checkpoint()
@@ -0,0 +1,249 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import json
+import pickle
+import numpy as np
+
+# Columns of a Crawl File and the Type of Each Entry
+COLUMNS = (('name_offsets', np.int64), ('parents', np.int32), ('depths', np.uint8))
+
+
+class CrawlTree:
+    """Search Tree Built by WikiCrawl, Saved a Level at a Time.
+    Replaces the treelib Tree WikiCrawl used to pickle whole at every level.
+    Pages are kept in the order they were reached, each with the position of
+    the page it was reached from and its depth. save appends only the pages
+    added since the last save to a crawl directory, which CrawlFile opens
+    memory-mapped. create_node, contains and size work as they did on the
+    treelib Tree.
+
+    Parameters
+    ----------
+    None.
+    Examples
+    --------
+    >>> tree = CrawlTree()
+    >>> tree.create_node(start_url, start_url)
+    >>> tree.create_node(url, url, parent=start_url)
+    >>> tree.save('Data/start-end.crawl', {'start_url': start_url, 'end_url': end_url})
+
+    """
+    def __init__(self):
+        self._ids = dict()
+        self._urls = []
+        self._parents = []
+        self._depths = []
+        self._saved = 0
+        self._saved_path = None
+
+    def create_node(self, tag, identifier, parent=None):
+        """Adds a page reached from parent, or the root if parent is None.
+
+        Parameters
+        ----------
+        tag : str
+            Kept for compatibility with treelib, the identifier is used.
+        identifier : str
+            URL of the page.
+        parent : str
+            URL of the page it was reached from.
+        """
+        p = -1 if parent is None else self._ids[parent]
+        self._ids[identifier] = len(self._urls)
+        self._urls.append(identifier)
+        self._parents.append(p)
+        self._depths.append(0 if p < 0 else self._depths[p] + 1)
+
+    def contains(self, identifier):
+        """Returns True if the page is in the tree."""
+        return(identifier in self._ids)
+
+    def size(self):
+        """Returns the number of pages in the tree."""
+        return(len(self._urls))
+
+    def save(self, path, header):
+        """Appends the pages added since the last save to a crawl directory
+        and rewrites its header. The columns are written and fsynced first
+        and the header, which holds the page count, is replaced atomically
+        last, so a crash leaves the previous save readable.
+
+        Parameters
+        ----------
+        path : str
+            The crawl directory, e.g. 'Data/<start hash>-<end hash>.crawl'.
+        header : dict
+            Details of the search stored in the header, such as start_url,
+            end_url and completed.
+        """
+        os.makedirs(path, exist_ok=True)
+        if path != self._saved_path:
+            self._saved = 0
+            self._saved_path = path
+        new = self._urls[self._saved:]
+        mode = 'ab' if self._saved > 0 else 'wb'
+        encoded = [x.encode('utf-8') for x in new]
+        with open(os.path.join(path, 'names.bin'), mode) as handle:
+            start = handle.tell()
+            handle.write(b''.join(encoded))
+            handle.flush()
+            os.fsync(handle.fileno())
+        ends = start + np.cumsum([len(x) for x in encoded], dtype=np.int64)
+        columns = {
+            'name_offsets': np.concatenate([[0], ends]).astype(np.int64) if self._saved == 0 else ends,
+            'parents': np.array(self._parents[self._saved:], dtype=np.int32),
+            'depths': np.array(self._depths[self._saved:], dtype=np.uint8)
+        }
+        for name, dtype in COLUMNS:
+            with open(os.path.join(path, name + '.bin'), mode) as handle:
+                handle.write(columns[name].tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+        self._saved = len(self._urls)
+        info = {'format': 'wikiclicks-crawl', 'version': 1, 'nodes': self._saved,
+                'levels': int(max(self._depths)) + 1 if self._depths else 0}
+        info.update(header)
+        tmp = os.path.join(path, 'header.json.tmp')
+        with open(tmp, 'w') as handle:
+            json.dump(info, handle, indent=1)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, os.path.join(path, 'header.json'))
+
+
+class CrawlFile:
+    """Read-Only View of a Crawl Directory Saved by WikiCrawl.
+    The string table of URLs, the parent array and the depth array are
+    memory-mapped, so even a very large tree opens at once and only the
+    pages looked at are read. Only the pages counted in the header are used,
+    so a save cut short by a crash is ignored.
+
+    Parameters
+    ----------
+    path : str
+        The crawl directory.
+    Examples
+    --------
+    >>> crawl = CrawlFile('Data/b939c0ade3436e8945a03753d35722de39dfc84a-'+
+    >>> 'a2212e0647d7bc34252dd05124c2d98b3e3120f8.crawl')
+    >>> crawl.header['completed']
+    True
+    >>> crawl.path_to(crawl.header['end_url'])
+
+    """
+    def __init__(self, path):
+        self._path = path
+        with open(os.path.join(path, 'header.json')) as handle:
+            self.header = json.load(handle)
+        n = self.header['nodes']
+        self._name_offsets = np.memmap(os.path.join(path, 'name_offsets.bin'), dtype=np.int64, mode='r', shape=(n+1,))
+        self._names = np.memmap(os.path.join(path, 'names.bin'), dtype=np.uint8, mode='r',
+                                shape=(int(self._name_offsets[n]),))
+        self.parents = np.memmap(os.path.join(path, 'parents.bin'), dtype=np.int32, mode='r', shape=(n,))
+        self.depths = np.memmap(os.path.join(path, 'depths.bin'), dtype=np.uint8, mode='r', shape=(n,))
+        self._ids = None
+
+    @classmethod
+    def convert(cls, tree_path, path=None):
+        """Converts the pickle pair older versions of WikiCrawl saved into a
+        crawl directory.
+
+        Parameters
+        ----------
+        tree_path : str
+            Path of the tree's *.pickle file. Its KEY pickle is read too.
+        path : str
+            The crawl directory to write. Default is None, which uses
+            tree_path with .crawl in place of .pickle.
+        Returns
+        -------
+        CrawlFile
+        """
+        path = tree_path[:-7] + '.crawl' if path is None else path
+        with open(tree_path, 'rb') as handle:
+            old = pickle.load(handle)
+        with open(tree_path[:-7] + 'KEY.pickle', 'rb') as handle:
+            key = pickle.load(handle)
+        start, end = tree_path.split('/')[-1][:-7].split('-')
+        tree = CrawlTree()
+        level = [old.root]
+        tree.create_node(old.root, old.root)
+        while len(level) > 0:
+            nxt = []
+            for x in level:
+                for c in old.children(x):
+                    tree.create_node(c.identifier, c.identifier, parent=x)
+                    nxt.append(c.identifier)
+            level = nxt
+        tree.save(path, {'start_url': 'https://en.wikipedia.org/wiki/' + key[start],
+                         'end_url': 'https://en.wikipedia.org/wiki/' + key[end],
+                         'completed': key['Completed']})
+        return(cls(path))
+
+    def size(self):
+        """Returns the number of pages in the tree."""
+        return(len(self.parents))
+
+    def url(self, i):
+        """Returns the URL of page i."""
+        return(bytes(self._names[self._name_offsets[i]:self._name_offsets[i+1]]).decode('utf-8'))
+
+    def index(self, url):
+        """Returns the position of a URL, building the lookup table the
+        first time. Raises KeyError if the page is not in the tree."""
+        if self._ids is None:
+            self._ids = {self.url(i): i for i in range(self.size())}
+        return(self._ids[url])
+
+    def find(self, url):
+        """Returns the position of a URL without building the lookup table,
+        comparing only the names of the same length. Raises KeyError if the
+        page is not in the tree."""
+        if self._ids is not None:
+            return(self._ids[url])
+        name = url.encode('utf-8')
+        offsets = np.asarray(self._name_offsets)
+        for i in np.flatnonzero(np.diff(offsets) == len(name)).tolist():
+            if bytes(self._names[offsets[i]:offsets[i+1]]) == name:
+                return(i)
+        raise KeyError(url)
+
+    def path_to(self, url):
+        """Returns the URLs from the root to a page, following the parent
+        array.
+
+        Parameters
+        ----------
+        url : str
+            URL of a page in the tree.
+        Returns
+        -------
+        list
+            Ordered list of URLs from the root to url.
+        """
+        i = self.index(url)
+        path = []
+        while i >= 0:
+            path.append(self.url(i))
+            i = int(self.parents[i])
+        return(path[::-1])
+
+    def children(self):
+        """Returns the children of every page in CSR form.
+
+        Returns
+        -------
+        tuple
+            (offsets, ids) where the children of page i are
+            ids[offsets[i]:offsets[i+1]].
+        """
+        parents = np.asarray(self.parents)
+        ids = np.flatnonzero(parents >= 0)
+        order = np.argsort(parents[ids], kind='stable')
+        offsets = np.zeros(self.size() + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parents[ids], minlength=self.size()), out=offsets[1:])
+        return((offsets, ids[order]))
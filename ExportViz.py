@@ -1,109 +1,306 @@
-# !/usr/bin/env python3
-# Author: Austin Smith - https://github.com/aws24689
-# PEP-8
-
-# Import Dependencies
-import pickle
-import networkx as nx
-from treelib import Node, Tree
-
-
-class ExportViz:
-    """Resize and Export Tree in GEXF Format For Vizualization in Gephi.
-    Import tree generated by running WikiCrawl and prune it down according to
-    parameters to get it below 10,000 nodes and export it as a .GEXF file to be
-    visualized in Gephi.
-
-    Parameters
-    ----------
-    tree_path : str
-        The local path to the .pickle file generated by WikiCrawl
-    Examples
-    --------
-    >>> exp = ExportViz('Data/b939c0ade3436e8945a03753d35722de39dfc84a-'+
-    >>> 'a2212e0647d7bc34252dd05124c2d98b3e3120f8.pickle')
-    >>>
-    >>> exp.export_gexf(prune = True)
-
-    """
-
-    def __init__(self, tree_path):
-        self.__path = tree_path
-        self.__b = self.import_tree(path=self.__path)
-        self._key = self.import_tree(path=self.__path[:-7]+'KEY.pickle')
-
-        self._leaf_paths = self.__b.paths_to_leaves()
-        self._tree_size = self.__b.size()
-        self._start_name = self._key[self.__path.split('/')[-1][:-7].split('-')[0]]
-        self._end_name = self._key[self.__path.split('/')[-1][:-7].split('-')[1]]
-
-    def import_tree(self, path):
-        """Import Pickled Tree"""
-        with open(path, 'rb') as handle:
-            return(pickle.load(handle))
-
-    def export_gexf(self, prune=True, nearest_neighhbs=1):
-    	"""Prunes and exports the imported tree file. as a .GEXF
-        Prunes the tree down to nodes in the path and includes n
-        nearest neighbors.
-
-        Parameters
-        ----------
-        prune : bool
-            True or False whether or not the tree should be trimmed.
-            default is True.
-        nearest_neighbs : int
-            The number of nearest neighbors to keep in the tree along
-            the path. '1' will keep only the nodes directly in the path
-            along with each node directly connected to that path. Default
-            is '1'.
-        Returns
-        -------
-        file
-            Saves data as .GEXF file.
-        """
-        if prune is False:
-            # Create Networkx Graph
-            G = nx.DiGraph()
-            self._leaf_paths
-            for j in range(len(self._leaf_paths)):
-                for i in range(len(self._leaf_paths[j])):
-                    try:
-                        G.add_edge(self._leaf_paths[j][i], self._leaf_paths[j][i+1])
-                    except:
-                        break
-            # Output NetworkX Graph to GEXF file
-            try:
-                nx.write_gexf(G, self.__path[:-6]+'GEXF')
-                print('Exported to "{}"'.format(self.__path[:-6]+'GEXF'))
-            except:
-                print('Export Failed!')
-
-        if prune is True:
-            # Create NetworkX Graph
-            G = nx.DiGraph()
-            self._leaf_paths
-            for j in range(len(self._leaf_paths)):
-                for i in range(len(self._leaf_paths[j])):
-                    try:
-                        G.add_edge(self._leaf_paths[j][i], self._leaf_paths[j][i+1])
-                    except:
-                        break
-
-            # Create New Graph With Only Target Path and n nearest neigbors
-            pathx = nx.shortest_path(G, source='https://en.wikipedia.org/wiki/' + self._start_name,
-            target='https://en.wikipedia.org/wiki/' + self._end_name)
-            D = nx.DiGraph()
-
-            for p in pathx:
-                for l in list(nx.single_source_shortest_path_length(G, source=p, cutoff=nearest_neighhbs).keys()):
-                    D.add_edge(p[30:], l[30:])
-
-            # Output NetworkX Graph to GEXF file
-            try:
-                nx.write_gexf(D, self.__path[:-6]+'GEXF')
-                print('Exported to "{}"'.format(self.__path[:-6]+'GEXF'))
-                print('{} to {}'.format(self._start_name, self._end_name))
-                return(D)
-            except:
-                print('Export Failed!')
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import csv
+import numpy as np
+import networkx as nx
+from xml.sax.saxutils import escape, quoteattr
+from TitleIndex import TitleIndex
+from CrawlFile import CrawlFile
+from PathQuery import gather
+
+
+class ExportViz:
+    """Resize and Export Tree in GEXF Format For Vizualization in Gephi.
+    Import tree generated by running WikiCrawl and prune it down according to
+    parameters to get it below 10,000 nodes and export it as a .GEXF file to be
+    visualized in Gephi. Trees pickled by older versions of WikiCrawl are
+    converted to a crawl directory next to the pickle the first time. Whole
+    trees are exported by export_stream, which writes GEXF, GraphML or CSV
+    straight from the tree's parent array without building a graph in
+    memory.
+
+    Parameters
+    ----------
+    tree_path : str
+        The local path to the .crawl directory generated by WikiCrawl, or to
+        the .pickle file older versions generated
+    index : TitleIndex or str
+        The title index used to label the nodes and to merge redirects into
+        the page they point to, or the path to one saved with
+        TitleIndex.save. Default is None, which labels each node with the
+        title spelled by its URL.
+    Examples
+    --------
+    >>> exp = ExportViz('Data/b939c0ade3436e8945a03753d35722de39dfc84a-'+
+    >>> 'a2212e0647d7bc34252dd05124c2d98b3e3120f8.crawl')
+    >>>
+    >>> exp.export_gexf(prune = True)
+    >>>
+    >>> # Export Every Page of a Large Tree
+    >>> exp.export_stream(fmt = 'graphml')
+
+    """
+
+    def __init__(self, tree_path, index=None):
+        tree_path = tree_path.rstrip('/')
+        if index is None or isinstance(index, str):
+            index = TitleIndex(index)
+        self._index = index
+        self.__b = self.import_tree(path=tree_path)
+        self.__path = tree_path.rsplit('.', 1)[0] + '.pickle'
+
+        self._tree_size = self.__b.size()
+        self._start_name = self.__b.header['start_url'][30:]
+        self._end_name = self.__b.header['end_url'][30:]
+
+    def import_tree(self, path):
+        """Opens a crawl directory, converting a pickled tree first."""
+        if path.endswith('.pickle'):
+            if os.path.exists(os.path.join(path[:-7] + '.crawl', 'header.json')):
+                return(CrawlFile(path[:-7] + '.crawl'))
+            return(CrawlFile.convert(path))
+        return(CrawlFile(path))
+
+    def export_gexf(self, prune=True, nearest_neighhbs=1, fan_out=None, max_nodes=10000, seed=0):
+        """Prunes and exports the imported tree file. as a .GEXF
+        Prunes the tree down to nodes in the path and includes n
+        nearest neighbors.
+
+        Parameters
+        ----------
+        prune : bool
+            True or False whether or not the tree should be trimmed.
+            default is True.
+        nearest_neighbs : int
+            The number of nearest neighbors to keep in the tree along
+            the path. '1' will keep only the nodes directly in the path
+            along with each node directly connected to that path. Default
+            is '1'.
+        fan_out : int
+            The most pages kept below each page at every level, picked at
+            random. Default is None, which keeps them all.
+        max_nodes : int
+            The most pages exported. Once a level would go over, a random
+            sample of it fills what is left. Default is 10,000, about the
+            most Gephi handles.
+        seed : int
+            Random seed for the sampling. Default is 0.
+        Returns
+        -------
+        file
+            Saves data as .GEXF file.
+        """
+        if prune is False:
+            # Stream Every Page Straight From the Tree
+            try:
+                self.export_stream(fmt='gexf')
+            except:
+                print('Export Failed!')
+
+        if prune is True:
+            # Create New Graph With Only Target Path and n nearest neigbors
+            path, near, owner = self.prune(nearest_neighhbs, fan_out=fan_out, max_nodes=max_nodes, seed=seed)
+            name = lambda i: self._index.canonical(self.__b.url(i))[30:]
+            D = nx.DiGraph()
+            D.add_node(name(path[0]))
+            for a, b in zip(path[:-1], path[1:]):
+                D.add_edge(name(a), name(b))
+            for p, l in zip(owner.tolist(), near.tolist()):
+                D.add_edge(name(p), name(l))
+
+            # Output NetworkX Graph to GEXF file
+            try:
+                for n in D.nodes():
+                    D.nodes[n]['label'] = self._index.title('https://en.wikipedia.org/wiki/' + n)
+                nx.write_gexf(D, self.__path[:-6]+'GEXF')
+                print('Exported to "{}"'.format(self.__path[:-6]+'GEXF'))
+                print('{} to {}'.format(self._start_name, self._end_name))
+                return(D)
+            except:
+                print('Export Failed!')
+
+    def prune(self, nearest_neighhbs=1, fan_out=None, max_nodes=10000, seed=0):
+        """Finds the pages within nearest_neighhbs clicks of the path with a
+        single breadth first search started from every page on the path at
+        once, a whole level at a time over the tree's child lists.
+
+        Parameters
+        ----------
+        nearest_neighhbs, fan_out, max_nodes, seed
+            As for export_gexf.
+        Returns
+        -------
+        tuple
+            (path, near, owner) where path holds the positions of the pages
+            on the path in order, near the positions of the pages kept
+            around it and owner the page on the path each was reached from.
+        """
+        path = [self.__b.find((self.__b.header.get('path') or [self.__b.header['end_url']])[-1])]
+        while self.__b.parents[path[-1]] >= 0:
+            path.append(int(self.__b.parents[path[-1]]))
+        path = np.array(path[::-1], dtype=np.int64)
+        offsets, children = self.__b.children()
+        rng = np.random.RandomState(seed)
+        owner = np.full(self._tree_size, -1, dtype=np.int64)
+        owner[path] = path
+        budget = max_nodes - len(path)
+        frontier = path
+        near = []
+        for k in range(nearest_neighhbs):
+            if len(frontier) == 0 or budget <= 0:
+                break
+            sources, found = gather(offsets, children, frontier)
+            keep = owner[found] < 0
+            sources, found = sources[keep], found[keep]
+            if fan_out is not None and len(found) > 0:
+                # Rank the Children of Each Page in Random Order, Keep the First fan_out
+                order = rng.permutation(len(found))
+                order = order[np.argsort(sources[order], kind='stable')]
+                sources, found = sources[order], found[order]
+                first = np.flatnonzero(np.r_[True, sources[1:] != sources[:-1]])
+                rank = np.arange(len(found)) - np.repeat(first, np.diff(np.r_[first, len(found)]))
+                sources, found = sources[rank < fan_out], found[rank < fan_out]
+            if len(found) > budget:
+                keep = np.sort(rng.choice(len(found), budget, replace=False))
+                sources, found = sources[keep], found[keep]
+            owner[found] = owner[sources]
+            near.append(found)
+            budget -= len(found)
+            frontier = found
+        near = np.concatenate(near) if len(near) > 0 else np.empty(0, dtype=np.int64)
+        return((path, near, owner[near]))
+
+    def path_ids(self):
+        """Returns the positions in the tree of the pages on the path found,
+        without indexing every URL."""
+        found = set()
+        for url in self.__b.header.get('path') or []:
+            try:
+                found.add(self.__b.find(url))
+            except KeyError:
+                pass
+        return(found)
+
+    def iter_nodes(self, chunk=65536):
+        """Yields (id, url, label, depth, on_path) for every page of the
+        tree, reading the memory-mapped columns a chunk at a time."""
+        on_path = self.path_ids()
+        for lo in range(0, self._tree_size, chunk):
+            depths = self.__b.depths[lo:lo+chunk].tolist()
+            for k, depth in enumerate(depths):
+                url = self.__b.url(lo + k)
+                yield((lo + k, url, self._index.title(url), depth, lo + k in on_path))
+
+    def iter_edges(self, chunk=65536):
+        """Yields (source id, target id) for every link of the tree."""
+        for lo in range(0, self._tree_size, chunk):
+            parents = self.__b.parents[lo:lo+chunk].tolist()
+            for k, p in enumerate(parents):
+                if p >= 0:
+                    yield((p, lo + k))
+
+    def export_stream(self, fmt='gexf', path=None, attributes=True):
+        """Exports the whole tree, writing each page and link as it is read
+        from the tree's parent array, so memory use does not grow with the
+        tree. Nodes are numbered by their position in the tree and labeled
+        with their titles.
+
+        Parameters
+        ----------
+        fmt : str
+            'gexf', the default, 'graphml' or 'csv'. 'csv' writes an edge
+            list of URLs to *.edges.csv and, with attributes, the pages to
+            *.nodes.csv.
+        path : str
+            The file to write. Default is None, which names it after the
+            tree, e.g. '<start hash>-<end hash>.GEXF'.
+        attributes : bool
+            True or False, default is True. If True, each node also gets its
+            URL, its depth in the tree and whether it is on the path found,
+            which Gephi can filter and color by.
+        Returns
+        -------
+        str
+            The path written.
+        """
+        base = self.__path[:-7]
+        if fmt == 'gexf':
+            path = base + '.GEXF' if path is None else path
+            self.write_gexf(path, attributes)
+        elif fmt == 'graphml':
+            path = base + '.graphml' if path is None else path
+            self.write_graphml(path, attributes)
+        elif fmt == 'csv':
+            path = base + '.edges.csv' if path is None else path
+            self.write_csv(path, attributes)
+        else:
+            raise ValueError('Unknown Export Format: {}'.format(fmt))
+        print('Exported to "{}"'.format(path))
+        return(path)
+
+    def write_gexf(self, path, attributes=True):
+        """Streams the tree to a GEXF 1.2 file."""
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                         '<gexf xmlns="http://www.gexf.net/1.2draft" version="1.2">\n'
+                         '<graph defaultedgetype="directed" mode="static">\n')
+            if attributes is True:
+                handle.write('<attributes class="node">\n'
+                             '<attribute id="0" title="url" type="string"/>\n'
+                             '<attribute id="1" title="depth" type="integer"/>\n'
+                             '<attribute id="2" title="on_path" type="boolean"/>\n'
+                             '</attributes>\n')
+            handle.write('<nodes>\n')
+            for i, url, label, depth, on_path in self.iter_nodes():
+                if attributes is True:
+                    handle.write('<node id="{}" label={}><attvalues><attvalue for="0" value={}/>'
+                                 '<attvalue for="1" value="{}"/><attvalue for="2" value="{}"/>'
+                                 '</attvalues></node>\n'.format(i, quoteattr(label), quoteattr(url),
+                                                               depth, 'true' if on_path else 'false'))
+                else:
+                    handle.write('<node id="{}" label={}/>\n'.format(i, quoteattr(label)))
+            handle.write('</nodes>\n<edges>\n')
+            for k, (a, b) in enumerate(self.iter_edges()):
+                handle.write('<edge id="{}" source="{}" target="{}"/>\n'.format(k, a, b))
+            handle.write('</edges>\n</graph>\n</gexf>\n')
+
+    def write_graphml(self, path, attributes=True):
+        """Streams the tree to a GraphML file."""
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                         '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                         '<key id="label" for="node" attr.name="label" attr.type="string"/>\n')
+            if attributes is True:
+                handle.write('<key id="url" for="node" attr.name="url" attr.type="string"/>\n'
+                             '<key id="depth" for="node" attr.name="depth" attr.type="int"/>\n'
+                             '<key id="on_path" for="node" attr.name="on_path" attr.type="boolean"/>\n')
+            handle.write('<graph id="G" edgedefault="directed">\n')
+            for i, url, label, depth, on_path in self.iter_nodes():
+                handle.write('<node id="n{}"><data key="label">{}</data>'.format(i, escape(label)))
+                if attributes is True:
+                    handle.write('<data key="url">{}</data><data key="depth">{}</data>'
+                                 '<data key="on_path">{}</data>'.format(escape(url), depth,
+                                                                        'true' if on_path else 'false'))
+                handle.write('</node>\n')
+            for a, b in self.iter_edges():
+                handle.write('<edge source="n{}" target="n{}"/>\n'.format(a, b))
+            handle.write('</graph>\n</graphml>\n')
+
+    def write_csv(self, path, attributes=True):
+        """Streams the tree to a CSV edge list of URLs, and with attributes
+        a CSV of the pages next to it."""
+        if attributes is True:
+            nodes_path = path[:-10] + '.nodes.csv' if path.endswith('.edges.csv') else path[:-4] + '.nodes.csv'
+            with open(nodes_path, 'w', encoding='utf-8', newline='') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(['id', 'url', 'label', 'depth', 'on_path'])
+                writer.writerows(self.iter_nodes())
+        with open(path, 'w', encoding='utf-8', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['source', 'target'])
+            for a, b in self.iter_edges():
+                writer.writerow([self.__b.url(a), self.__b.url(b)])
@@ -0,0 +1,156 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import sqlite3
+import threading
+import hashlib
+import time
+
+
+class LinkCache:
+    """Persistent On-Disk Cache of Page Titles and Outgoing Links.
+    Stores what the crawlers extract from each page, its title and the list of
+    links between <p> tags, rather than the raw HTML. Entries are keyed by the
+    same ripemd160 digest WikiCrawl uses for its filenames. The cache is an
+    SQLite database in WAL mode, so several crawls in separate processes can
+    read and write it at once. Entries expire after ttl seconds, and once there
+    are more than max_entries the least recently used are evicted.
+
+    Parameters
+    ----------
+    path : str
+        The path of the cache database. Default is 'Data/linkcache.sqlite'.
+    ttl : float
+        Seconds an entry stays valid after the page was fetched. Default is
+        30 days. None keeps entries until they are evicted.
+    max_entries : int
+        The largest number of pages kept. Default is 1,000,000. None lets the
+        cache grow without bound.
+    Examples
+    --------
+    >>> cache = LinkCache('Data/linkcache.sqlite', ttl=7*86400)
+    >>> crawl = WikiCrawl(start_url='https://en.wiki.../Entscheidungsproblem',
+    >>> end_url='https://en.wiki.../My_Little_Pony:_Friendship_Is_Magic',
+    >>> cache=cache)
+    >>> crawl.find_path()
+    >>> cache.stats()
+    {'hits': 1520, 'misses': 311, 'entries': 48210}
+
+    """
+    def __init__(self, path='Data/linkcache.sqlite', ttl=30*86400, max_entries=1000000):
+        self._path = path
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+        db = self.connect()
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE IF NOT EXISTS pages (key TEXT PRIMARY KEY, '
+                   'url TEXT, title TEXT, links TEXT, fetched REAL, used REAL)')
+        db.execute('CREATE INDEX IF NOT EXISTS pages_used ON pages (used)')
+
+    def __getstate__(self):
+        """Pickles only the settings, so worker processes open their own
+        connections to the same database."""
+        return((self._path, self._ttl, self._max_entries))
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def connect(self):
+        """Returns the database connection for the calling thread."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self._path, timeout=60, isolation_level=None)
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return(db)
+
+    def hash_url(self, input_url):
+        """Hashes URL into characters.
+
+        Parameters
+        ----------
+        input_url : str
+            URL which needs to be hashed.
+        """
+        hasher = hashlib.new('ripemd160')
+        hasher.update(input_url.encode('utf-8'))
+        return(hasher.hexdigest())
+
+    def get(self, url):
+        """Looks up a page in the cache.
+
+        Parameters
+        ----------
+        url : str
+            Full Wikipedia URL
+        Returns
+        -------
+        tuple
+            (title, links) for the page, or None if it is not cached or its
+            entry has expired.
+        """
+        key = self.hash_url(url[30:])
+        now = time.time()
+        db = self.connect()
+        row = db.execute('SELECT title, links, fetched FROM pages WHERE key = ?', (key,)).fetchone()
+        if row is None or (self._ttl is not None and now - row[2] > self._ttl):
+            with self._lock:
+                self.misses += 1
+            return(None)
+        db.execute('UPDATE pages SET used = ? WHERE key = ?', (now, key))
+        with self._lock:
+            self.hits += 1
+        links = row[1].split('\n') if row[1] else []
+        return((row[0], links))
+
+    def put(self, url, title, links):
+        """Stores the title and links extracted from a page.
+
+        Parameters
+        ----------
+        url : str
+            Full Wikipedia URL
+        title : str
+            Contents of the page's <title> tag.
+        links : list
+            URLs linked from the page.
+        """
+        now = time.time()
+        self.connect().execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)',
+                               (self.hash_url(url[30:]), url, title, '\n'.join(links), now, now))
+        with self._lock:
+            self._puts += 1
+            evict = self._puts % 1000 == 0
+        if evict is True:
+            self.evict()
+
+    def evict(self):
+        """Drops expired entries and the least recently used entries above
+        max_entries. Runs automatically every 1,000 stores."""
+        db = self.connect()
+        if self._ttl is not None:
+            db.execute('DELETE FROM pages WHERE fetched < ?', (time.time() - self._ttl,))
+        if self._max_entries is not None:
+            extra = db.execute('SELECT COUNT(*) FROM pages').fetchone()[0] - self._max_entries
+            if extra > 0:
+                db.execute('DELETE FROM pages WHERE key IN '
+                           '(SELECT key FROM pages ORDER BY used LIMIT ?)', (extra,))
+
+    def stats(self):
+        """Returns the hit and miss counts of this instance and the number
+        of pages in the cache.
+
+        Returns
+        -------
+        dict
+            Keys 'hits', 'misses' and 'entries'.
+        """
+        entries = self.connect().execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+        return({'hits': self.hits, 'misses': self.misses, 'entries': entries})
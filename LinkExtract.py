@@ -0,0 +1,227 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import time
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+
+
+def filter_href(href):
+    """Applies the crawlers' link rules to a single href.
+
+    Parameters
+    ----------
+    href : str
+        The href attribute of an <a> tag found between <p> tags.
+    Returns
+    -------
+    str
+        Full Wikipedia URL, or None if the link is not followed.
+    """
+    if href is None or 'en.wikipedia.org' in href:
+        return(None)
+    if ':Citation_needed' in href or '//' in href or '#' in href:
+        return(None)
+    return('https://en.wikipedia.org' + href)
+
+
+class ParagraphTarget:
+    """lxml Parser Target Collecting the Title and <p> Links of a Page.
+    Receives the parser's start/end/data events directly, so no document tree
+    is ever built. Only the hrefs of <a> tags inside <p> tags are kept, and
+    with anchors their text as well.
+    """
+    def __init__(self, anchors=False):
+        self._depth = 0
+        self._in_title = False
+        self._title = []
+        self._links = []
+        self._anchors = [] if anchors is True else None
+        self._anchor = None
+
+    def start(self, tag, attrib):
+        if tag == 'p':
+            self._depth += 1
+        elif tag == 'a':
+            if self._depth > 0:
+                url = filter_href(attrib.get('href'))
+                if url is not None:
+                    self._links.append(url)
+                    if self._anchors is not None:
+                        self._anchor = []
+        elif tag == 'title':
+            self._in_title = True
+
+    def end(self, tag):
+        if tag == 'p':
+            self._depth -= 1
+        elif tag == 'a' and self._anchor is not None:
+            self._anchors.append(''.join(self._anchor))
+            self._anchor = None
+        elif tag == 'title':
+            self._in_title = False
+
+    def data(self, data):
+        if self._in_title is True:
+            self._title.append(data)
+        elif self._anchor is not None:
+            self._anchor.append(data)
+
+    def close(self):
+        if self._anchors is not None:
+            if self._anchor is not None:
+                self._anchors.append(''.join(self._anchor))
+            return((''.join(self._title), self._links, self._anchors))
+        return((''.join(self._title), self._links))
+
+
+class LinkExtractor:
+    """Pulls the Title and the Links Between <p> Tags Out of a Page.
+    Shared by WikiCrawl and WikiDump. Every backend follows the same rules:
+    links containing ':Citation_needed', '//' or '#' are dropped, as are
+    absolute links to en.wikipedia.org, and the rest are prefixed with
+    'https://en.wikipedia.org'.
+
+    Parameters
+    ----------
+    backend : str
+        'lxml', the default, streams the page through lxml's HTML parser and
+        only looks at <title> and the <a> tags inside <p> tags. 'strainer'
+        builds a BeautifulSoup tree of just the <title> and <p> tags. 'soup'
+        builds a BeautifulSoup tree of the whole page, as the crawlers
+        originally did.
+    metrics : Metrics
+        Times reading the page under 'parse' and picking out the links under
+        'extract'. The 'lxml' backend does both in one pass, all of which
+        counts as 'parse'. Default is None.
+    Examples
+    --------
+    >>> extract = LinkExtractor()
+    >>> title, links = extract.extract(html)
+
+    """
+    BACKENDS = ('lxml', 'strainer', 'soup')
+
+    def __init__(self, backend='lxml', metrics=None):
+        if backend not in self.BACKENDS:
+            raise ValueError('Unknown Extractor Backend: {}'.format(backend))
+        self._backend = backend
+        self._metrics = metrics
+
+    def extract(self, html):
+        """Reads the title and the links between <p> tags of a page.
+
+        Parameters
+        ----------
+        html : str
+            The page's HTML.
+        Returns
+        -------
+        tuple
+            (title, links) for the page.
+        """
+        start = time.perf_counter()
+        if self._backend == 'lxml':
+            parser = etree.HTMLParser(target=ParagraphTarget())
+            parser.feed(html)
+            found = parser.close()
+            if self._metrics is not None:
+                self._metrics.observe('parse', time.perf_counter() - start)
+            return(found)
+        if self._backend == 'strainer':
+            page = BeautifulSoup(html, "lxml", parse_only=SoupStrainer(['title', 'p']))
+        else:
+            page = BeautifulSoup(html, "lxml")
+        if self._metrics is None:
+            return(self.extract_soup(page))
+        self._metrics.observe('parse', time.perf_counter() - start)
+        with self._metrics.timer('extract'):
+            return(self.extract_soup(page))
+
+    def extract_anchors(self, html):
+        """Reads the title, the links between <p> tags and the text of each
+        link of a page.
+
+        Parameters
+        ----------
+        html : str
+            The page's HTML.
+        Returns
+        -------
+        tuple
+            (title, links, anchors) where anchors[i] is the text of links[i].
+        """
+        start = time.perf_counter()
+        if self._backend == 'lxml':
+            parser = etree.HTMLParser(target=ParagraphTarget(anchors=True))
+            parser.feed(html)
+            found = parser.close()
+        else:
+            page = BeautifulSoup(html, "lxml")
+            title = page.find_all('title')
+            found = (title[0].get_text() if title else '', [], [])
+            for x in page.find_all('p'):
+                for g in x.find_all('a'):
+                    url = filter_href(g.get('href'))
+                    if url is not None:
+                        found[1].append(url)
+                        found[2].append(g.get_text())
+        if self._metrics is not None:
+            self._metrics.observe('parse', time.perf_counter() - start)
+        return(found)
+
+    def extract_soup(self, page):
+        """Reads the title and the links between <p> tags of a page that has
+        already been parsed by BeautifulSoup.
+
+        Parameters
+        ----------
+        page : BeautifulSoup
+            The parsed page.
+        Returns
+        -------
+        tuple
+            (title, links) for the page.
+        """
+        titles = page.find_all('title')
+        title = titles[0].get_text() if titles else ''
+        links = []
+        for x in page.find_all('p'):
+            for g in x.find_all('a'):
+                url = filter_href(g.get('href'))
+                if url is not None:
+                    links.append(url)
+        return((title, links))
+
+
+def compare_backends(pages, repeat=3):
+    """Checks every backend against the full BeautifulSoup parse and times
+    them. Use it on saved pages before switching backends.
+
+    Parameters
+    ----------
+    pages : list
+        HTML of the pages to extract from.
+    repeat : int
+        Number of times each backend extracts every page. Default is 3.
+    Returns
+    -------
+    dict
+        Maps each backend to a dict with 'pages_per_sec' and 'mismatches',
+        the number of pages whose title or links differ from 'soup'.
+    """
+    reference = [LinkExtractor('soup').extract(x) for x in pages]
+    report = dict()
+    for backend in LinkExtractor.BACKENDS:
+        extractor = LinkExtractor(backend)
+        start = time.perf_counter()
+        for r in range(repeat):
+            found = [extractor.extract(x) for x in pages]
+        elapsed = time.perf_counter() - start
+        report[backend] = {
+            'pages_per_sec': len(pages) * repeat / elapsed if elapsed > 0 else float('inf'),
+            'mismatches': sum(1 for a, b in zip(found, reference) if a != b)
+        }
+    return(report)
@@ -0,0 +1,415 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import time
+import threading
+from contextlib import closing
+from PageFetcher import PageFetcher
+from LinkExtract import LinkExtractor
+from Pipeline import Pipeline
+from Metrics import Metrics
+from Backlinks import title_to_url, url_to_title
+
+
+class APILinkSource:
+    """Reads Page Links From the MediaWiki Action API in Batches.
+    Asks for prop=links on up to 50 titles per request and follows the API's
+    continue tokens until every link of every title has arrived, which takes
+    far fewer and smaller requests than downloading and parsing each page.
+    Redirects are followed, so the links returned for a redirect are those of
+    its target. Requests carry maxlag, and when the servers report lag the
+    request is retried after the delay they ask for.
+
+    Note the API returns every link to an article on the page, including
+    those in infoboxes and navigation boxes, not only those between <p> tags.
+    The crawlers keep the paragraph-only links with link_source='html'.
+
+    Parameters
+    ----------
+    fetcher : PageFetcher
+        The fetcher whose session and host routing are used. Default is None,
+        which creates one.
+    api_url : str
+        Endpoint of the MediaWiki Action API. Defaults to English Wikipedia.
+    batch_size : int
+        Titles per request. The API allows at most 50. Default is 50.
+    maxlag : int
+        Seconds of database replication lag above which the servers should
+        refuse the request. Default is 5.
+    lag_retries : int
+        Number of times a request refused for lag is retried. Default is 5.
+    Examples
+    --------
+    >>> source = APILinkSource()
+    >>> found = source.get_links(['https://en.wikipedia.org/wiki/Entscheidungsproblem'])
+    >>> changed = source.recent_changes(time.time() - 86400)
+
+    """
+    def __init__(self, fetcher=None, api_url='https://en.wikipedia.org/w/api.php', batch_size=50, maxlag=5, lag_retries=5):
+        self._fetcher = fetcher if fetcher is not None else PageFetcher()
+        self._api_url = api_url
+        self._batch_size = min(int(batch_size), 50)
+        self._maxlag = maxlag
+        self._lag_retries = lag_retries
+
+    def batches(self, urls):
+        """Splits URLs into lists of batch_size.
+
+        Parameters
+        ----------
+        urls : iterable
+            URLs to split.
+        Yields
+        ------
+        list
+            Up to batch_size URLs.
+        """
+        batch = []
+        for url in urls:
+            batch.append(url)
+            if len(batch) == self._batch_size:
+                yield(batch)
+                batch = []
+        if len(batch) > 0:
+            yield(batch)
+
+    def query(self, params):
+        """Sends one API request, waiting and retrying while the servers
+        report too much lag.
+
+        Parameters
+        ----------
+        params : dict
+            Query string parameters.
+        Returns
+        -------
+        dict
+            The decoded JSON response.
+        """
+        for attempt in range(self._lag_retries + 1):
+            resp = self._fetcher.get(self._api_url, params=params)
+            data = resp.json()
+            if data.get('error', {}).get('code') != 'maxlag':
+                return(data)
+            time.sleep(float(resp.headers.get('Retry-After', 5)))
+        raise RuntimeError('MediaWiki API Lagged for {} Retries'.format(self._lag_retries))
+
+    def get_links(self, urls):
+        """Reads the title and links of up to batch_size pages.
+
+        Parameters
+        ----------
+        urls : list
+            Full Wikipedia URLs of the pages.
+        Returns
+        -------
+        dict
+            Maps each URL to (title, links), with the title formatted like
+            the page's <title> tag. Missing pages have no links.
+        """
+        requested = dict()
+        for u in urls:
+            requested.setdefault(url_to_title(u), []).append(u)
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': 2,
+            'prop': 'links',
+            'plnamespace': 0,
+            'pllimit': 'max',
+            'redirects': 1,
+            'maxlag': self._maxlag,
+            'titles': '|'.join(requested)
+        }
+        final = {t: t for t in requested}
+        links = dict()
+        while True:
+            data = self.query(params)
+            q = data.get('query', {})
+            # Follow Each Requested Title to the Page the API Answered With
+            renames = {x['from']: x['to'] for x in q.get('normalized', []) + q.get('redirects', [])}
+            for t in final:
+                hops = 0
+                while final[t] in renames and hops < 5:
+                    final[t] = renames[final[t]]
+                    hops += 1
+            for page in q.get('pages', []):
+                found = links.setdefault(page['title'], [])
+                found.extend(title_to_url(x['title']) for x in page.get('links', []))
+            if 'continue' not in data:
+                break
+            params.update(data['continue'])
+        return({u: (final[t] + ' - Wikipedia', links.get(final[t], [])) for t in requested for u in requested[t]})
+
+    def recent_changes(self, since, until=None):
+        """Reads the MediaWiki recent changes feed for the articles edited
+        or created in a period, following continue tokens until the end.
+        The feed only reaches back about 30 days, and page moves and
+        deletions, which are logged rather than edited, are not included.
+
+        Parameters
+        ----------
+        since : float
+            Start of the period, in seconds since the epoch.
+        until : float
+            End of the period. Default is None, which reads up to now.
+        Returns
+        -------
+        dict
+            Maps the URL of each page changed to its latest revision ID.
+        """
+        stamp = lambda x: time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(x))
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'formatversion': 2,
+            'list': 'recentchanges',
+            'rcnamespace': 0,
+            'rctype': 'edit|new',
+            'rcprop': 'title|ids|timestamp',
+            'rcdir': 'newer',
+            'rcstart': stamp(since),
+            'rclimit': 'max',
+            'maxlag': self._maxlag
+        }
+        if until is not None:
+            params['rcend'] = stamp(until)
+        changed = dict()
+        while True:
+            data = self.query(params)
+            for x in data.get('query', {}).get('recentchanges', []):
+                changed[title_to_url(x['title'])] = x.get('revid')
+            if 'continue' not in data:
+                break
+            params.update(data['continue'])
+        return(changed)
+
+
+class LinkReader:
+    """Reads the Links of Pages for the Crawlers, Wherever They Come From.
+    The one path every crawler takes to a page's links: the link cache when
+    it holds the page, otherwise the MediaWiki API or a download parsed by
+    the LinkExtractor, either on the fetch threads or in a Pipeline of
+    processes. Whatever the source, the title is added to the title index
+    and the links are put in canonical form, with known redirects replaced
+    by their targets and duplicates removed.
+
+    Parameters
+    ----------
+    fetcher : PageFetcher
+        Downloads the pages.
+    index : TitleIndex
+        The index of page titles and redirects the links are canonicalized
+        with.
+    parser : str
+        The LinkExtractor backend. Default is 'lxml'.
+    link_source : str
+        'html', the default, reads the links between <p> tags of the page
+        itself. 'api' asks the MediaWiki API for them in batches.
+    cache : LinkCache
+        Pages found in it are not downloaded, pages downloaded are stored in
+        it. Default is None.
+    processes : int
+        The number of processes parsing pages read as HTML through a
+        Pipeline. Default is None, which parses each page on the thread that
+        downloaded it.
+    anchors : bool
+        True to keep the anchor text of the links of each page parsed by
+        iter_links, in the anchors attribute, until the caller pops it.
+        Pages read from the cache or the API have none. Default is False.
+    revisions : bool
+        True to keep the version of each page downloaded by iter_links, as
+        PageFetcher.validator gives it, in the revisions attribute until the
+        caller pops it. Default is False.
+    metrics : Metrics
+        Times canonicalizing and counts cache hits and misses. Default is
+        None, which keeps them in memory only.
+    Examples
+    --------
+    >>> reader = LinkReader(PageFetcher(workers=16), TitleIndex(), cache=LinkCache('Data/linkcache.sqlite'))
+    >>> for url, links, error in reader.iter_links(urls):
+    >>>     print(url, len(links))
+    >>> reader.close()
+
+    """
+    def __init__(self, fetcher, index, parser='lxml', link_source='html', cache=None, processes=None, anchors=False, revisions=False, metrics=None):
+        if link_source not in ('html', 'api'):
+            raise ValueError('Unknown Link Source: {}'.format(link_source))
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._fetcher = fetcher
+        self._index = index
+        self._cache = cache
+        self._extractor = LinkExtractor(parser, metrics=self.metrics)
+        self.api = APILinkSource(fetcher) if link_source == 'api' else None
+        self._pipeline = None
+        if processes is not None and link_source == 'html':
+            self._pipeline = Pipeline(fetcher, parser, processes=processes, cache=cache, anchors=anchors, metrics=self.metrics)
+        # Anchor Text and Version of Each Page Downloaded, Kept Only if the Caller Pops Them
+        self.anchors = dict() if anchors is True else None
+        self.revisions = dict() if revisions is True else None
+        self.downloads = 0
+        self._lock = threading.Lock()
+
+    def get_page(self, url):
+        """Returns the title and links of a page, from the link cache or the
+        API, or by downloading and parsing it.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+        Returns
+        -------
+        tuple
+            (title, links) for the page, with the links canonicalized.
+        """
+        return(self.read_page(url)[:2])
+
+    def read_page(self, url):
+        """Reads a page as get_page does, also returning what is only known
+        when it is downloaded.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+        Returns
+        -------
+        tuple
+            (title, links, anchors, revision) where anchors maps each link
+            to its anchor text, if asked for, and revision is the version of
+            the page downloaded, both None for pages read from the cache or
+            the API.
+        """
+        found = None
+        if self.api is not None:
+            found = self.api.get_links([url])[url]
+            with self._lock:
+                self.downloads += 1
+        elif self._cache is not None:
+            found = self._cache.get(url)
+            self.metrics.count('cache_hits' if found is not None else 'cache_misses')
+        if found is None:
+            # Get/Parse Website
+            return(self.parse(url, self._fetcher.get(url)))
+        return(self.canonicalize(url, *found) + (None, None))
+
+    def parse(self, url, resp):
+        """Reads the title and links of a page just downloaded and stores
+        them in the link cache.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+        resp : requests.Response
+            The response holding the page.
+        Returns
+        -------
+        tuple
+            (title, links, anchors, revision) as read_page returns.
+        """
+        with self._lock:
+            self.downloads += 1
+        anchors = None
+        if self.anchors is not None:
+            title, links, text = self._extractor.extract_anchors(resp.text)
+            anchors = {self._index.canonical(x): a for x, a in zip(links, text)}
+            found = (title, links)
+        else:
+            found = self._extractor.extract(resp.text)
+        if self._cache is not None:
+            self._cache.put(url, *found)
+        return(self.canonicalize(url, *found) + (anchors, self._fetcher.validator(resp)))
+
+    def parse_soup(self, url, page):
+        """Reads the title and links of a page already parsed with
+        BeautifulSoup, as parse does for a response."""
+        title, links = self._extractor.extract_soup(page)
+        if self._cache is not None:
+            self._cache.put(url, title, links)
+        return(self.canonicalize(url, title, links))
+
+    def canonicalize(self, url, title, links):
+        """Adds a page just read to the title index and puts its links in
+        canonical form, with known redirects replaced by their targets and
+        duplicates removed.
+
+        Parameters
+        ----------
+        url : str
+            URL the page was requested as.
+        title : str
+            Contents of the page's <title> tag.
+        links : list
+            URLs linked from the page.
+        Returns
+        -------
+        tuple
+            (title, links) for the page.
+        """
+        with self.metrics.timer('canonicalize'):
+            self._index.learn(url, title)
+            return((title, list(dict.fromkeys(self._index.canonical(x) for x in links))))
+
+    def get_urls(self, url):
+        """Returns the canonical links of a page, as get_page does."""
+        return(self.read_page(url)[1])
+
+    def iter_links(self, urls):
+        """Reads the links of many pages concurrently, from the page HTML or
+        from the MediaWiki API in batches, and yields them as they arrive.
+
+        Parameters
+        ----------
+        urls : iterable
+            URLs of the pages to read.
+        Yields
+        ------
+        tuple
+            (url, links, error) where error is the exception raised reading
+            the page, or None if it succeeded.
+        """
+        if self.api is None:
+            if self._pipeline is not None:
+                results = self._pipeline.map_unordered(urls)
+            else:
+                results = self._fetcher.map_unordered(self.metrics.profiled(self.read_page), urls)
+            seen = self._pipeline.downloads if self._pipeline is not None else 0
+            with closing(results):
+                for url, found, error in results:
+                    if self._pipeline is not None:
+                        with self._lock:
+                            self.downloads += self._pipeline.downloads - seen
+                        seen = self._pipeline.downloads
+                    if error is not None:
+                        yield((url, None, error))
+                        continue
+                    if self._pipeline is not None:
+                        anchors = None
+                        if found[2] is not None:
+                            anchors = {self._index.canonical(x): a for x, a in zip(found[1], found[2])}
+                        found = self.canonicalize(url, found[0], found[1]) + (anchors, found[3])
+                    # Kept Here, Not on the Fetch Threads, so Pages the Caller Stops Short of Leave Nothing Behind
+                    if found[2] is not None:
+                        self.anchors[url] = found[2]
+                    if found[3] is not None and self.revisions is not None:
+                        self.revisions[url] = found[3]
+                    yield((url, found[1], None))
+            return
+        with closing(self._fetcher.map_unordered(self.metrics.profiled(self.api.get_links), self.api.batches(urls))) as results:
+            for batch, found, error in results:
+                with self._lock:
+                    self.downloads += len(batch)
+                for url in batch:
+                    if error is not None:
+                        yield((url, None, error))
+                    else:
+                        yield((url, self.canonicalize(url, *found[url])[1], None))
+
+    def close(self):
+        """Shuts down the parsing processes of the pipeline, if any."""
+        if self._pipeline is not None:
+            self._pipeline.close()
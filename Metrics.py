@@ -0,0 +1,295 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import re
+import sys
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+# From Python 3.12 cProfile Runs on sys.monitoring, so One Profiler Sees Every Thread
+# and a Second Cannot Be Enabled While It Runs
+SHARED_PROFILER = sys.version_info >= (3, 12)
+
+
+class Metrics:
+    """Counters, Gauges and Stage Timers for a Running Crawl.
+    Shared by a crawler and the PageFetcher and LinkExtractor it uses, which
+    time every download, parse and link extraction, count the bytes
+    downloaded and the cache hits, and time graph inserts and checkpoints.
+    Everything is kept in memory and is safe to update from the worker
+    threads. At most once per interval, report appends a snapshot to a
+    JSON-lines file and rewrites a Prometheus text file, either of which can
+    be left out. A window of the crawl can also be profiled with cProfile,
+    including the download threads, and optionally traced with tracemalloc.
+
+    Parameters
+    ----------
+    path : str
+        JSON-lines file a snapshot is appended to on every report. Default
+        is None, which writes none.
+    prometheus_path : str
+        Prometheus text file rewritten on every report, e.g. for the
+        node_exporter textfile collector. Default is None, which writes
+        none.
+    interval : float
+        The fewest seconds between two reports. Default is 60.
+    profile_path : str
+        Where to save the profile of the crawl window, readable with
+        pstats. With trace_memory, the largest allocations are written next
+        to it with '.memory.txt' added. Default is None, which profiles
+        nothing.
+    profile_window : tuple
+        (first, last) page counts the profile starts and stops at. Default
+        is (0, 1000), the first 1,000 pages.
+    trace_memory : bool
+        True to trace memory allocations over the window as well. Default is
+        False.
+    prefix : str
+        Prefix of the Prometheus metric names. Default is 'wikiclicks'.
+    Examples
+    --------
+    >>> metrics = Metrics('Data/dump.metrics.jsonl', interval=30,
+    >>> profile_path='Data/dump.prof', profile_window=(10000, 12000))
+    >>> WD = WikiDump(save_path="Data/Full_WIKI.pickle", metrics=metrics)
+    >>> WD.start_dump()
+    >>> metrics.snapshot()['timers']['fetch']
+
+    """
+    def __init__(self, path=None, prometheus_path=None, interval=60, profile_path=None, profile_window=(0, 1000), trace_memory=False, prefix='wikiclicks'):
+        self._path = path
+        self._prometheus_path = prometheus_path
+        self._interval = interval
+        self._profile_path = profile_path
+        self._window = profile_window
+        self._trace_memory = trace_memory
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = dict()
+        self._gauges = dict()
+        # Count, Total Seconds and Longest Seconds of Each Timer
+        self._timers = dict()
+        self._start = time.time()
+        self._last = self._start
+        self._last_counters = dict()
+        self._profiles = None
+        self._local = threading.local()
+        self._profiled = False
+
+    def count(self, name, value=1):
+        """Adds value to a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        """Sets a gauge, such as the number of nodes, to its current
+        value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, seconds):
+        """Adds the duration of one run of a stage to its timer."""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+
+    @contextmanager
+    def timer(self, name):
+        """Times the block it wraps, which counts even if it raises.
+
+        Examples
+        --------
+        >>> with metrics.timer('insert'):
+        >>>     G.add_edge(a, b)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def tick(self, pages=1):
+        """Counts pages crawled, starts or stops the profile when the count
+        enters or leaves the profile window and reports if the interval has
+        passed. Called by the crawlers from their main thread."""
+        self.count('pages', pages)
+        if self._profile_path is not None and self._profiled is False:
+            done = self._counters['pages']
+            if self._profiles is None and done >= self._window[0]:
+                self.start_profile()
+            elif self._profiles is not None and done >= self._window[1]:
+                self.stop_profile()
+                self._profiled = True
+        self.report()
+
+    def snapshot(self):
+        """Returns the current value of every metric.
+
+        Returns
+        -------
+        dict
+            'time' and 'uptime' in seconds, 'counters', 'gauges', 'rates' of
+            each counter per second since the previous report and 'timers',
+            each with 'count', 'seconds', 'mean_ms' and 'max_ms'.
+        """
+        now = time.time()
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            timers = {k: list(v) for k, v in self._timers.items()}
+        elapsed = max(now - self._last, 1e-9)
+        return({
+            'time': now,
+            'uptime': now - self._start,
+            'counters': counters,
+            'gauges': gauges,
+            'rates': {k: (v - self._last_counters.get(k, 0)) / elapsed for k, v in counters.items()},
+            'timers': {k: {'count': v[0], 'seconds': v[1], 'mean_ms': 1000 * v[1] / v[0], 'max_ms': 1000 * v[2]}
+                       for k, v in timers.items()}
+        })
+
+    def report(self, force=False):
+        """Writes a snapshot to the JSON-lines and Prometheus files if the
+        interval has passed since the last report.
+
+        Parameters
+        ----------
+        force : bool
+            True to report whatever the time, e.g. at a checkpoint. Default
+            is False.
+        Returns
+        -------
+        dict
+            The snapshot written, or None if it was not time yet.
+        """
+        if force is False and time.time() - self._last < self._interval:
+            return(None)
+        snapshot = self.snapshot()
+        self._last = snapshot['time']
+        self._last_counters = snapshot['counters']
+        if self._path is not None:
+            with open(self._path, 'a') as handle:
+                handle.write(json.dumps(snapshot) + '\n')
+        if self._prometheus_path is not None:
+            tmp = self._prometheus_path + '.tmp'
+            with open(tmp, 'w') as handle:
+                handle.write(self.prometheus(snapshot))
+            os.replace(tmp, self._prometheus_path)
+        return(snapshot)
+
+    def prometheus(self, snapshot=None):
+        """Returns a snapshot in the Prometheus text exposition format.
+        Counters end in _total, timers are summaries in seconds with a _max
+        gauge beside them."""
+        snapshot = self.snapshot() if snapshot is None else snapshot
+        name = lambda x: re.sub('[^a-zA-Z0-9_]', '_', '{}_{}'.format(self._prefix, x))
+        lines = []
+        for k, v in sorted(snapshot['counters'].items()):
+            lines += ['# TYPE {}_total counter'.format(name(k)), '{}_total {}'.format(name(k), v)]
+        for k, v in sorted(snapshot['gauges'].items()):
+            lines += ['# TYPE {} gauge'.format(name(k)), '{} {}'.format(name(k), v)]
+        for k, v in sorted(snapshot['timers'].items()):
+            lines += ['# TYPE {}_seconds summary'.format(name(k)),
+                      '{}_seconds_count {}'.format(name(k), v['count']),
+                      '{}_seconds_sum {}'.format(name(k), v['seconds']),
+                      '# TYPE {}_seconds_max gauge'.format(name(k)),
+                      '{}_seconds_max {}'.format(name(k), v['max_ms'] / 1000)]
+        lines += ['# TYPE {} gauge'.format(name('uptime_seconds')),
+                  '{} {}'.format(name('uptime_seconds'), snapshot['uptime'])]
+        return('\n'.join(lines) + '\n')
+
+    def start_profile(self, path=None, trace_memory=None):
+        """Starts profiling the calling thread and every function wrapped
+        with profiled, and tracing memory if asked to.
+
+        Parameters
+        ----------
+        path : str
+            Replaces profile_path. Default is None.
+        trace_memory : bool
+            Replaces trace_memory. Default is None.
+        """
+        self._profile_path = path if path is not None else self._profile_path
+        self._trace_memory = trace_memory if trace_memory is not None else self._trace_memory
+        if self._trace_memory is True:
+            tracemalloc.start(25)
+        profile = cProfile.Profile()
+        self._local.profile = (profile, profile)
+        self._profiles = [profile]
+        profile.enable()
+
+    def stop_profile(self):
+        """Stops profiling and saves the profiles of every thread, merged,
+        to profile_path.
+
+        Returns
+        -------
+        pstats.Stats
+            The merged profile.
+        """
+        profiles, self._profiles = self._profiles, None
+        if profiles is None:
+            return(None)
+        profiles[0].disable()
+        stats = pstats.Stats(*profiles)
+        stats.dump_stats(self._profile_path)
+        if tracemalloc.is_tracing():
+            top = tracemalloc.take_snapshot().statistics('lineno')[:50]
+            tracemalloc.stop()
+            with open(self._profile_path + '.memory.txt', 'w') as handle:
+                handle.write('\n'.join(str(x) for x in top) + '\n')
+        return(stats)
+
+    @contextmanager
+    def profile(self, path, trace_memory=False):
+        """Profiles the block it wraps, as start_profile and stop_profile
+        do."""
+        self.start_profile(path, trace_memory)
+        try:
+            yield
+        finally:
+            self.stop_profile()
+
+    def profiled(self, func):
+        """Wraps a function run on worker threads, such as a crawler's
+        get_urls, so it is profiled while a profile is running. Each thread
+        keeps its own profiler, merged into the others on stop_profile. From
+        Python 3.12 the profiler of start_profile already sees every thread,
+        so the function is run as it is.
+
+        Parameters
+        ----------
+        func : callable
+            The function to wrap.
+        Returns
+        -------
+        callable
+        """
+        def run(*args):
+            profiles = self._profiles
+            if profiles is None or SHARED_PROFILER is True:
+                return(func(*args))
+            owner, profile = getattr(self._local, 'profile', (None, None))
+            if owner is not profiles[0]:
+                # First Call on This Thread Since the Profile Started
+                profile = cProfile.Profile()
+                self._local.profile = (profiles[0], profile)
+                with self._lock:
+                    profiles.append(profile)
+            if profile is profiles[0]:
+                return(func(*args))
+            return(profile.runcall(func, *args))
+        return(run)
@@ -0,0 +1,172 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from Scheduler import Scheduler
+
+
+class PageFetcher:
+    """Fetches Wikipedia Pages Concurrently Over a Shared Session.
+    Keeps up to a fixed number of requests in flight on a thread pool. All
+    threads share one requests.Session whose connection pool holds one
+    connection per worker for each host, so connections are reused between
+    pages instead of being opened for every request. Every request goes
+    through a Scheduler, which paces and retries it, so a page is only
+    reported as failed once its retries have run out.
+
+    Parameters
+    ----------
+    workers : int
+        The largest number of requests in flight at once. Default is 8.
+    base_url : str
+        Sends requests for 'https://en.wikipedia.org' to this host instead,
+        e.g. 'http://127.0.0.1:8000' for a local stand-in server. URLs handed
+        back to the caller are left unchanged. Default is None.
+    timeout : float
+        Seconds to wait for a response before giving up on a page.
+    metrics : Metrics
+        Times every download under 'fetch' and counts 'bytes_downloaded'.
+        Default is None.
+    scheduler : Scheduler
+        Paces and retries the requests. Default is None, which uses one
+        with no rate limit and up to workers requests in flight.
+    Examples
+    --------
+    >>> fetch = PageFetcher(workers=16)
+    >>> for url, links, error in fetch.map_unordered(wiki.get_urls, urls):
+    >>>     print(url, len(links))
+
+    """
+    def __init__(self, workers=8, base_url=None, timeout=30, metrics=None, scheduler=None):
+        self.workers = int(workers)
+        self._metrics = metrics
+        if scheduler is None:
+            scheduler = Scheduler(max_concurrency=self.workers, metrics=metrics)
+        self.scheduler = scheduler
+        self._base_url = base_url
+        self._timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+    def route(self, url):
+        """Rewrites a Wikipedia URL to the host requests are sent to.
+
+        Parameters
+        ----------
+        url : str
+            Full Wikipedia URL
+        Returns
+        -------
+        str
+            URL to request.
+        """
+        if self._base_url is not None and url.startswith('https://en.wikipedia.org'):
+            return(self._base_url + url[24:])
+        return(url)
+
+    @staticmethod
+    def validator(resp):
+        """Returns what identifies the version of a page downloaded: its
+        ETag, or its Last-Modified date if it has no ETag, or None if it has
+        neither."""
+        return(resp.headers.get('ETag') or resp.headers.get('Last-Modified'))
+
+    @staticmethod
+    def conditional(validator):
+        """Returns the headers asking the server to answer 304 Not Modified
+        instead of sending a page again if it is still the version given by
+        validator, as returned by PageFetcher.validator."""
+        if validator is None:
+            return(None)
+        if validator.startswith('"') or validator.startswith('W/'):
+            return({'If-None-Match': validator})
+        return({'If-Modified-Since': validator})
+
+    def get(self, url, params=None, headers=None):
+        """Downloads a single page.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page to download.
+        params : dict
+            Query string parameters to add to the URL. Default is None.
+        headers : dict
+            Headers to send along, such as those of a conditional request.
+            Default is None.
+        Returns
+        -------
+        requests.Response
+            The response for the page, which has status 304 and no body if
+            a conditional request found the page unchanged.
+        Raises
+        ------
+        requests.RequestException
+            If the page could not be downloaded, as for Scheduler.request.
+        """
+        resp = self.scheduler.request(url, lambda: self._session.get(self.route(url), params=params, headers=headers, timeout=self._timeout))
+        if self._metrics is not None:
+            self._metrics.count('bytes_downloaded', len(resp.content))
+        return(resp)
+
+    def submit(self, func, *args):
+        """Calls func(*args) on a worker thread.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the call.
+        """
+        return(self._pool.submit(func, *args))
+
+    def map_unordered(self, func, urls):
+        """Calls func on every URL using the worker threads and yields the
+        results as they finish, not in the order given. No more than twice
+        the number of workers are queued at once, and work not yet started is
+        cancelled when the caller stops iterating early.
+
+        Parameters
+        ----------
+        func : callable
+            Called as func(url) on a worker thread, e.g. a crawler's get_urls.
+        urls : iterable
+            URLs to process.
+        Yields
+        ------
+        tuple
+            (url, result, error) where error is the exception raised by func,
+            or None if it succeeded.
+        """
+        urls = iter(urls)
+        pending = {}
+        try:
+            while True:
+                while len(pending) < 2 * self.workers:
+                    url = next(urls, None)
+                    if url is None:
+                        break
+                    pending[self.submit(func, url)] = url
+                if len(pending) == 0:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    url = pending.pop(f)
+                    if f.exception() is not None:
+                        yield(url, None, f.exception())
+                    else:
+                        yield(url, f.result(), None)
+        finally:
+            for f in pending:
+                f.cancel()
+
+    def close(self):
+        """Shuts down the worker threads and closes pooled connections."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
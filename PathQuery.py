@@ -0,0 +1,367 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import sys
+import json
+import argparse
+import threading
+import numpy as np
+from CSRGraph import CSRGraph
+from TitleIndex import TitleIndex
+
+# Distance Stored for Pages a Landmark Cannot Reach or Be Reached From
+UNREACHED = 255
+
+
+def gather(offsets, targets, frontier):
+    """Reads the neighbors of every node in a frontier at once.
+
+    Parameters
+    ----------
+    offsets : numpy.ndarray
+        CSR row pointers.
+    targets : numpy.ndarray
+        CSR neighbor ids.
+    frontier : numpy.ndarray
+        Ids of the nodes to expand.
+    Returns
+    -------
+    tuple
+        (sources, neighbors), two arrays with one entry per link.
+    """
+    starts = np.asarray(offsets[frontier])
+    counts = np.asarray(offsets[frontier + 1]) - starts
+    total = int(counts.sum())
+    if total == 0:
+        return((np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)))
+    # Position of Each Link Within the Concatenated Neighbor Lists
+    shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    neighbors = np.asarray(targets[shift + np.arange(total)])
+    return((np.repeat(frontier, counts).astype(np.int32), neighbors))
+
+
+def bound(a_from, a_to, b_from, b_to):
+    """Lower bounds the clicks from page a to page b with the triangle
+    inequality on landmark distances. Either side may hold many pages.
+
+    Parameters
+    ----------
+    a_from, b_from : numpy.ndarray
+        Clicks from each landmark to a and to b.
+    a_to, b_to : numpy.ndarray
+        Clicks from a and from b to each landmark.
+    Returns
+    -------
+    numpy.ndarray
+        The bound for each page, with np.iinfo(np.int32).max where b cannot
+        be reached from a at all.
+    """
+    a_from, a_to = a_from.astype(np.int32), a_to.astype(np.int32)
+    b_from, b_to = b_from.astype(np.int32), b_to.astype(np.int32)
+    # d(L, b) <= d(L, a) + d(a, b) and d(a, L) <= d(a, b) + d(b, L)
+    first = np.where((a_from != UNREACHED) & (b_from != UNREACHED), b_from - a_from, 0)
+    second = np.where((a_to != UNREACHED) & (b_to != UNREACHED), a_to - b_to, 0)
+    lower = np.maximum(np.maximum(first, second).max(axis=-1), 0)
+    # A Landmark Reaching a but Not b, or Reached From b but Not a, Rules Out Any Path
+    cut = (((a_from != UNREACHED) & (b_from == UNREACHED)) |
+           ((b_to != UNREACHED) & (a_to == UNREACHED))).any(axis=-1)
+    return(np.where(cut, np.iinfo(np.int32).max, lower))
+
+
+class PathQuery:
+    """Answers Shortest Click Paths Offline From a Dumped Link Graph.
+    Runs a bidirectional breadth first search over a CSRGraph saved from a
+    WikiDump crawl or an XML dump, so no page is downloaded. Each level
+    expands whichever side has fewer links to follow, with whole frontiers
+    handled at once by numpy. The search state is kept in arrays reused
+    between queries, so one PathQuery answers one query at a time.
+
+    Landmark distance tables (ALT) make the search smaller still. For a few
+    landmark pages the clicks to and from every page are precomputed with
+    build_landmarks and saved next to the graph. The triangle inequality then
+    gives a lower bound lb on the clicks left from any page, the landmarks
+    give an upper bound ub on the answer, and pages with g + lb > ub, where g
+    is the clicks taken to reach them, are not expanded. The two sides of a
+    bidirectional search on a graph as connected as Wikipedia's usually meet
+    within a few levels, so the bounds are only checked on levels large
+    enough to be worth it. They also end queries between pages with no path
+    at once, without searching.
+
+    Parameters
+    ----------
+    graph : CSRGraph or str
+        The graph, or the directory it was saved to, which is opened
+        memory-mapped.
+    landmarks : bool
+        True or False, default is True. If True and the graph directory holds
+        landmark tables, they are used to prune the search.
+    index : TitleIndex
+        Used to put the URLs asked for in canonical form and follow
+        redirects. Default is None, which only canonicalizes.
+    prune_min : int
+        The smallest new level whose pages are checked against the landmark
+        bounds. Default is 4,096.
+    Examples
+    --------
+    >>> # Once, After Saving the Graph
+    >>> PathQuery('Data/Full_WIKI.csr').build_landmarks(16)
+    >>>
+    >>> query = PathQuery('Data/Full_WIKI.csr')
+    >>> query.find_path('https://en.wiki.../Entscheidungsproblem',
+    >>> 'https://en.wiki.../My_Little_Pony:_Friendship_Is_Magic')
+
+    From the shell:
+
+    $ python PathQuery.py Data/Full_WIKI.csr https://en.wiki.../Entscheidungsproblem https://en.wiki.../Pony
+
+    """
+    FILES = ('landmarks', 'landmark_from', 'landmark_to')
+
+    def __init__(self, graph, landmarks=True, index=None, prune_min=4096):
+        self._dir = graph if isinstance(graph, str) else None
+        self._graph = CSRGraph.load(graph) if isinstance(graph, str) else graph
+        self._index = index if index is not None else TitleIndex()
+        self._offsets = self._graph._offsets
+        self._targets = self._graph._targets
+        self._rev_offsets, self._rev_targets = self._graph.reverse_arrays()
+        n = self._graph.number_of_nodes()
+        # Parent Towards the Start and Child Towards the End, -1 if Not Reached
+        self._parent = np.full(n, -1, dtype=np.int32)
+        self._child = np.full(n, -1, dtype=np.int32)
+        self._lock = threading.Lock()
+        self._prune_min = prune_min
+        self._from = None
+        self._to = None
+        if landmarks is True and self._dir is not None and os.path.exists(os.path.join(self._dir, 'landmarks.npy')):
+            self._landmarks, self._from, self._to = [np.load(os.path.join(self._dir, x + '.npy'), mmap_mode='r')
+                                                     for x in self.FILES]
+
+    def distances(self, source, reverse=False):
+        """Counts the clicks from one page to every other, or from every
+        page to it, by breadth first search.
+
+        Parameters
+        ----------
+        source : int
+            Node id of the page.
+        reverse : bool
+            True or False, default is False. If True, follows links backward.
+        Returns
+        -------
+        numpy.ndarray
+            uint8 clicks per node id, 255 where there is no path.
+        """
+        offsets, targets = (self._rev_offsets, self._rev_targets) if reverse else (self._offsets, self._targets)
+        dist = np.full(self._graph.number_of_nodes(), UNREACHED, dtype=np.uint8)
+        dist[source] = 0
+        frontier = np.array([source], dtype=np.int32)
+        level = 0
+        while len(frontier) > 0 and level < UNREACHED - 1:
+            level += 1
+            neighbors = gather(offsets, targets, frontier)[1]
+            neighbors = np.unique(neighbors[dist[neighbors] == UNREACHED])
+            dist[neighbors] = level
+            frontier = neighbors
+        return(dist)
+
+    def build_landmarks(self, count=16, method='degree', seed=0):
+        """Picks landmark pages, computes their distance tables and saves
+        them next to the graph, where later PathQuery instances find them.
+
+        Parameters
+        ----------
+        count : int
+            Number of landmarks. Each costs two bytes per page. Default is 16.
+        method : str
+            'degree', the default, picks the pages with the most links in and
+            out. 'random' picks pages at random.
+        seed : int
+            Random seed for the 'random' method. Default is 0.
+        """
+        n = self._graph.number_of_nodes()
+        count = min(int(count), n)
+        if method == 'degree':
+            degree = np.diff(np.asarray(self._offsets)) + np.diff(np.asarray(self._rev_offsets))
+            chosen = np.argsort(-degree, kind='stable')[:count]
+        elif method == 'random':
+            chosen = np.random.RandomState(seed).choice(n, count, replace=False)
+        else:
+            raise ValueError('Unknown Landmark Method: {}'.format(method))
+        self._landmarks = chosen.astype(np.int32)
+        # One Row per Page So a Page's Distances Are Read Together
+        self._from = np.empty((n, count), dtype=np.uint8)
+        self._to = np.empty((n, count), dtype=np.uint8)
+        for k, x in enumerate(self._landmarks):
+            self._from[:, k] = self.distances(x)
+            self._to[:, k] = self.distances(x, reverse=True)
+        if self._dir is not None:
+            for name, array in zip(self.FILES, (self._landmarks, self._from, self._to)):
+                np.save(os.path.join(self._dir, name + '.npy'), array)
+            print('Saved {} Landmarks to {}'.format(count, self._dir))
+
+    def find_path(self, start_url, end_url, max_clicks=None):
+        """Finds a shortest click path between two pages.
+
+        Parameters
+        ----------
+        start_url : str
+            URL of the page to start from.
+        end_url : str
+            URL of the page to reach.
+        max_clicks : int
+            Gives up on paths longer than this. Default is None.
+        Returns
+        -------
+        list
+            Ordered list of URLs from start_url to end_url, in the form of
+            WikiCrawl.url_path, or None if there is no path. Raises KeyError
+            if either page is not in the graph.
+        """
+        s = self._graph.index(self._index.canonical(start_url))
+        t = self._graph.index(self._index.canonical(end_url))
+        with self._lock:
+            return(self.search(s, t, max_clicks))
+
+    def search(self, s, t, max_clicks=None):
+        """Runs the bidirectional search between two node ids.
+
+        Parameters
+        ----------
+        s : int
+            Node id of the start.
+        t : int
+            Node id of the end.
+        max_clicks : int
+            Gives up on paths longer than this. Default is None.
+        Returns
+        -------
+        list
+            Ordered list of URLs from s to t, or None.
+        """
+        if s == t:
+            return([self._graph.url(s)])
+        ub = np.iinfo(np.int32).max if max_clicks is None else int(max_clicks)
+        if self._from is not None:
+            s_from, s_to = np.asarray(self._from[s]), np.asarray(self._to[s])
+            t_from, t_to = np.asarray(self._from[t]), np.asarray(self._to[t])
+            lower = bound(s_from, s_to, t_from, t_to)
+            # The Bound Is the int32 Maximum, Equal to ub Without max_clicks, When Landmarks Rule Out Any Path
+            if lower > ub or lower == np.iinfo(np.int32).max:
+                return(None)
+            through = [int(a) + int(b) for a, b in zip(s_to, t_from) if a != UNREACHED and b != UNREACHED]
+            ub = min([ub] + through)
+        touched = [np.array([s, t], dtype=np.int32)]
+        self._parent[s] = s
+        self._child[t] = t
+        forward = np.array([s], dtype=np.int32)
+        backward = np.array([t], dtype=np.int32)
+        g_forward = 0
+        g_backward = 0
+        meet = None
+        try:
+            while len(forward) > 0 and len(backward) > 0 and g_forward + g_backward < ub:
+                # Expand the Side With Fewer Links to Follow
+                cost_forward = int((np.asarray(self._offsets[forward + 1]) - np.asarray(self._offsets[forward])).sum())
+                cost_backward = int((np.asarray(self._rev_offsets[backward + 1]) - np.asarray(self._rev_offsets[backward])).sum())
+                if cost_forward <= cost_backward:
+                    g_forward += 1
+                    forward, found = self.expand(forward, self._offsets, self._targets, self._parent,
+                                                 self._child, g_forward, ub, t, False, touched)
+                else:
+                    g_backward += 1
+                    backward, found = self.expand(backward, self._rev_offsets, self._rev_targets, self._child,
+                                                  self._parent, g_backward, ub, s, True, touched)
+                if found is not None:
+                    meet = found
+                    break
+            if meet is None:
+                return(None)
+            path = []
+            x = meet
+            while x != s:
+                path.append(x)
+                x = int(self._parent[x])
+            path.append(s)
+            path = path[::-1]
+            x = meet
+            while x != t:
+                x = int(self._child[x])
+                path.append(x)
+            return([self._graph.url(x) for x in path])
+        finally:
+            # Reset Only What This Query Touched
+            ids = np.concatenate(touched)
+            self._parent[ids] = -1
+            self._child[ids] = -1
+
+    def expand(self, frontier, offsets, targets, reached, other, g, ub, goal, reverse, touched):
+        """Expands one level of one side of the search.
+
+        Parameters
+        ----------
+        frontier : numpy.ndarray
+            Ids at the current level of this side.
+        offsets, targets : numpy.ndarray
+            CSR arrays followed by this side.
+        reached : numpy.ndarray
+            This side's parent array, updated in place.
+        other : numpy.ndarray
+            The other side's parent array.
+        g : int
+            Clicks from this side's root to the new level.
+        ub : int
+            Upper bound on the answer.
+        goal : int
+            Node id the other side started from.
+        reverse : bool
+            True for the backward side.
+        touched : list
+            Arrays of the ids set, for resetting after the query.
+        Returns
+        -------
+        tuple
+            The next frontier and the id where the two sides met, or None.
+        """
+        sources, neighbors = gather(offsets, targets, frontier)
+        new = reached[neighbors] == -1
+        neighbors, first = np.unique(neighbors[new], return_index=True)
+        reached[neighbors] = sources[new][first]
+        touched.append(neighbors)
+        met = neighbors[other[neighbors] != -1]
+        if len(met) > 0:
+            return((neighbors, int(met[0])))
+        if self._from is not None and len(neighbors) >= self._prune_min:
+            if reverse is False:
+                lower = bound(np.asarray(self._from[neighbors]), np.asarray(self._to[neighbors]),
+                              np.asarray(self._from[goal]), np.asarray(self._to[goal]))
+            else:
+                lower = bound(np.asarray(self._from[goal]), np.asarray(self._to[goal]),
+                              np.asarray(self._from[neighbors]), np.asarray(self._to[neighbors]))
+            neighbors = neighbors[g + lower.astype(np.int64) <= ub]
+        return((neighbors, None))
+
+
+def main(argv=None):
+    """Command line entry point. Prints the path between two pages as a JSON
+    list of URLs, or null if there is none."""
+    parser = argparse.ArgumentParser(description='Shortest click paths from a saved CSRGraph.')
+    parser.add_argument('graph', help='directory the CSRGraph was saved to')
+    parser.add_argument('start_url', nargs='?')
+    parser.add_argument('end_url', nargs='?')
+    parser.add_argument('--build-landmarks', type=int, default=0, metavar='COUNT',
+                        help='compute and save COUNT landmarks first')
+    parser.add_argument('--max-clicks', type=int, default=None)
+    parser.add_argument('--no-landmarks', action='store_true', help='search without the landmark tables')
+    args = parser.parse_args(argv)
+    query = PathQuery(args.graph, landmarks=not args.no_landmarks)
+    if args.build_landmarks > 0:
+        query.build_landmarks(args.build_landmarks)
+    if args.start_url is not None and args.end_url is not None:
+        print(json.dumps(query.find_path(args.start_url, args.end_url, args.max_clicks)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from LinkExtract import LinkExtractor
+
+# The LinkExtractor of Each Parsing Process, Kept Between Pages
+_extractor = None
+
+
+def start_worker(backend):
+    """Creates the LinkExtractor used by a parsing process."""
+    global _extractor
+    _extractor = LinkExtractor(backend)
+
+
+def parse_page(content, encoding, anchors=False):
+    """Parses one downloaded page in a parsing process.
+
+    Parameters
+    ----------
+    content : bytes
+        The raw body of the response.
+    encoding : str
+        The encoding the response declared, as requests found it.
+    anchors : bool
+        True to return the anchor text of each link as well.
+    Returns
+    -------
+    tuple
+        (title, links, anchors, seconds) where links are the link paths
+        without 'https://en.wikipedia.org', joined by newlines, anchors is
+        None unless asked for and seconds is the time spent parsing.
+    """
+    start = time.perf_counter()
+    html = content.decode(encoding or 'utf-8', errors='replace')
+    if anchors is True:
+        title, links, text = _extractor.extract_anchors(html)
+    else:
+        (title, links), text = _extractor.extract(html), None
+    return((title, '\n'.join(x[24:] for x in links), text, time.perf_counter() - start))
+
+
+class Pipeline:
+    """Streams Pages Through Fetch, Parse and Write Stages Running at Once.
+    Pages are downloaded on the fetcher's threads, which only hand back the
+    raw bytes, and parsed in a pool of processes, so parsing runs on every
+    core instead of taking turns with the downloads for the interpreter lock.
+    The results come back to the caller's loop, the single writer of the
+    graph or tree. The number of pages between being requested and being
+    handed to the caller is capped, so a slow stage holds the others back
+    and memory stays flat however long the crawl runs.
+
+    Parameters
+    ----------
+    fetcher : PageFetcher
+        Downloads the pages.
+    parser : str
+        The LinkExtractor backend of the parsing processes. Default is
+        'lxml'.
+    processes : int
+        The number of parsing processes. Default is None, which uses every
+        core.
+    max_pending : int
+        The most pages downloading, downloaded or parsing at once. Default is
+        None, which allows four per fetch worker.
+    cache : LinkCache
+        Pages found in the cache skip the download and parse. Pages parsed
+        are stored in it. Default is None.
+    anchors : bool
+        True to return the anchor text of the links. Default is False.
+    metrics : Metrics
+        Times parsing under 'parse' and counts cache hits and misses.
+        Default is None.
+    Examples
+    --------
+    >>> pipe = Pipeline(PageFetcher(workers=16), processes=4)
+    >>> for url, found, error in pipe.map_unordered(urls):
+    >>>     title, links = found[0], found[1]
+    >>> pipe.close()
+
+    """
+    def __init__(self, fetcher, parser='lxml', processes=None, max_pending=None, cache=None, anchors=False, metrics=None):
+        self._fetcher = fetcher
+        self._processes = int(processes) if processes is not None else os.cpu_count()
+        self._max_pending = max_pending if max_pending is not None else 4 * fetcher.workers
+        self._cache = cache
+        self._anchors = anchors
+        self._metrics = metrics
+        self._parser = parser
+        # Started on First Use, so Building a Crawler Costs No Processes
+        self._pool = None
+        # Pages Downloaded Rather Than Read From the Cache, Counted on the Caller's Thread
+        self.downloads = 0
+
+    def fetch(self, url):
+        """Reads a page from the cache or downloads it, on a fetch thread.
+
+        Returns
+        -------
+        tuple
+            ((title, links, None, None), None) for a cached page, or (None,
+            (content, encoding, revision)) for a downloaded one, where
+            revision is given by PageFetcher.validator.
+        """
+        if self._cache is not None:
+            found = self._cache.get(url)
+            if self._metrics is not None:
+                self._metrics.count('cache_hits' if found is not None else 'cache_misses')
+            if found is not None:
+                return(((found[0], found[1], None, None), None))
+        resp = self._fetcher.get(url)
+        return((None, (resp.content, resp.encoding, self._fetcher.validator(resp))))
+
+    def map_unordered(self, urls):
+        """Downloads and parses every URL, yielding the results as they are
+        ready, not in the order given. Work not yet done is cancelled when
+        the caller stops iterating early.
+
+        Parameters
+        ----------
+        urls : iterable
+            URLs of the pages to read.
+        Yields
+        ------
+        tuple
+            (url, (title, links, anchors, revision), error) where anchors
+            is None unless asked for, revision is the version of the page
+            downloaded, None for cached pages, and error is the exception
+            raised reading the page, or None if it succeeded.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._processes, initializer=start_worker, initargs=(self._parser,))
+        urls = iter(urls)
+        fetching = dict()
+        parsing = dict()
+        try:
+            while True:
+                while len(fetching) + len(parsing) < self._max_pending and len(fetching) < 2 * self._fetcher.workers:
+                    url = next(urls, None)
+                    if url is None:
+                        break
+                    fetching[self._fetcher.submit(self.fetch, url)] = url
+                if len(fetching) + len(parsing) == 0:
+                    break
+                done, _ = wait(list(fetching) + list(parsing), return_when=FIRST_COMPLETED)
+                for f in done:
+                    if f in fetching:
+                        url = fetching.pop(f)
+                        if f.exception() is not None:
+                            yield((url, None, f.exception()))
+                            continue
+                        found, raw = f.result()
+                        if found is not None:
+                            yield((url, found, None))
+                        else:
+                            self.downloads += 1
+                            parsing[self._pool.submit(parse_page, raw[0], raw[1], self._anchors)] = (url, raw[2])
+                        continue
+                    url, revision = parsing.pop(f)
+                    if f.exception() is not None:
+                        yield((url, None, f.exception()))
+                        continue
+                    title, links, anchors, seconds = f.result()
+                    links = ['https://en.wikipedia.org' + x for x in links.split('\n')] if links else []
+                    if self._metrics is not None:
+                        self._metrics.observe('parse', seconds)
+                    if self._cache is not None:
+                        self._cache.put(url, title, links)
+                    yield((url, (title, links, anchors, revision), None))
+        finally:
+            for f in list(fetching) + list(parsing):
+                f.cancel()
+
+    def close(self):
+        """Shuts down the parsing processes. They are started again if the
+        pipeline is used after."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
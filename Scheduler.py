@@ -0,0 +1,322 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import time
+import random
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+
+
+class TokenBucket:
+    """Token Bucket Spacing Requests to a Steady Rate.
+    Each request takes a token. Tokens come back at rate per second and up to
+    burst of them are saved while the crawl is idle. A request arriving with
+    no token left reserves the next one and is told how long to wait for it,
+    so waiting requests go out in order.
+
+    Parameters
+    ----------
+    rate : float
+        Requests per second. None lets every request through at once.
+    burst : float
+        The most tokens saved up. Default is None, which saves one second's
+        worth.
+    """
+    def __init__(self, rate, burst=None):
+        self._lock = threading.Lock()
+        self._burst = burst
+        self._tokens = 0.0
+        self._time = time.monotonic()
+        self.rate = None
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        """Changes the rate, keeping the tokens saved so far."""
+        with self._lock:
+            self.rate = rate
+            if rate is not None:
+                self._tokens = min(self._tokens, self.capacity())
+
+    def capacity(self):
+        """Returns the most tokens the bucket holds at the current rate."""
+        return(self._burst if self._burst is not None else max(self.rate, 1.0))
+
+    def take(self):
+        """Takes a token.
+
+        Returns
+        -------
+        float
+            Seconds to wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.rate is None:
+                self._time = now
+                return(0.0)
+            self._tokens = min(self.capacity(), self._tokens + (now - self._time) * self.rate)
+            self._time = now
+            self._tokens -= 1
+            return(max(0.0, -self._tokens / self.rate))
+
+
+class Scheduler:
+    """Adaptive Rate Control and Retries for Every Request the Crawlers Send.
+    Sits between a PageFetcher and the network and finds the most requests
+    the server sustains without throttling. It does this with AIMD, as TCP
+    does: each success adds a little to the number of requests allowed in
+    flight and to the request rate, a throttling response (429 or 503) or a
+    timeout halves them and a jump in latency trims concurrency by a
+    quarter.
+    A Retry-After header on a throttling response pauses every request until
+    it has passed, on a 500, 502 or 504 only the request retried waits it
+    out, and either way the wait is capped at max_backoff. Other failed
+    requests are retried with jittered exponential backoff, and those which
+    still fail are kept in a dead-letter list to be retried later.
+
+    Parameters
+    ----------
+    rate : float
+        The highest rate in requests per second. Default is None, no limit
+        until the server throttles.
+    max_concurrency : int
+        The most requests in flight at once. Set it to the fetcher's number
+        of workers. Default is 8.
+    min_concurrency : int
+        The fewest requests allowed in flight when backing off. Default is 1.
+    max_retries : int
+        The number of times a failed request is retried. Default is 4.
+    backoff : float
+        Seconds the first retry waits at most. Each further retry doubles
+        it, and the actual wait is picked at random below it. Default is 0.5.
+    max_backoff : float
+        The longest wait before a retry, including one asked for by a
+        Retry-After header. Default is 60.
+    latency_factor : float
+        Concurrency backs off when the smoothed latency rises above this
+        multiple of the lowest smoothed latency seen, the sign that the
+        server has started queueing requests. Default is 4.
+    metrics : Metrics
+        Times every attempt under 'fetch' and counts 'retries', 'throttled'
+        and 'dead_letters'. Default is None.
+    seed : int
+        Seed of the backoff jitter. Default is None.
+    Examples
+    --------
+    >>> scheduler = Scheduler(rate=50, max_concurrency=16)
+    >>> WD = WikiDump(save_path="Data/Full_WIKI.pickle", workers=16, scheduler=scheduler)
+    >>> WD.start_dump()
+    >>> scheduler.dead_letters()
+
+    """
+    # Responses Worth Retrying, and Those Meaning the Server Wants Less Traffic
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+    THROTTLE_STATUS = (429, 503)
+
+    def __init__(self, rate=None, max_concurrency=8, min_concurrency=1, max_retries=4, backoff=0.5, max_backoff=60, latency_factor=4, metrics=None, seed=None):
+        self._max_rate = rate
+        self._bucket = TokenBucket(rate)
+        self._max_concurrency = max_concurrency
+        self._min_concurrency = min_concurrency
+        self._max_retries = int(max_retries)
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._latency_factor = latency_factor
+        self._metrics = metrics
+        self._random = random.Random(seed)
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._pause_until = 0.0
+        self._calm_until = 0.0
+        self._latency = None
+        self._lowest = None
+        # Completions in the Current One Second Window, and the Last Window's Rate
+        self._window = (time.monotonic(), 0)
+        self._observed = 0.0
+        self._dead = dict()
+        self.concurrency = float(max_concurrency)
+
+    @staticmethod
+    def retryable(error):
+        """Returns True if a request failed in a way worth trying again
+        later, such as a timeout or a 503, rather than a missing page."""
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return(error.response.status_code in Scheduler.RETRY_STATUS)
+        return(isinstance(error, (requests.ConnectionError, requests.Timeout)))
+
+    def request(self, url, send):
+        """Sends a request, waiting for its turn and retrying it if it fails.
+
+        Parameters
+        ----------
+        url : str
+            URL of the request, used for the dead-letter list.
+        send : callable
+            Sends the request once and returns its requests.Response.
+        Returns
+        -------
+        requests.Response
+            The successful response.
+        Raises
+        ------
+        requests.HTTPError
+            If the server answered with an error, at once for errors not
+            worth retrying, such as a 404, and after max_retries for the
+            rest.
+        requests.RequestException
+            If the request could not be sent after max_retries retries.
+        """
+        for attempt in range(self._max_retries + 1):
+            self.acquire()
+            start = time.perf_counter()
+            resp, error = None, None
+            try:
+                resp = send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            finally:
+                elapsed = time.perf_counter() - start
+                self.release()
+            if self._metrics is not None:
+                self._metrics.observe('fetch', elapsed)
+            if resp is not None and resp.status_code not in self.RETRY_STATUS:
+                self.success(elapsed)
+                if url in self._dead:
+                    with self._cond:
+                        self._dead.pop(url, None)
+                resp.raise_for_status()
+                return(resp)
+            if resp is not None:
+                error = requests.HTTPError('{} Error for url: {}'.format(resp.status_code, url), response=resp)
+            wait = self.retry_after(resp)
+            if resp is None or resp.status_code in self.THROTTLE_STATUS:
+                self.throttle(wait)
+            if attempt == self._max_retries:
+                break
+            if self._metrics is not None:
+                self._metrics.count('retries')
+            if wait is None:
+                time.sleep(self._random.uniform(0, min(self._max_backoff, self._backoff * 2 ** attempt)))
+            elif resp is not None and resp.status_code not in self.THROTTLE_STATUS:
+                # Only Throttling Pauses Every Request, Other Errors Wait Here
+                time.sleep(wait)
+        with self._cond:
+            self._dead[url] = {'url': url, 'error': repr(error), 'attempts': attempt + 1, 'time': time.time()}
+        if self._metrics is not None:
+            self._metrics.count('dead_letters')
+        raise error
+
+    def acquire(self):
+        """Waits out any pause asked for by the server, then for a free
+        request slot, then for a token."""
+        with self._cond:
+            while True:
+                pause = self._pause_until - time.monotonic()
+                if pause > 0:
+                    self._cond.wait(pause)
+                elif self._in_flight >= int(self.concurrency):
+                    self._cond.wait()
+                else:
+                    break
+            self._in_flight += 1
+        wait = self._bucket.take()
+        if wait > 0:
+            time.sleep(wait)
+
+    def release(self):
+        """Frees the slot of a finished request."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def success(self, elapsed):
+        """Grows concurrency and the rate after a successful request, or
+        shrinks concurrency if latency has climbed well above its lowest."""
+        now = time.monotonic()
+        with self._cond:
+            start, count = self._window
+            if now - start >= 1.0:
+                self._observed = count / (now - start)
+                self._window = (now, 1)
+            else:
+                self._window = (start, count + 1)
+            self._latency = elapsed if self._latency is None else 0.9 * self._latency + 0.1 * elapsed
+            self._lowest = self._latency if self._lowest is None else min(self._lowest, self._latency)
+            if self._latency > self._latency_factor * max(self._lowest, 0.01) and now >= self._calm_until:
+                self.concurrency = max(self._min_concurrency, self.concurrency * 0.75)
+                self._calm_until = now + self._latency
+            else:
+                # Additive Increase, About One More Slot per Round of Requests
+                self.concurrency = min(self._max_concurrency, self.concurrency + 1.0 / self.concurrency)
+            rate = self._bucket.rate
+            if rate is not None:
+                rate += 1.0 / rate
+                if self._max_rate is None and rate > 4 * max(self._observed, 1.0):
+                    rate = None
+                elif self._max_rate is not None:
+                    rate = min(rate, self._max_rate)
+                self._bucket.set_rate(rate)
+            self._cond.notify_all()
+        self.report()
+
+    def throttle(self, wait=None):
+        """Halves concurrency and the rate when the server pushes back, at
+        most once per round trip, and pauses every request for wait seconds
+        if the server said how long to wait."""
+        now = time.monotonic()
+        with self._cond:
+            if wait is not None:
+                self._pause_until = max(self._pause_until, now + wait)
+            if now >= self._calm_until:
+                self.concurrency = max(self._min_concurrency, self.concurrency / 2)
+                rate = self._bucket.rate if self._bucket.rate is not None else max(self._observed, 1.0)
+                self._bucket.set_rate(max(rate / 2, 0.1))
+                self._calm_until = now + max(self._latency or 0.0, 1.0)
+        if self._metrics is not None:
+            self._metrics.count('throttled')
+        self.report()
+
+    def retry_after(self, resp):
+        """Returns the seconds a response's Retry-After header asks to wait,
+        at most max_backoff, or None if it has none."""
+        value = resp.headers.get('Retry-After') if resp is not None else None
+        if value is None:
+            return(None)
+        try:
+            wait = float(value)
+        except ValueError:
+            try:
+                wait = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return(None)
+        # A Wait of Hours Would Stall Every Worker, as Throttling Pauses Them All
+        return(min(self._max_backoff, max(0.0, wait)))
+
+    def report(self):
+        """Puts the current concurrency and rate in the metrics."""
+        if self._metrics is not None:
+            self._metrics.gauge('concurrency', self.concurrency)
+            self._metrics.gauge('rate', self._bucket.rate if self._bucket.rate is not None else 0)
+
+    def dead_letters(self, clear=False):
+        """Returns the requests given up on, oldest first.
+
+        Parameters
+        ----------
+        clear : bool
+            True to empty the list, e.g. once the URLs have been queued
+            again. Default is False.
+        Returns
+        -------
+        list
+            Dicts holding the 'url', the last 'error', the number of
+            'attempts' and the 'time' it was given up on.
+        """
+        with self._cond:
+            dead = sorted(self._dead.values(), key=lambda x: x['time'])
+            if clear is True:
+                self._dead = dict()
+        return(dead)
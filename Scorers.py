@@ -0,0 +1,203 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import re
+import math
+from Backlinks import url_to_title
+from CSRGraph import CSRGraph
+from PathQuery import PathQuery, UNREACHED
+
+# Words Too Common to Say Anything About a Page
+STOPWORDS = frozenset(['a', 'an', 'and', 'at', 'by', 'de', 'for', 'from', 'in', 'is', 'la', 'list',
+                       'of', 'on', 'or', 'the', 'to', 'with'])
+
+
+def tokens(text):
+    """Returns the set of lowercase words in a title or anchor text, without
+    stopwords.
+
+    Parameters
+    ----------
+    text : str
+        e.g. 'My Little Pony: Friendship Is Magic'.
+    Returns
+    -------
+    set
+    """
+    return(set(x for x in re.split('[^0-9a-z]+', text.lower()) if x and x not in STOPWORDS))
+
+
+class TitleScorer:
+    """Scores Links by the Words Their Title Shares With the Target's.
+    The share of a linked page's title words found in the target's title. A
+    page the target links to also gets a bonus, as links are often
+    reciprocal, which costs reading the target page once when the search
+    starts.
+
+    Parameters
+    ----------
+    target_links : bool
+        True or False, default is True. If True, reads the target page and
+        adds 1 to the score of every page it links to.
+    """
+    anchors = False
+
+    def __init__(self, target_links=True):
+        self._target_links = target_links
+        self._words = set()
+        self._linked = set()
+
+    def start(self, target_url, crawl):
+        """Learns the target's title words and, if asked to, its links."""
+        self._words = tokens(url_to_title(target_url))
+        self._linked = set()
+        if self._target_links is True:
+            try:
+                self._linked = set(crawl.get_urls(target_url))
+                crawl.metrics.tick()
+            except Exception as e:
+                print('Could Not Read the Target Page: {!r}'.format(e))
+
+    def score(self, url, anchor=None):
+        """Returns the score of a link, higher is followed first."""
+        words = tokens(url_to_title(url))
+        shared = len(words & self._words) / len(words) if words else 0.0
+        return(shared + (1.0 if url in self._linked else 0.0))
+
+
+class AnchorScorer:
+    """Scores Links by How Close Their Anchor Text Is to the Target's Title.
+    The cosine similarity of the words of the anchor text and of the
+    target's title. Anchor text is only known for pages downloaded during
+    the search, links read from the cache or the API, or on pages parsed by
+    a Pipeline from its cache, are scored by the title spelled by their URL
+    instead.
+    """
+    anchors = True
+
+    def __init__(self):
+        self._words = set()
+
+    def start(self, target_url, crawl):
+        """Learns the target's title words."""
+        self._words = tokens(url_to_title(target_url))
+
+    def score(self, url, anchor=None):
+        """Returns the score of a link, higher is followed first."""
+        words = tokens(anchor if anchor else url_to_title(url))
+        if not words or not self._words:
+            return(0.0)
+        return(len(words & self._words) / math.sqrt(len(words) * len(self._words)))
+
+
+class HubScorer:
+    """Scores Links by the Number of Links on the Page They Lead To.
+    Hubs such as countries and years link to pages on every subject, so
+    heading for them gets close to the target sooner. The number of links
+    comes from a graph built by WikiDump or from a LinkCache. Pages in
+    neither score 0, a page with scale links or more scores 1.
+
+    Parameters
+    ----------
+    graph : CSRGraph or str
+        The graph, or the directory it was saved to. Default is None.
+    cache : LinkCache
+        Used for pages not in graph. Default is None.
+    scale : int
+        The number of links scoring 1. Default is 1,000.
+    """
+    anchors = False
+
+    def __init__(self, graph=None, cache=None, scale=1000):
+        self._graph = CSRGraph.load(graph) if isinstance(graph, str) else graph
+        self._cache = cache
+        self._scale = math.log1p(scale)
+
+    def start(self, target_url, crawl):
+        """Nothing depends on the target."""
+        pass
+
+    def score(self, url, anchor=None):
+        """Returns the score of a link, higher is followed first."""
+        degree = None
+        if self._graph is not None:
+            try:
+                i = self._graph.index(url)
+                degree = int(self._graph._offsets[i+1] - self._graph._offsets[i])
+            except KeyError:
+                pass
+        if degree is None and self._cache is not None:
+            found = self._cache.get(url)
+            degree = len(found[1]) if found is not None else None
+        return(min(1.0, math.log1p(degree) / self._scale) if degree is not None else 0.0)
+
+
+class DistanceScorer:
+    """Scores Links by Their Clicks to the Target in a Graph Built by WikiDump.
+    Counts the clicks from every page of the graph to the target once, with
+    a breadth first search over the reversed links, and scores each link by
+    minus its count, so the search follows the dumped graph's shortest path
+    while the live pages still agree with it. Pages not in the graph, or
+    which cannot reach the target in it, score below every page that can.
+
+    Parameters
+    ----------
+    graph : CSRGraph or str
+        The graph, or the directory it was saved to.
+    """
+    anchors = False
+
+    def __init__(self, graph):
+        self._query = PathQuery(graph, landmarks=False)
+        self._graph = self._query._graph
+        self._dist = None
+        self._worst = 0.0
+
+    def start(self, target_url, crawl):
+        """Counts the clicks from every page of the graph to the target."""
+        try:
+            self._dist = self._query.distances(self._graph.index(target_url), reverse=True)
+            reached = self._dist[self._dist != UNREACHED]
+            self._worst = -float(reached.max()) - 1
+        except KeyError:
+            print('Target Not in the Graph, Distances Will Not Be Used')
+            self._dist = None
+            self._worst = 0.0
+
+    def score(self, url, anchor=None):
+        """Returns the score of a link, higher is followed first."""
+        if self._dist is None:
+            return(0.0)
+        try:
+            d = self._dist[self._graph.index(url)]
+        except KeyError:
+            return(self._worst)
+        return(self._worst if d == UNREACHED else -float(d))
+
+
+class MixedScorer:
+    """Adds Up the Weighted Scores of Several Scorers.
+
+    Parameters
+    ----------
+    scorers : list
+        (scorer, weight) tuples.
+    Examples
+    --------
+    >>> scorer = MixedScorer([(TitleScorer(), 1.0), (AnchorScorer(), 1.0),
+    >>> (HubScorer('Data/Full_WIKI.csr'), 0.5)])
+    """
+    def __init__(self, scorers):
+        self._scorers = list(scorers)
+        self.anchors = any(getattr(x, 'anchors', False) for x, w in self._scorers)
+
+    def start(self, target_url, crawl):
+        """Starts every scorer."""
+        for x, w in self._scorers:
+            x.start(target_url, crawl)
+
+    def score(self, url, anchor=None):
+        """Returns the weighted sum of the scores of a link."""
+        return(sum(w * x.score(url, anchor) for x, w in self._scorers))
@@ -0,0 +1,302 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import numpy as np
+import scipy.sparse as sp
+from multiprocessing import Pool
+from concurrent.futures import ThreadPoolExecutor
+from CSRGraph import CSRGraph
+
+# The Separation of Each Worker Process, Kept Between Sources
+_separation = None
+
+
+def start_worker(graph):
+    """Opens the graph in a worker process."""
+    global _separation
+    _separation = Separation(graph, workers=1)
+
+
+def bfs_worker(source):
+    """Runs one breadth first search in a worker process."""
+    return(_separation.bfs(source))
+
+
+def mix(ids):
+    """Hashes node ids to well spread 64-bit values (splitmix64).
+
+    Parameters
+    ----------
+    ids : numpy.ndarray
+        Node ids.
+    Returns
+    -------
+    numpy.ndarray
+        uint64 hashes.
+    """
+    with np.errstate(over='ignore'):
+        x = ids.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return(x ^ (x >> np.uint64(31)))
+
+
+class Separation:
+    """Degrees of Separation Statistics Over a Whole Link Graph.
+    Measures the distribution of shortest click paths over a graph built by
+    WikiDump, two ways. sample_distances runs exact breadth first searches
+    from randomly sampled pages and reports the distance histogram, the mean
+    separation, each sampled page's eccentricity and a lower bound on the
+    diameter, improved by double sweeps from the farthest pages found. Each
+    search level slices the rows of the whole frontier out of a SciPy sparse
+    adjacency matrix at once, and the searches are spread over a process pool
+    that shares the memory-mapped graph. hyper_anf estimates the same for
+    every pair of pages with HyperANF: each page keeps a HyperLogLog counter
+    of the pages within t clicks, and every iteration merges the counters of
+    the pages it links to. That also estimates every page's eccentricity, the
+    number of iterations its counter kept growing for.
+
+    Parameters
+    ----------
+    graph : CSRGraph or str
+        The graph, or the directory it was saved to. Pass the directory when
+        workers is above 1, so each process memory-maps the same files.
+    workers : int
+        The number of processes for sample_distances and threads for
+        hyper_anf. Default is None, which uses every core.
+    Examples
+    --------
+    >>> sep = Separation('Data/Full_WIKI.csr')
+    >>> exact = sep.sample_distances(samples=1000)
+    >>> approx = sep.hyper_anf()
+    >>> sep.summary()
+
+    """
+    def __init__(self, graph, workers=None):
+        self._source = graph
+        self._graph = CSRGraph.load(graph) if isinstance(graph, str) else graph
+        self._workers = os.cpu_count() if workers is None else int(workers)
+        self._n = self._graph.number_of_nodes()
+        self._matrix = None
+        self._dist = None
+        self.exact = None
+        self.approx = None
+
+    def matrix(self):
+        """Returns the adjacency matrix as a SciPy CSR matrix sharing the
+        graph's arrays."""
+        if self._matrix is None:
+            data = np.ones(self._graph.number_of_edges(), dtype=np.bool_)
+            self._matrix = sp.csr_matrix((data, self._graph._targets, self._graph._offsets),
+                                         shape=(self._n, self._n))
+        return(self._matrix)
+
+    def bfs(self, source):
+        """Runs a breadth first search from one page, a whole level at a
+        time.
+
+        Parameters
+        ----------
+        source : int
+            Node id of the page.
+        Returns
+        -------
+        tuple
+            (source, level_sizes, farthest) where level_sizes[d] is the
+            number of pages d clicks away and farthest is one of the pages
+            on the last level.
+        """
+        A = self.matrix()
+        if self._dist is None:
+            self._dist = np.empty(self._n, dtype=np.uint8)
+        dist = self._dist
+        dist.fill(255)
+        dist[source] = 0
+        frontier = np.array([source], dtype=np.int32)
+        sizes = [1]
+        level = 0
+        while level < 254:
+            level += 1
+            # Links of the Whole Frontier, Repeats Included
+            reached = A[frontier].indices
+            reached = reached[dist[reached] == 255]
+            if len(reached) == 0:
+                break
+            dist[reached] = level
+            # Scanning for the New Level Removes Repeats Without Sorting
+            frontier = np.flatnonzero(dist == level)
+            sizes.append(len(frontier))
+        return((source, sizes, int(frontier[0])))
+
+    def sample_distances(self, samples=1000, sweeps=4, seed=0):
+        """Computes exact distances from randomly sampled pages.
+
+        Parameters
+        ----------
+        samples : int
+            The number of pages to search from. Default is 1,000.
+        sweeps : int
+            The number of double sweeps run after the samples, each searching
+            from the farthest page found so far, to tighten the diameter
+            bound. Default is 4.
+        seed : int
+            Random seed. Default is 0.
+        Returns
+        -------
+        dict
+            'histogram' of pairs per distance, 'mean' separation of the
+            pairs with a path, 'reachable' fraction of pairs with a path,
+            'eccentricity' per sampled page URL and 'diameter_lower_bound'.
+        """
+        sources = np.random.RandomState(seed).choice(self._n, min(int(samples), self._n), replace=False)
+        histogram = np.zeros(1, dtype=np.int64)
+        eccentricity = dict()
+        farthest = dict()
+
+        def add(results):
+            nonlocal histogram
+            for source, sizes, far in results:
+                if len(sizes) > len(histogram):
+                    histogram = np.pad(histogram, (0, len(sizes) - len(histogram)))
+                histogram[:len(sizes)] += sizes
+                eccentricity[int(source)] = len(sizes) - 1
+                farthest[int(source)] = far
+
+        if self._workers > 1:
+            with Pool(self._workers, initializer=start_worker, initargs=(self._source,)) as pool:
+                add(pool.imap_unordered(bfs_worker, sources.tolist(), chunksize=8))
+        else:
+            add(self.bfs(int(x)) for x in sources)
+        # Double Sweeps From the Farthest Page Found So Far
+        bound = max(eccentricity.values())
+        start = max(eccentricity, key=eccentricity.get)
+        for k in range(sweeps):
+            source, sizes, far = self.bfs(farthest[start])
+            farthest[source] = far
+            if len(sizes) - 1 <= bound:
+                break
+            bound = len(sizes) - 1
+            start = source
+        pairs = histogram[1:].sum()
+        self.exact = {
+            'histogram': histogram.tolist(),
+            'mean': float((np.arange(len(histogram)) * histogram).sum() / pairs) if pairs > 0 else None,
+            'reachable': float(pairs / (len(sources) * max(self._n - 1, 1))),
+            'eccentricity': {self._graph.url(x): eccentricity[x] for x in eccentricity},
+            'diameter_lower_bound': int(bound)
+        }
+        return(self.exact)
+
+    def hyper_anf(self, log2m=5, max_iter=64):
+        """Estimates the distance distribution over every pair of pages and
+        the eccentricity of every page with HyperANF.
+
+        Parameters
+        ----------
+        log2m : int
+            Log2 of the registers per HyperLogLog counter. Each counter costs
+            2**log2m bytes per page and has a relative error near
+            1.04/sqrt(2**log2m). Default is 5.
+        max_iter : int
+            The most iterations run. Default is 64.
+        Returns
+        -------
+        dict
+            'neighbourhood' N(t), the estimated pairs within t clicks,
+            'histogram' of pairs per distance, 'mean' separation,
+            'effective_diameter' (the distance within which 90% of connected
+            pairs lie) and 'eccentricity', a uint8 array of the estimated
+            eccentricity of every node id.
+        """
+        m = 1 << log2m
+        ids = np.arange(self._n, dtype=np.int64)
+        h = mix(ids)
+        # Register From the Low Bits, Rank From the Lowest Set Bit of the Rest
+        register = (h & np.uint64(m - 1)).astype(np.int64)
+        rest = h >> np.uint64(log2m)
+        low = rest & (~rest + np.uint64(1))
+        rank = np.where(rest == 0, 64 - log2m + 1, np.log2(np.maximum(low, 1).astype(np.float64)) + 1)
+        counters = np.zeros((self._n, m), dtype=np.uint8)
+        counters[ids, register] = rank.astype(np.uint8)
+        eccentricity = np.zeros(self._n, dtype=np.uint8)
+        neighbourhood = [self.estimate(counters).sum()]
+        offsets = np.asarray(self._graph._offsets)
+        targets = self._graph._targets
+        # Split the Links Into Chunks of Whole Rows, One Task per Chunk
+        chunks = max(self._workers * 4, int(offsets[-1]) // 1000000 + 1)
+        bounds = np.searchsorted(offsets, np.linspace(0, offsets[-1], chunks + 1)).tolist()
+        bounds = sorted(set([0] + bounds + [self._n]))
+
+        def merge(chunk):
+            lo, hi = chunk
+            rows = np.arange(lo, hi)
+            rows = rows[offsets[rows + 1] > offsets[rows]]
+            if len(rows) == 0:
+                return((rows, None))
+            starts = offsets[rows] - offsets[rows[0]]
+            linked = counters[np.asarray(targets[offsets[rows[0]]:offsets[rows[-1] + 1]])]
+            return((rows, np.maximum.reduceat(linked, starts, axis=0)))
+
+        with ThreadPoolExecutor(max_workers=self._workers) as pool:
+            for t in range(1, max_iter + 1):
+                grown = counters.copy()
+                for rows, best in pool.map(merge, zip(bounds[:-1], bounds[1:])):
+                    if best is not None:
+                        np.maximum(grown[rows], best, out=best)
+                        grown[rows] = best
+                changed = (grown != counters).any(axis=1)
+                if not changed.any():
+                    break
+                eccentricity[changed] = t
+                counters = grown
+                neighbourhood.append(self.estimate(counters).sum())
+        neighbourhood = np.maximum.accumulate(np.array(neighbourhood))
+        histogram = np.diff(neighbourhood, prepend=0)
+        pairs = neighbourhood[-1] - neighbourhood[0]
+        within = np.searchsorted((neighbourhood - neighbourhood[0]) / max(pairs, 1), 0.9)
+        self.approx = {
+            'neighbourhood': neighbourhood.tolist(),
+            'histogram': histogram.tolist(),
+            'mean': float((np.arange(len(histogram))[1:] * histogram[1:]).sum() / pairs) if pairs > 0 else None,
+            'effective_diameter': int(within),
+            'eccentricity': eccentricity
+        }
+        return(self.approx)
+
+    def estimate(self, counters):
+        """Returns the HyperLogLog estimate of every counter.
+
+        Parameters
+        ----------
+        counters : numpy.ndarray
+            uint8 registers, one row per node.
+        Returns
+        -------
+        numpy.ndarray
+            Estimated number of distinct pages in each counter.
+        """
+        m = counters.shape[1]
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / np.exp2(-counters.astype(np.float64)).sum(axis=1)
+        zeros = (counters == 0).sum(axis=1)
+        # Linear Counting for Small Counts
+        small = (raw <= 2.5 * m) & (zeros > 0)
+        raw[small] = m * np.log(m / zeros[small])
+        return(raw)
+
+    def summary(self):
+        """Prints and returns the statistics computed so far."""
+        report = dict()
+        if self.exact is not None:
+            report['exact'] = {k: v for k, v in self.exact.items() if k != 'eccentricity'}
+            print('Sampled Mean Separation: {:.3f} Clicks, Diameter At Least {}'
+                  .format(self.exact['mean'], self.exact['diameter_lower_bound']))
+        if self.approx is not None:
+            report['approx'] = {k: v for k, v in self.approx.items() if k != 'eccentricity'}
+            print('HyperANF Mean Separation: {:.3f} Clicks, Effective Diameter {}, Largest Eccentricity {}'
+                  .format(self.approx['mean'], self.approx['effective_diameter'],
+                          int(self.approx['eccentricity'].max())))
+        return(report)
@@ -0,0 +1,314 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import time
+import math
+import pickle
+import hashlib
+import networkx as nx
+from multiprocessing import Process
+from WikiDump import WikiDump
+from CheckpointLog import CheckpointLog
+from TitleIndex import merge_redirects
+
+
+class DumpShard(WikiDump):
+    """One Shard of a ShardedDump Crawl.
+    A WikiDump that only crawls the URLs whose ripemd160 hash falls in its
+    partition. Links it discovers for other shards are spooled to their inbox
+    directories as small files, each written under a temporary name and
+    renamed into place, and it drains its own inbox into its work queue before
+    taking each batch. Each shard keeps its own checkpoint log, work queue and
+    pickles under save_dir/shard-<n>/.
+
+    Parameters
+    ----------
+    shard : int
+        The number of this shard, from 0 to shards-1.
+    shards : int
+        The total number of shards.
+    save_dir : str
+        The directory shared by all shards.
+    poll : float
+        Seconds to wait between inbox checks while the shard has nothing to
+        crawl. Default is 0.2.
+    **kwargs
+        Passed on to WikiDump.
+    """
+    def __init__(self, shard, shards, save_dir, poll=0.2, **kwargs):
+        self._shard = shard
+        self._shards = shards
+        self._dir = save_dir
+        self._poll = poll
+        self._outbox = {m: [] for m in range(shards) if m != shard}
+        self._drained = set()
+        self._spooled = 0
+        os.makedirs(self.inbox(shard), exist_ok=True)
+        save_path = os.path.join(save_dir, 'shard-{}'.format(shard), 'graph.pickle')
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        new_dump = kwargs.pop('new_dump', True)
+        super().__init__(save_path=save_path, new_dump=new_dump,
+                         previous_path=None if new_dump is True else save_path, **kwargs)
+        if new_dump is True and self.owner(self._seed) != shard:
+            self._queue.reset()
+        self.set_status('busy')
+
+    def hash_url(self, input_url):
+        """Hashes URL into characters.
+
+        Parameters
+        ----------
+        input_url : str
+            URL which needs to be hashed.
+        """
+        hasher = hashlib.new('ripemd160')
+        hasher.update(input_url.encode('utf-8'))
+        return(hasher.hexdigest())
+
+    def owner(self, url):
+        """Returns the number of the shard that crawls url."""
+        return(int(self.hash_url(url[30:]), 16) % self._shards)
+
+    def inbox(self, shard):
+        """Returns the inbox directory of a shard."""
+        return(os.path.join(self._dir, 'inbox-{}'.format(shard)))
+
+    def set_status(self, status):
+        """Publishes this shard's status, 'busy', 'idle' or 'done'."""
+        path = os.path.join(self._dir, 'shard-{}.status'.format(self._shard))
+        with open(path + '.tmp', 'w') as handle:
+            handle.write(status)
+        os.replace(path + '.tmp', path)
+
+    def get_status(self, shard):
+        """Reads another shard's status. Shards not started yet are busy."""
+        try:
+            with open(os.path.join(self._dir, 'shard-{}.status'.format(shard))) as handle:
+                return(handle.read())
+        except FileNotFoundError:
+            return('busy')
+
+    def enqueue(self, urls):
+        """Queues the links this shard owns and holds the rest for their
+        owners until the next flush."""
+        own = []
+        for url in urls:
+            m = self.owner(url)
+            if m == self._shard:
+                own.append(url)
+            else:
+                self._outbox[m].append(url)
+        self._queue.push(own)
+
+    def flush_outbox(self):
+        """Spools the links held for other shards into their inboxes."""
+        for m, urls in self._outbox.items():
+            if len(urls) == 0:
+                continue
+            self._spooled += 1
+            name = '{}-{}-{}.txt'.format(self._shard, os.getpid(), self._spooled)
+            tmp = os.path.join(self.inbox(m), '.' + name)
+            with open(tmp, 'w', encoding='utf-8') as handle:
+                handle.write('\n'.join(urls))
+            os.replace(tmp, os.path.join(self.inbox(m), name))
+            self._outbox[m] = []
+
+    def drain_inbox(self):
+        """Moves the links spooled by other shards into the work queue. The
+        files are deleted at the next checkpoint, once the queue is committed.
+
+        Returns
+        -------
+        int
+            The number of inbox files read.
+        """
+        names = [x for x in os.listdir(self.inbox(self._shard))
+                 if x.endswith('.txt') and not x.startswith('.') and x not in self._drained]
+        if len(names) > 0:
+            # Announce Work Before the Files Disappear From the Inbox
+            self.set_status('busy')
+        for x in names:
+            with open(os.path.join(self.inbox(self._shard), x), encoding='utf-8') as handle:
+                self._queue.push(handle.read().split('\n'))
+            self._drained.add(x)
+        return(len(names))
+
+    def all_idle(self):
+        """Checks whether every running shard is idle with an empty inbox,
+        in which case no more work can appear."""
+        for m in range(self._shards):
+            if m == self._shard or self.get_status(m) == 'done':
+                continue
+            if any(x.endswith('.txt') and not x.startswith('.') for x in os.listdir(self.inbox(m))):
+                return(False)
+            if self.get_status(m) != 'idle':
+                return(False)
+        return(True)
+
+    def next_batch(self):
+        """Takes the next pages to crawl, waiting for other shards to send
+        work while the queue is empty. Returns an empty list once every shard
+        is idle."""
+        self.flush_outbox()
+        idle_checks = 0
+        while True:
+            self.drain_inbox()
+            batch = self._queue.pop(max(64, 8*self._workers))
+            if len(batch) > 0:
+                self.set_status('busy')
+                return(batch)
+            self.checkpoint()
+            self.set_status('idle')
+            # Require Two Quiet Checks in a Row Before Stopping
+            idle_checks = idle_checks + 1 if self.all_idle() else 0
+            if idle_checks >= 2:
+                return([])
+            time.sleep(self._poll)
+
+    def checkpoint(self):
+        """Checkpoints the shard and deletes the inbox files already moved
+        into the committed work queue."""
+        super().checkpoint()
+        for x in self._drained:
+            try:
+                os.remove(os.path.join(self.inbox(self._shard), x))
+            except FileNotFoundError:
+                pass
+        self._drained = set()
+
+    def start_dump(self):
+        """Crawls this shard's partition until it reaches its share of
+        stop_count or every shard runs out of work."""
+        super().start_dump()
+        self.flush_outbox()
+        self.set_status('done')
+
+
+class ShardedDump:
+    """Crawl Wikipedia With Several WikiDump Processes Sharing the Work.
+    Splits the URLs between shards by the ripemd160 hash WikiCrawl uses for
+    filenames. Each shard is a separate process with its own checkpoint log,
+    work queue and pickles, so crawl rate grows with the number of shards.
+    Links found for another shard are exchanged through spooled files in
+    save_dir, which only needs atomic renames, so shards on several machines
+    can share it over a network filesystem by calling run_shard on each. The
+    merge step combines every shard's graph into one.
+
+    Parameters
+    ----------
+    shards : int
+        The number of shard processes. Default is 4.
+    stop_count : int
+        The approximate total number of nodes to stop at. Each shard stops at
+        its share.
+    seed_page : str
+        The page to start the network from. Default is
+        'https://en.wikipedia.org/wiki/United_States'.
+    save_dir : str
+        The directory shared by the shards. Default is 'Data/shards'.
+    new_dump : bool
+        True or False, default is True. If False, every shard resumes from
+        its checkpoint log and work queue in save_dir.
+    save_increment : int
+        How many nodes each shard adds between checkpoints. Default is
+        10,000.
+    suppress_output : bool
+        True or False, if set to True, the shards run silent.
+    workers : int
+        The number of pages each shard downloads at once. Default is 8.
+    base_url : str
+        Sends requests for 'https://en.wikipedia.org' to another host.
+    priority : str
+        The order each shard crawls its pages in, 'fifo' or 'indegree'.
+    Examples
+    --------
+    >>> SD = ShardedDump(shards=8, stop_count=1000000, save_dir='Data/shards')
+    >>> SD.start_dump()
+    >>> SD.merge('Data/Full_WIKI.pickle')
+
+    """
+    def __init__(self, shards=4, stop_count=5000000, seed_page='https://en.wikipedia.org/wiki/United_States', save_dir='Data/shards', new_dump=True, save_increment=10000, suppress_output=False, workers=8, base_url=None, priority='fifo'):
+        self._shards = int(shards)
+        self._stop_count = stop_count
+        self._seed = seed_page
+        self._dir = save_dir
+        self._new = new_dump
+        self._save_inc = save_increment
+        self._suppress = suppress_output
+        self._workers = workers
+        self._base_url = base_url
+        self._priority = priority
+
+    def run_shard(self, shard):
+        """Runs a single shard in this process. Use it to spread the shards
+        over several machines sharing save_dir.
+
+        Parameters
+        ----------
+        shard : int
+            The number of the shard to run.
+        """
+        DumpShard(shard, self._shards, self._dir,
+                  stop_count=math.ceil(self._stop_count / self._shards),
+                  seed_page=self._seed, new_dump=self._new,
+                  save_increment=self._save_inc, suppress_output=self._suppress,
+                  workers=self._workers, base_url=self._base_url,
+                  priority=self._priority).start_dump()
+
+    def start_dump(self):
+        """Starts every shard in its own process and waits for them all."""
+        os.makedirs(self._dir, exist_ok=True)
+        for x in os.listdir(self._dir):
+            # Statuses From a Previous Run Would End the Crawl Early
+            if x.endswith('.status'):
+                os.remove(os.path.join(self._dir, x))
+        if self._new is True:
+            for m in range(self._shards):
+                inbox = os.path.join(self._dir, 'inbox-{}'.format(m))
+                if os.path.isdir(inbox):
+                    for x in os.listdir(inbox):
+                        os.remove(os.path.join(inbox, x))
+        procs = [Process(target=self.run_shard, args=(k,)) for k in range(self._shards)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        print("Sharded Dump Complete! {} Shards Finished".format(self._shards))
+
+    def merge(self, save_path):
+        """Combines the graph of every shard into one and saves it as the
+        *.pickle pair WikiDump writes. A shard only merges the redirects it
+        reads into its own graph, so the links other shards made to them are
+        moved onto their targets here.
+
+        Parameters
+        ----------
+        save_path : str
+            The path for the merged graph. This must end in *.pickle.
+        Returns
+        -------
+        networkx.DiGraph
+            The merged graph.
+        """
+        G = nx.DiGraph()
+        viewed = dict()
+        redirects = dict()
+        for k in range(self._shards):
+            log = CheckpointLog(os.path.join(self._dir, 'shard-{}'.format(k), 'graph.log'))
+            part, part_viewed = log.replay()
+            G.add_nodes_from(part.nodes())
+            G.add_edges_from(part.edges())
+            viewed.update(part_viewed)
+            redirects.update(log.redirects())
+        merge_redirects(G, redirects)
+        for alias in redirects:
+            viewed.pop(alias, None)
+        with open(save_path, 'wb') as handle:
+            pickle.dump(G, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(save_path[:-7]+'dict'+'.pickle', 'wb') as handle:
+            pickle.dump(viewed, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        print("Merged {} Shards! # of Nodes:{} # of Redirects:{}".format(self._shards, len(G), len(redirects)))
+        return(G)
@@ -0,0 +1,306 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import threading
+import time
+import json
+import calendar
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import unquote, urlsplit, parse_qs
+
+
+class WikiStandIn:
+    """Serves a Synthetic Link Graph as Wikipedia-Shaped HTML Pages.
+    Runs a local HTTP server in a background thread so the crawlers can be
+    exercised without touching en.wikipedia.org. Each page is served at
+    /wiki/<name> with its links inside <p> tags, the way get_urls expects.
+    The MediaWiki API at /w/api.php answers prop=links and list=backlinks
+    queries for the same graph, with continuation. Point a crawler at it with
+    base_url.
+    Pages are versioned. Each has a revision ID, served as its ETag beside a
+    Last-Modified date, and conditional requests for a page which has not
+    changed are answered 304 Not Modified. Pages changed with edit show up in
+    list=recentchanges, so refreshing a crawled graph can be exercised too.
+    Redirects are served the page they lead to, as Wikipedia does, and are
+    reported by the API.
+
+    Parameters
+    ----------
+    graph : dict
+        Maps each page name to the list of page names it links to, e.g.
+        {'A': ['B', 'C'], 'B': ['C']}.
+    latency : float
+        Seconds the server waits before answering each request, to imitate
+        the round trip to Wikipedia. Default is 0.
+    max_rate : float
+        Requests per second above which the server answers 429 Too Many
+        Requests with a Retry-After header, as Wikipedia does when a crawler
+        goes too fast. Default is None, which never throttles.
+    redirects : dict
+        Maps the name of each redirect to the page name it leads to, e.g.
+        {'Old_C': 'C'}. Pages may link to them. Default is None.
+    Examples
+    --------
+    >>> site = WikiStandIn({'A': ['B'], 'B': ['A']}, latency=0.05)
+    >>> crawl = WikiCrawl(start_url='https://en.wikipedia.org/wiki/A',
+    >>> end_url='https://en.wikipedia.org/wiki/B', base_url=site.start())
+    >>> crawl.find_path()
+    >>> site.edit('A', ['B', 'C'])
+    >>> site.stop()
+
+    """
+    def __init__(self, graph, latency=0.0, max_rate=None, redirects=None):
+        self._graph = graph
+        self._redirects = dict(redirects) if redirects is not None else dict()
+        self._latency = latency
+        self._max_rate = max_rate
+        self._tokens = max_rate
+        self._time = time.monotonic()
+        self.requests = 0
+        self.throttled = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._backlinks = None
+        # Revision ID and Time of the Last Edit of Each Page, and Every Edit Made
+        self._created = time.time()
+        self._revisions = {x: i+1 for i, x in enumerate(graph)}
+        self._last_revid = len(graph)
+        self._modified = dict()
+        self._changes = []
+
+    def edit(self, name, links):
+        """Replaces the links of a page, or creates it, as a new revision.
+
+        Parameters
+        ----------
+        name : str
+            Page name, as used in the graph.
+        links : list
+            Page names the page links to from now on.
+        Returns
+        -------
+        int
+            The revision ID of the edit.
+        """
+        with self._lock:
+            old = self._revisions.get(name, 0)
+            self._last_revid += 1
+            now = time.time()
+            self._graph[name] = list(links)
+            self._revisions[name] = self._last_revid
+            self._modified[name] = now
+            self._changes.append({'type': 'edit' if old else 'new', 'ns': 0, 'title': name.replace('_', ' '),
+                                  'revid': self._last_revid, 'old_revid': old, 'timestamp': now})
+            self._backlinks = None
+        return(self._last_revid)
+
+    def unchanged(self, handler, name):
+        """Returns True if a request is conditional and the page has not
+        changed since the version it names, by ETag or else by date."""
+        etag = '"{}"'.format(self._revisions[name])
+        match = handler.headers.get('If-None-Match')
+        if match is not None:
+            return(etag in [x.strip() for x in match.split(',')] or match.strip() == '*')
+        since = handler.headers.get('If-Modified-Since')
+        if since is None:
+            return(False)
+        try:
+            return(int(self._modified.get(name, self._created)) <= parsedate_to_datetime(since).timestamp())
+        except (TypeError, ValueError):
+            return(False)
+
+    def render(self, name):
+        """Builds the HTML served for a page.
+
+        Parameters
+        ----------
+        name : str
+            Page name, as used in the graph.
+        Returns
+        -------
+        str
+            HTML document for the page.
+        """
+        links = ''.join('<a href="/wiki/{0}" title="{0}">{0}</a> '.format(x)
+                        for x in self._graph[name])
+        return('<!DOCTYPE html><html><head><title>{0} - Wikipedia</title></head>'
+               '<body><h1>{0}</h1><p><b>{0}</b> links to {1}</p>'
+               '<p><a href="#cite_note-1">[1]</a></p></body></html>'.format(name, links))
+
+    def respond(self, handler):
+        """Answers a single request made to the server.
+
+        Parameters
+        ----------
+        handler : BaseHTTPRequestHandler
+            The handler for the request being answered.
+        """
+        with self._lock:
+            self.requests += 1
+            if self._max_rate is not None:
+                now = time.monotonic()
+                self._tokens = min(self._max_rate, self._tokens + (now - self._time) * self._max_rate)
+                self._time = now
+                limited = self._tokens < 1
+                if limited:
+                    self.throttled += 1
+                else:
+                    self._tokens -= 1
+        if self._max_rate is not None and limited:
+            self.send(handler, b'Too Many Requests', 'text/plain', status=429, headers={'Retry-After': '1'})
+            return
+        time.sleep(self._latency)
+        url = urlsplit(handler.path)
+        path = unquote(url.path)
+        if path == '/w/api.php':
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            self.send(handler, json.dumps(self.api(query)).encode('utf-8'), 'application/json')
+            return
+        name = path[6:] if path.startswith('/wiki/') else None
+        name = self._redirects.get(name, name)
+        if name not in self._graph:
+            handler.send_error(404)
+            return
+        headers = {'ETag': '"{}"'.format(self._revisions[name]),
+                   'Last-Modified': formatdate(self._modified.get(name, self._created), usegmt=True)}
+        if self.unchanged(handler, name):
+            with self._lock:
+                self.not_modified += 1
+            self.send(handler, b'', 'text/html; charset=UTF-8', status=304, headers=headers)
+            return
+        self.send(handler, self.render(name).encode('utf-8'), 'text/html; charset=UTF-8', headers=headers)
+
+    def api(self, query):
+        """Answers a MediaWiki API query against the graph.
+
+        Parameters
+        ----------
+        query : dict
+            The query string parameters.
+        Returns
+        -------
+        dict
+            The response in formatversion=2 form.
+        """
+        if query.get('list') == 'recentchanges':
+            # Continued as the Index of the Next Change
+            parse = lambda x: calendar.timegm(time.strptime(x, '%Y-%m-%dT%H:%M:%SZ'))
+            start = parse(query['rcstart']) if 'rcstart' in query else 0
+            end = parse(query['rcend']) if 'rcend' in query else float('inf')
+            limit = 500 if query.get('rclimit', 'max') == 'max' else int(query['rclimit'])
+            first = int(query.get('rccontinue', 0))
+            found = [i for i in range(first, len(self._changes)) if start <= self._changes[i]['timestamp'] < end + 1]
+            changes = [dict(self._changes[i], timestamp=time.strftime('%Y-%m-%dT%H:%M:%SZ',
+                                                                      time.gmtime(self._changes[i]['timestamp'])))
+                       for i in found[:limit]]
+            if len(found) > limit:
+                return({'continue': {'rccontinue': str(found[limit]), 'continue': '-||'},
+                        'query': {'recentchanges': changes}})
+            return({'batchcomplete': True, 'query': {'recentchanges': changes}})
+        if query.get('list') == 'backlinks':
+            if self._backlinks is None:
+                self._backlinks = dict()
+                for x in self._graph:
+                    for y in self._graph[x]:
+                        self._backlinks.setdefault(y, []).append(x)
+            name = query['bltitle'].replace(' ', '_')
+            limit = 500 if query.get('bllimit', 'max') == 'max' else int(query['bllimit'])
+            start = int(query.get('blcontinue', 0))
+            found = self._backlinks.get(name, [])
+            data = {'query': {'backlinks': [{'ns': 0, 'title': x.replace('_', ' ')}
+                                            for x in found[start:start+limit]]}}
+            if start + limit < len(found):
+                data['continue'] = {'blcontinue': str(start+limit), 'continue': '-||'}
+            return(data)
+        # prop=links, Continued as "<title index>|<link index>"
+        requested = query.get('titles', '').split('|')
+        redirects = [{'from': x, 'to': self._redirects[x.replace(' ', '_')].replace('_', ' ')}
+                     for x in requested if x.replace(' ', '_') in self._redirects]
+        answer = lambda data: dict(data, query=dict(data['query'], redirects=redirects)) if redirects else data
+        titles = list(dict.fromkeys(self._redirects.get(x.replace(' ', '_'), x.replace(' ', '_')).replace('_', ' ')
+                                    for x in requested))
+        limit = 500 if query.get('pllimit', 'max') == 'max' else int(query['pllimit'])
+        page, link = [int(x) for x in query.get('plcontinue', '0|0').split('|')]
+        pages = []
+        for i, title in enumerate(titles):
+            name = title.replace(' ', '_')
+            if name not in self._graph:
+                pages.append({'ns': 0, 'title': title, 'missing': True})
+                continue
+            entry = {'ns': 0, 'title': title}
+            if i >= page and limit > 0:
+                first = link if i == page else 0
+                links = self._graph[name][first:first+limit]
+                entry['links'] = [{'ns': 0, 'title': x.replace('_', ' ')} for x in links]
+                limit -= len(links)
+                if limit == 0 and (first + len(links) < len(self._graph[name]) or i+1 < len(titles)):
+                    more = (i, first+len(links)) if first + len(links) < len(self._graph[name]) else (i+1, 0)
+                    pages.append(entry)
+                    return(answer({'continue': {'plcontinue': '{}|{}'.format(*more), 'continue': '||'},
+                                   'query': {'pages': pages}}))
+            pages.append(entry)
+        return(answer({'batchcomplete': True, 'query': {'pages': pages}}))
+
+    def send(self, handler, body, content_type, status=200, headers=None):
+        """Writes a response.
+
+        Parameters
+        ----------
+        handler : BaseHTTPRequestHandler
+            The handler for the request being answered.
+        body : bytes
+            The response body.
+        content_type : str
+            The Content-Type header.
+        status : int
+            The status code. Default is 200.
+        headers : dict
+            Any other headers. Default is None.
+        """
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type)
+        for k, v in (headers or {}).items():
+            handler.send_header(k, v)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self, port=0):
+        """Starts serving in a background thread.
+
+        Parameters
+        ----------
+        port : int
+            Port to listen on. Default is 0, which picks a free port.
+        Returns
+        -------
+        str
+            Base URL of the server, e.g. 'http://127.0.0.1:51234'.
+        """
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                site.respond(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return('http://127.0.0.1:{}'.format(self._server.server_address[1]))
+
+    def stop(self):
+        """Stops the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
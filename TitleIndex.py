@@ -0,0 +1,211 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import pickle
+import threading
+from functools import lru_cache
+from urllib.parse import unquote
+from Backlinks import title_to_url, url_to_title
+from XMLDump import XMLDumpReader, normalize_title
+
+
+@lru_cache(maxsize=65536)
+def canonical_url(url):
+    """Puts a Wikipedia URL in one canonical form so the same page is always
+    the same node. The title is percent-decoded, spaces and underscores are
+    unified, the first letter is capitalized, any #fragment is dropped and
+    the title is percent-encoded again the way MediaWiki does it.
+
+    Parameters
+    ----------
+    url : str
+        Full Wikipedia URL, e.g. 'https://en.wikipedia.org/wiki/caf%c3%a9'.
+    Returns
+    -------
+    str
+        Canonical URL, e.g. 'https://en.wikipedia.org/wiki/Caf%C3%A9'. URLs
+        outside /wiki/ are returned unchanged.
+    """
+    if not url.startswith('https://en.wikipedia.org/wiki/'):
+        return(url)
+    title = normalize_title(unquote(url[30:].split('#')[0]))
+    return(title_to_url(title) if title else url)
+
+
+def merge_redirects(G, redirects):
+    """Merges redirect pages in a graph into the pages they redirect to. The
+    links to each redirect are moved onto its target and its node removed.
+
+    Parameters
+    ----------
+    G : networkx.DiGraph
+        Graph of page URLs, changed in place.
+    redirects : dict
+        Maps the URL of each redirect to the URL it redirects to.
+    """
+    for alias in redirects:
+        if alias not in G:
+            continue
+        target = redirects[alias]
+        hops = 0
+        while target in redirects and hops < 5:
+            target = redirects[target]
+            hops += 1
+        for i in list(G.predecessors(alias)):
+            if i != target:
+                G.add_edge(i, target)
+        G.remove_node(alias)
+
+
+class TitleIndex:
+    """Index of Page Titles and Redirects Filled as Pages Are Read.
+    Records the title of every page the crawlers read, and which URLs are
+    redirects to which page, so reports need no extra downloads and redirect
+    aliases are merged into the page they point to. Titles are only stored
+    when they differ from what the URL spells, which keeps the index small.
+    It can also be filled from a Wikipedia XML dump, which knows every title
+    and redirect in advance.
+
+    Parameters
+    ----------
+    path : str
+        A pickle written by save to load. Default is None, which starts an
+        empty index.
+    Examples
+    --------
+    >>> index = TitleIndex.from_dump('enwiki-latest-pages-articles.xml.bz2')
+    >>> index.save('Data/titles.pickle')
+    >>> crawl = WikiCrawl(start_url='https://en.wiki.../Entscheidungsproblem',
+    >>> end_url='https://en.wiki.../My_Little_Pony:_Friendship_Is_Magic',
+    >>> index=TitleIndex('Data/titles.pickle'))
+
+    """
+    def __init__(self, path=None):
+        self._titles = dict()
+        self._aliases = dict()
+        self._lock = threading.Lock()
+        if path is not None:
+            with open(path, 'rb') as handle:
+                self._titles, self._aliases = pickle.load(handle)
+
+    def __getstate__(self):
+        """Pickles the titles and redirects without the lock."""
+        return((self._titles, self._aliases))
+
+    def __setstate__(self, state):
+        self._titles, self._aliases = state
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dump(cls, dump_path):
+        """Builds an index of every article title and redirect in a
+        pages-articles XML dump.
+
+        Parameters
+        ----------
+        dump_path : str
+            Path of the dump, e.g. 'enwiki-latest-pages-articles.xml.bz2'.
+        Returns
+        -------
+        TitleIndex
+        """
+        index = cls()
+        for title, redirect, text, namespaces in XMLDumpReader(dump_path).iter_pages():
+            if redirect is not None:
+                index.add_redirect(title_to_url(normalize_title(title)),
+                                   title_to_url(normalize_title(redirect)))
+        return(index)
+
+    def canonical(self, url):
+        """Returns the canonical URL of the page a URL leads to, following
+        any known redirects.
+
+        Parameters
+        ----------
+        url : str
+            Full Wikipedia URL
+        Returns
+        -------
+        str
+            Canonical URL of the page.
+        """
+        url = canonical_url(url)
+        hops = 0
+        while url in self._aliases and hops < 5:
+            url = self._aliases[url]
+            hops += 1
+        return(url)
+
+    def add_redirect(self, alias, target):
+        """Records that alias redirects to target.
+
+        Parameters
+        ----------
+        alias : str
+            URL of the redirect.
+        target : str
+            URL of the page it redirects to.
+        """
+        alias = canonical_url(alias)
+        target = canonical_url(target)
+        if alias != target:
+            with self._lock:
+                self._aliases[alias] = target
+
+    def learn(self, url, title):
+        """Records what was read from a page: its title, and, when the title
+        names another page than the URL, that the URL is a redirect. Titles
+        without the ' - Wikipedia' suffix, such as those of error pages, are
+        ignored.
+
+        Parameters
+        ----------
+        url : str
+            URL the page was requested as.
+        title : str
+            Contents of the page's <title> tag, e.g. 'Alan Turing - Wikipedia'.
+        Returns
+        -------
+        str
+            Canonical URL of the page.
+        """
+        if not title.endswith(' - Wikipedia') or len(title) == 12:
+            # Error Pages Name No Article
+            return(self.canonical(url))
+        name = title[:-12]
+        target = title_to_url(normalize_title(name))
+        self.add_redirect(url, target)
+        if url_to_title(target) != name:
+            with self._lock:
+                self._titles[target] = name
+        return(target)
+
+    def title(self, url):
+        """Returns the title of a page without downloading it.
+
+        Parameters
+        ----------
+        url : str
+            Full Wikipedia URL
+        Returns
+        -------
+        str
+            The page title, e.g. 'Alan Turing'.
+        """
+        url = self.canonical(url)
+        return(self._titles.get(url, url_to_title(url)))
+
+    def is_alias(self, url):
+        """Returns True if url is known to redirect to another page."""
+        return(canonical_url(url) in self._aliases)
+
+    def aliases(self):
+        """Returns a dict of every known redirect URL and its target."""
+        return(dict(self._aliases))
+
+    def save(self, path):
+        """Pickles the index to path."""
+        with open(path, 'wb') as handle:
+            pickle.dump((self._titles, self._aliases), handle, protocol=pickle.HIGHEST_PROTOCOL)
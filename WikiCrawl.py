@@ -1,249 +1,667 @@
-# !/usr/bin/env python3
-# Author: Austin Smith - https://github.com/aws24689
-# PEP-8
-
-# Import Depencies
-import requests
-from bs4 import BeautifulSoup
-from treelib import Node, Tree
-import pickle
-import hashlib
-
-
-class WikiCrawl:
-    """Determintes The # of Clicks to Get from one Wikipedia Page to Another.
-    This class constructs a tree of pages until it reaches the end webpage. It
-    is intended to be used for testing how many clicks it takes to get from one
-    page to the next. The tree is saved for future analysist in two parts. The
-    filenames are the hash of each URL seperated by a hyphen as follows:
-    'b939c0ade3436e8945a03753d35722de39dfc84a-
-    a2212e0647d7bc34252dd05124c2d98b3e3120f8.pickle'
-    there is also a pickle file which stores a dictionary key to decode the
-    hashed names. This file naming is necessary to avoid having special
-    characters from the URLs in the filename.
-
-    Parameters
-    ----------
-    start_url : str
-        The URL for the Wikipedia page you wish to start from. Default
-        is None, if left as such, it will initialize with a random
-        Wikipedia page.
-    end_url : str
-        The destination URL for the Wikipedia page to count the number of
-        clicks. Default is None, if left as such, it will initialize with a
-        random Wikipedia page.
-    max_iter : int
-        The number of levels to iterate through in the search.
-    save_path : str
-        The path for which the output should be saved. It defaults to the
-        current working directory.
-    Examples
-    --------
-    >>> wiki = WikiCrawl(start_url='https://en.wiki.../Entscheidungsproblem',
-    >>> end_url='https://en.wiki.../My_Little_Pony:_Friendship_Is_Magic',
-    >>> max_iter = 6,
-    >>> save_path = 'Data/')
-
-    """
-    def __init__(self, start_url=None, end_url=None, max_iter=6, save_path=''):
-        self._max_iter = int(max_iter)
-        self._save_path = save_path
-
-        if start_url is None:
-            self._start_url = self.rand_wiki()
-        else:
-            self._start_url = start_url
-        print('Start: ' + self._start_url)
-
-        if end_url is None:
-            self._end_url = self.rand_wiki()
-        else:
-            self._end_url = end_url
-        print('End: ' + self._end_url)
-
-        if self.verify_url(self._start_url) is not True:
-            print('Invalid Start URL, Using Random Instead')
-            self._start_url = self.rand_wiki()
-            print('Start: ' + self._start_url)
-
-        if self.verify_url(self._end_url) is not True:
-            print('Invalid End URL, Using Random Instead')
-            self._end_url = self.rand_wiki()
-            print('End: ' + self._end_url)
-
-    def rand_wiki(self):
-        """Returns verified URL for random Wikipedia page.
-
-        Parameters
-        ----------
-        None.
-        Returns
-        -------
-        str
-            Full Wikipedia URL
-        """
-        resp = requests.get('https://en.wikipedia.org/wiki/Special:Random')
-        page = BeautifulSoup(resp.text, "lxml")
-        return('https://en.wikipedia.org' + page.find_all('a', {'accesskey': 'c'})[0].get('href'))
-
-    def verify_url(self, url):
-        """Checks to see if a URL is a valid Wikipedia page.
-
-        Parameters
-        ----------
-        url : str
-            url to verify
-        Returns
-        -------
-        bool
-            True or False
-        """
-        if 'https://en.wikipedia.org/wiki/' in url:
-            return(True)
-        if 'https://en.wikipedia.org/wiki/' not in url:
-            return(False)
-
-    def resolve_path(self, path):
-        """Determines the pages in the path and outputs the path.
-
-        Parameters
-        ----------
-        path : :obj:`list` of :obj:`str`:
-            Ordered list of URLs in path from start url to end url.
-        Returns
-        -------
-        str
-            Prints final output report for user.
-        """
-        titles = []
-        for x in path:
-            resp = requests.get(x)
-            page = BeautifulSoup(resp.text, "lxml")
-            titles.append(page.find_all('title')[0].get_text())
-        print('You Can Get From "{}" to "{}" in {} Clicks \nTree Size: {}\n\nPath:'
-        .format(titles[0][:-12], titles[-1][:-12], len(path)-1, self._tree.size()))
-        for i in range(len(titles)):
-            print('{}: {}'.format(titles[i][:-12], path[i]))
-
-    def get_urls(self, url):
-        """Searches through webpage for any link between <p> tags.
-
-        Parameters
-        ----------
-        url : str
-            URL of page to search for links.
-        Returns
-        -------
-        list
-            List of URLs on page.
-        """
-        # Get/Parse Website
-        resp = requests.get(url)
-        page = BeautifulSoup(resp.text, "lxml")
-        # Empty Links list
-        links = []
-        # Loop Through the p Tags
-        for x in page.find_all('p'):
-            # Parse URLS Into List
-            l = [g.get('href') for g in x.find_all('a') if 'en.wikipedia.org' not in g.get('href')]
-            l = [k for k in l if ':Citation_needed' not in k]
-            l = [k for k in l if '//' not in k]
-            l = ['https://en.wikipedia.org' + k for k in l if '#' not in k]
-            # Append Valid URLS Into Links List
-            [links.append(r) for r in l]
-        # Return List of Links
-        return(links)
-
-    def find_path(self):
-        """Iteratively scrapes pages from start_url until end_url has been
-        reached. Searches through the pages while building the tree. If max
-        iterations are reached before the end_url is found it will print a
-        message. Otherwise, the results are printed when the end_url is found.
-        """
-        self._tree = Tree()
-        self._tree.create_node(self._start_url, self._start_url)
-        quit = False
-        for b in range(self._max_iter):
-            print('Size at Level #{}: {}'.format(self._tree.depth(), self._tree.size()))
-            self.save_tree(finished=False)
-            for i in self._tree.paths_to_leaves():
-                try:
-                    urls = self.get_urls(i[-1])
-                except:
-                    continue
-                for x in urls:
-                    try:
-                        self._tree.create_node(x, x, parent=i[-1])
-                        if x == self._end_url:
-                            for x in self._tree.paths_to_leaves():
-                                if self._end_url in x:
-                                    self.resolve_path(x)
-                                    self.url_path = x
-                            print('Size at Level #{}: {}'.format(self._tree.depth(), self._tree.size()))
-                            self.save_tree(finished=True)
-                            quit = True
-                            break
-                    except:
-                        continue
-                if quit is True:
-                    break
-            if quit is True:
-                break
-        if quit is not True:
-            print('You Cannot Navigate Between These Pages In {} Clicks'.format(self._max_iter))
-
-    def save_tree(self, finished=False):
-        """Saves the tree for backup purposes and upon search completion.
-        Saves the files in the following format, 'hashed start_url'-'hashed
-        end_url'.pickle This is to prevent the special characters in the URLs
-        from causing the save to raise an error. Additionally, a file with the
-        word 'KEY' at the end, which contains a dict object to allow the user
-        to reverse the hashed URL.
-
-        Parameters
-        ----------
-        finished : bool
-            True or False, whether or not the search has been completed
-        """
-        filename = self.hash_url(self._start_url[30:])+'-'+self.hash_url(self._end_url[30:])
-
-        name_key = {
-        self.hash_url(self._start_url[30:]): self._start_url[30:],
-        self.hash_url(self._end_url[30:]): self._end_url[30:],
-        'Completed': finished
-        }
-
-        if finished is False:  # FIX THIS FEATURE
-            # Save Tree
-            with open('{}.pickle'.format(self._save_path+filename), 'wb') as handle:
-                pickle.dump(self._tree, handle, protocol=pickle.HIGHEST_PROTOCOL)
-            # print('Tree Saved as "{}.pickle"'.format(filename))
-
-            # Save Key
-            with open('{}.pickle'.format(self._save_path + filename + str('KEY')), 'wb') as handle:
-                pickle.dump(name_key, handle, protocol=pickle.HIGHEST_PROTOCOL)
-            print('Tree Saved as "{}.pickle"'.format(filename))
-
-        if finished is True:  # FIX THIS FEATURE
-            # Save Tree
-            with open('{}.pickle'.format(self._save_path + filename), 'wb') as handle:
-                pickle.dump(self._tree, handle, protocol=pickle.HIGHEST_PROTOCOL)
-            # print('Tree Saved as "{}.pickle"'.format(filename))
-
-            # Save Key
-            with open('{}.pickle'.format(self._save_path + filename+str('KEY')), 'wb') as handle:
-                pickle.dump(name_key, handle, protocol=pickle.HIGHEST_PROTOCOL)
-            print('Tree Saved as "{}.pickle"'.format(filename))
-
-    def hash_url(self, input_url):
-        """Hashes URL into characters.
-
-        Parameters
-        ----------
-        url : str
-            URL which needs to be hashed.
-        """
-        """Hash URL For Filename"""
-        hasher = hashlib.new('ripemd160')
-        hasher.update(input_url.encode('utf-8'))
-        return(hasher.hexdigest())
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Depencies
+from bs4 import BeautifulSoup
+import hashlib
+import heapq
+from collections import deque
+from contextlib import closing
+from Backlinks import APIBacklinks
+from PageFetcher import PageFetcher
+from LinkSource import LinkReader
+from TitleIndex import TitleIndex
+from CrawlFile import CrawlTree
+from Metrics import Metrics
+from Scheduler import Scheduler
+from Scorers import MixedScorer, TitleScorer, AnchorScorer
+
+
+def build_path(parents, url):
+    """Rebuilds the path from the start page to a reached page by
+    following a parent map.
+
+    Parameters
+    ----------
+    parents : dict
+        Maps each reached page to the page it was reached from, and the
+        start page to None.
+    url : str
+        URL of a reached page.
+    Returns
+    -------
+    list
+        Ordered list of URLs from the start page to url.
+    """
+    path = []
+    while url is not None:
+        path.append(url)
+        url = parents[url]
+    return(path[::-1])
+
+
+def iter_retry(read, urls, failed, metrics=None):
+    """Reads many pages, then reads those which failed with an error worth
+    retrying, such as a timeout, once more after the rest, so a passing
+    error does not cut a page and everything below it out of a search.
+
+    Parameters
+    ----------
+    read : callable
+        Called with a list of URLs, yields (url, result, error) tuples as
+        LinkReader.iter_links does.
+    urls : iterable
+        URLs of the pages to read.
+    failed : list
+        Pages which still cannot be read are appended to it as (url, error)
+        tuples.
+    metrics : Metrics
+        Counts every error under 'errors'. Default is None.
+    Yields
+    ------
+    tuple
+        (url, result) for every page read.
+    """
+    pending = list(urls)
+    for attempt in range(2):
+        retry = []
+        with closing(read(pending)) as results:
+            for url, result, error in results:
+                if error is None:
+                    yield((url, result))
+                    continue
+                if metrics is not None:
+                    metrics.count('errors')
+                if attempt == 0 and Scheduler.retryable(error):
+                    retry.append(url)
+                else:
+                    failed.append((url, repr(error)))
+        if len(retry) == 0:
+            break
+        pending = retry
+
+
+class WikiCrawl:
+    """Determintes The # of Clicks to Get from one Wikipedia Page to Another.
+    This class constructs a tree of pages until it reaches the end webpage. It
+    is intended to be used for testing how many clicks it takes to get from one
+    page to the next. The tree is saved for future analysist as a crawl
+    directory, read with CrawlFile. The name is the hash of each URL seperated
+    by a hyphen as follows:
+    'b939c0ade3436e8945a03753d35722de39dfc84a-
+    a2212e0647d7bc34252dd05124c2d98b3e3120f8.crawl'
+    and its header holds the URLs themselves. This file naming is necessary
+    to avoid having special characters from the URLs in the filename.
+
+    Parameters
+    ----------
+    start_url : str
+        The URL for the Wikipedia page you wish to start from. Default
+        is None, if left as such, it will initialize with a random
+        Wikipedia page.
+    end_url : str
+        The destination URL for the Wikipedia page to count the number of
+        clicks. Default is None, if left as such, it will initialize with a
+        random Wikipedia page.
+    max_iter : int
+        The number of levels to iterate through in the search.
+    save_path : str
+        The path for which the output should be saved. It defaults to the
+        current working directory.
+    strategy : str
+        How the pages are searched. 'bfs', the default, searches forward from
+        start_url only. 'bidirectional' also searches backward from end_url
+        and stops when the two searches meet, which fetches far fewer pages
+        for distant pairs. 'best' always reads the most promising page found
+        so far, as ranked by scorer, the way people head for pages related to
+        the target. It usually reads 10-100 times fewer pages than 'bfs', but
+        the path it finds may be longer than the shortest.
+    backlinks : object
+        The "What Links Here" source used by the 'bidirectional' strategy.
+        Any object with a get_backlinks(url) method returning a list of URLs
+        will do, such as Backlinks.GraphBacklinks built from a WikiDump graph.
+        Default is None, which uses the MediaWiki API through
+        Backlinks.APIBacklinks, whose backlinks also count template links
+        the forward search skips.
+    workers : int
+        The number of pages downloaded at once while expanding a level.
+        Default is 8.
+    scorer : object
+        How the 'best' strategy ranks the links it finds. Any object with a
+        start(target_url, crawl) method, called once before the search, and
+        a score(url, anchor) method returning a number, higher first, will
+        do, such as those in Scorers. Default is None, which uses
+        Scorers.TitleScorer and Scorers.AnchorScorer together. The anchor
+        text of a link is only known when its page is downloaded and parsed
+        during the search. Links of pages read from the cache, or with
+        link_source='api', are scored with anchor None, and AnchorScorer
+        falls back to the title their URL spells.
+    beam_width : int
+        The most pages the 'best' strategy keeps waiting to be read. The
+        lowest scored are dropped. Default is None, which keeps them all.
+    max_fetches : int
+        The most pages the 'best' strategy reads before giving up. Default is
+        None, no limit.
+    base_url : str
+        Sends requests for 'https://en.wikipedia.org' to another host, such
+        as a local stand-in server. Default is None.
+    cache : LinkCache
+        An on-disk cache of page titles and links shared between runs and
+        crawl classes. Default is None, which downloads every page.
+    parser : str
+        The LinkExtractor backend used to read links from pages. Default is
+        'lxml', the fastest.
+    link_source : str
+        Where the links of each page come from. 'html', the default, reads
+        the links between <p> tags of the page itself. 'api' asks the
+        MediaWiki API for the links of 50 pages per request, which is much
+        cheaper but also returns links outside the paragraphs, such as those
+        in infoboxes and navigation boxes.
+    index : TitleIndex
+        The index of page titles and redirects. It is filled as pages are
+        read, links to redirects are merged into the page they point to and
+        the report of the path is made from it without downloading anything.
+        Default is None, which starts an empty index. One built from a dump
+        with TitleIndex.from_dump knows every redirect in advance.
+    metrics : Metrics
+        Where the search's timers and counters are kept: downloads, parsing,
+        link extraction, each level, tree saves and cache hits. Every save of
+        the tree reports them. Default is None, which keeps them in memory
+        only, in the metrics attribute.
+    scheduler : Scheduler
+        Paces and retries every request. Default is None, which retries
+        failed requests with backoff and backs off when the server
+        throttles, with no rate limit.
+    processes : int
+        The number of processes parsing the pages read as HTML. Pages then
+        flow through a Pipeline, downloaded on the worker threads and parsed
+        in these processes while the next ones download. Default is None,
+        which parses each page on the thread that downloaded it.
+    Examples
+    --------
+    >>> wiki = WikiCrawl(start_url='https://en.wiki.../Entscheidungsproblem',
+    >>> end_url='https://en.wiki.../My_Little_Pony:_Friendship_Is_Magic',
+    >>> max_iter = 6,
+    >>> save_path = 'Data/')
+    >>>
+    >>> # Search From Both Ends Using a Previous WikiDump Graph
+    >>> wiki = WikiCrawl(start_url='https://en.wiki.../Entscheidungsproblem',
+    >>> end_url='https://en.wiki.../My_Little_Pony:_Friendship_Is_Magic',
+    >>> strategy='bidirectional',
+    >>> backlinks=GraphBacklinks('Data/Full_WIKI.pickle'))
+    >>>
+    >>> # Head for Pages Close to the Target in a Previous Dump
+    >>> wiki = WikiCrawl(start_url='https://en.wiki.../Entscheidungsproblem',
+    >>> end_url='https://en.wiki.../My_Little_Pony:_Friendship_Is_Magic',
+    >>> strategy='best', scorer=DistanceScorer('Data/Full_WIKI.csr'),
+    >>> max_fetches=500)
+    >>> wiki.find_path()
+    >>> wiki.pages_fetched
+
+    """
+    def __init__(self, start_url=None, end_url=None, max_iter=6, save_path='', strategy='bfs', backlinks=None, workers=8, base_url=None, cache=None, parser='lxml', link_source='html', index=None, metrics=None, scheduler=None, processes=None, scorer=None, beam_width=None, max_fetches=None):
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._max_iter = int(max_iter)
+        self._save_path = save_path
+
+        if strategy not in ('bfs', 'bidirectional', 'best'):
+            raise ValueError('Unknown Search Strategy: {}'.format(strategy))
+        self._strategy = strategy
+        self._fetcher = PageFetcher(workers=workers, base_url=base_url, metrics=self.metrics, scheduler=scheduler)
+        if strategy == 'bidirectional' and backlinks is None:
+            backlinks = APIBacklinks(fetcher=self._fetcher)
+        self._backlinks = backlinks
+        self._index = index if index is not None else TitleIndex()
+        self.failed_urls = []
+        if strategy == 'best' and scorer is None:
+            scorer = MixedScorer([(TitleScorer(), 1.0), (AnchorScorer(), 1.0)])
+        self._scorer = scorer
+        self._beam_width = beam_width
+        self._max_fetches = max_fetches
+        self._batch = int(workers)
+        self.pages_fetched = 0
+        # Anchor Text Is Kept Only for the Best First Search, Which Pops It, and Only if the Scorer Uses It
+        anchors = strategy == 'best' and getattr(scorer, 'anchors', False) is True
+        self._reader = LinkReader(self._fetcher, self._index, parser, link_source, cache=cache, processes=processes,
+                                  anchors=anchors, metrics=self.metrics)
+
+        if start_url is None:
+            self._start_url = self.rand_wiki()
+        else:
+            self._start_url = start_url
+        print('Start: ' + self._start_url)
+
+        if end_url is None:
+            self._end_url = self.rand_wiki()
+        else:
+            self._end_url = end_url
+        print('End: ' + self._end_url)
+
+        if self.verify_url(self._start_url) is not True:
+            print('Invalid Start URL, Using Random Instead')
+            self._start_url = self.rand_wiki()
+            print('Start: ' + self._start_url)
+
+        if self.verify_url(self._end_url) is not True:
+            print('Invalid End URL, Using Random Instead')
+            self._end_url = self.rand_wiki()
+            print('End: ' + self._end_url)
+
+        self._start_url = self._index.canonical(self._start_url)
+        self._end_url = self._index.canonical(self._end_url)
+
+    def rand_wiki(self):
+        """Returns verified URL for random Wikipedia page.
+
+        Parameters
+        ----------
+        None.
+        Returns
+        -------
+        str
+            Full Wikipedia URL
+        """
+        resp = self._fetcher.get('https://en.wikipedia.org/wiki/Special:Random')
+        page = BeautifulSoup(resp.text, "lxml")
+        url = 'https://en.wikipedia.org' + page.find_all('a', {'accesskey': 'c'})[0].get('href')
+        self._reader.parse_soup(url, page)
+        return(url)
+
+    def verify_url(self, url):
+        """Checks to see if a URL is a valid Wikipedia page.
+
+        Parameters
+        ----------
+        url : str
+            url to verify
+        Returns
+        -------
+        bool
+            True or False
+        """
+        if 'https://en.wikipedia.org/wiki/' in url:
+            return(True)
+        if 'https://en.wikipedia.org/wiki/' not in url:
+            return(False)
+
+    def resolve_path(self, path):
+        """Determines the pages in the path and outputs the path. The titles
+        come from the title index, so nothing is downloaded.
+
+        Parameters
+        ----------
+        path : :obj:`list` of :obj:`str`:
+            Ordered list of URLs in path from start url to end url.
+        Returns
+        -------
+        str
+            Prints final output report for user.
+        """
+        titles = [self._index.title(x) for x in path]
+        print('You Can Get From "{}" to "{}" in {} Clicks \nTree Size: {}\n\nPath:'
+        .format(titles[0], titles[-1], len(path)-1, self._tree.size()))
+        for i in range(len(titles)):
+            print('{}: {}'.format(titles[i], path[i]))
+
+    def get_title(self, url):
+        """Returns the title of a page from the title index, without
+        downloading it.
+
+        Parameters
+        ----------
+        url : str
+            URL of page to read.
+        Returns
+        -------
+        str
+            Contents of the page's <title> tag.
+        """
+        return(self._index.title(url) + ' - Wikipedia')
+
+    def get_urls(self, url):
+        """Searches through webpage for any link between <p> tags.
+
+        Parameters
+        ----------
+        url : str
+            URL of page to search for links.
+        Returns
+        -------
+        list
+            List of URLs on page.
+        """
+        return(self._reader.get_urls(url))
+
+    def find_path(self):
+        """Iteratively scrapes pages from start_url until end_url has been
+        reached. Searches with the strategy chosen on initialization while
+        building the tree. If max iterations are reached before the end_url is
+        found it will print a message. Otherwise, the results are printed when
+        the end_url is found.
+        """
+        self._tree = CrawlTree()
+        self._tree.create_node(self._start_url, self._start_url)
+        self._parents = {self._start_url: None}
+        pages = self.metrics.snapshot()['counters'].get('pages', 0)
+        try:
+            if self._strategy == 'bidirectional':
+                path = self.bidirectional_search()
+            elif self._strategy == 'best':
+                path = self.best_first_search()
+            else:
+                path = self.bfs_search()
+        finally:
+            # The Parsing Processes Must Not Outlive a Failed Search
+            self._reader.close()
+        self.pages_fetched = self.metrics.snapshot()['counters'].get('pages', 0) - pages
+        if path is not None:
+            self.url_path = path
+            self.resolve_path(self.url_path)
+            print('Size at Level #{}: {}'.format(len(self.url_path)-1, self._tree.size()))
+            print('Pages Fetched: {}'.format(self.pages_fetched))
+            self.save_tree(finished=True)
+        if path is None:
+            print('You Cannot Navigate Between These Pages In {} Clicks'.format(self._max_iter))
+
+    def bfs_search(self):
+        """Runs a level-synchronous breadth first search from start_url. The
+        pages of each level wait in a frontier queue, every page is fetched at
+        most once and a parent map records where each page was first reached
+        from. The search stops as soon as end_url shows up in a page's links.
+
+        Returns
+        -------
+        list
+            Ordered list of URLs from start_url to end_url, or None if end_url
+            was not reached within max_iter clicks.
+        """
+        if self._start_url == self._end_url:
+            return([self._start_url])
+        frontier = deque([self._start_url])
+        for b in range(self._max_iter):
+            if len(frontier) == 0:
+                break
+            print('Size at Level #{}: {}'.format(b, self._tree.size()))
+            self.save_tree(finished=False)
+            with self.metrics.timer('level'):
+                frontier, meet = self.expand_forward(frontier, {self._end_url: None})
+            if meet is not None:
+                return(self.build_path(meet))
+        return(None)
+
+    def bidirectional_search(self):
+        """Searches forward from start_url and backward from end_url until
+        the two searches meet. Each level expands whichever frontier is
+        smaller, so the number of levels expanded never exceeds max_iter.
+        Pages found by the backward search are added to the tree once the
+        path is known so the saved tree still leads from start to end.
+
+        Returns
+        -------
+        list
+            Ordered list of URLs from start_url to end_url, or None if end_url
+            was not reached within max_iter clicks.
+        """
+        # Maps Each Page Found Backward to the Next Page Towards end_url
+        self._children = {self._end_url: None}
+        if self._start_url == self._end_url:
+            return([self._start_url])
+        forward = deque([self._start_url])
+        backward = deque([self._end_url])
+        for b in range(self._max_iter):
+            if len(forward) == 0 or len(backward) == 0:
+                break
+            print('Size at Level #{}: {} Forward, {} Backward'.format(b, self._tree.size(), len(self._children)))
+            self.save_tree(finished=False)
+            with self.metrics.timer('level'):
+                if len(forward) <= len(backward):
+                    forward, meet = self.expand_forward(forward, self._children)
+                else:
+                    backward, meet = self.expand_backward(backward)
+            if meet is not None:
+                path = self.build_path(meet)
+                x = self._children[meet]
+                while x is not None:
+                    if not self._tree.contains(x):
+                        self._tree.create_node(x, x, parent=path[-1])
+                    path.append(x)
+                    x = self._children[x]
+                return(path)
+        return(None)
+
+    def best_first_search(self):
+        """Runs a best first search from start_url. The pages found wait in a
+        priority queue ordered by the scorer, and each round reads the best
+        few of them, as many as there are workers, at once. Pages more than
+        max_iter clicks from start_url are not read. The search stops as soon
+        as end_url shows up in a page's links, when nothing is left to read or
+        when max_fetches pages have been read.
+
+        Returns
+        -------
+        list
+            Ordered list of URLs from start_url to end_url, or None if end_url
+            was not reached.
+        """
+        if self._start_url == self._end_url:
+            return([self._start_url])
+        self._scorer.start(self._end_url, self)
+        # Entries Are (-score, clicks, order found, url), so Ties Go to the Shallower
+        queue = [(0.0, 0, 0, self._start_url)]
+        depth = {self._start_url: 0}
+        found = 1
+        fetched = 0
+        saved = 0
+        while len(queue) > 0:
+            if self._max_fetches is not None and fetched >= self._max_fetches:
+                print('Gave Up After Fetching {} Pages'.format(fetched))
+                break
+            n = self._batch
+            if self._max_fetches is not None:
+                n = min(n, self._max_fetches - fetched)
+            batch = [heapq.heappop(queue)[3] for k in range(min(n, len(queue)))]
+            with closing(self.iter_retry(self._reader.iter_links, batch)) as results:
+                for parent, urls in results:
+                    fetched += 1
+                    self.metrics.tick()
+                    anchors = self._reader.anchors.pop(parent, {}) if self._reader.anchors is not None else {}
+                    page = self._index.canonical(parent)
+                    if page != parent:
+                        # The Page Was a Redirect, so the Page It Leads to Was Reached
+                        if page in self._parents:
+                            continue
+                        depth[page] = depth[parent]
+                        parent = self.reach_redirect(parent, page)
+                        if page == self._end_url:
+                            return(self.build_path(page))
+                    for x in urls:
+                        if x in self._parents:
+                            continue
+                        self._parents[x] = parent
+                        self._tree.create_node(x, x, parent=parent)
+                        if x == self._end_url:
+                            return(self.build_path(x))
+                        depth[x] = depth[parent] + 1
+                        if depth[x] < self._max_iter:
+                            found += 1
+                            heapq.heappush(queue, (-self._scorer.score(x, anchors.get(x)), depth[x], found, x))
+            if self._beam_width is not None and len(queue) > self._beam_width:
+                queue = heapq.nsmallest(self._beam_width, queue)
+                heapq.heapify(queue)
+            if fetched - saved >= 500:
+                saved = fetched
+                print('Pages Fetched: {}, Tree Size: {}'.format(fetched, self._tree.size()))
+                self.save_tree(finished=False)
+        return(None)
+
+    def expand_forward(self, frontier, targets):
+        """Fetches every page in the frontier and queues the pages they link
+        to which have not been reached yet. Pages are downloaded concurrently
+        and handled in the order they finish.
+
+        Parameters
+        ----------
+        frontier : deque
+            URLs of the pages at the current level.
+        targets : dict
+            URLs which end the search as soon as one is reached.
+        Returns
+        -------
+        tuple
+            The frontier for the next level and the target URL reached, or
+            None if no target was reached.
+        """
+        next_frontier = deque()
+        with closing(self.iter_retry(self._reader.iter_links, frontier)) as results:
+            for parent, urls in results:
+                self.metrics.tick()
+                page = self._index.canonical(parent)
+                if page != parent:
+                    # The Page Was a Redirect, so the Page It Leads to Was Reached
+                    if page in self._parents:
+                        continue
+                    parent = self.reach_redirect(parent, page)
+                    if page in targets:
+                        return(next_frontier, page)
+                for x in urls:
+                    # Skip Pages Already Reached at This or an Earlier Level
+                    if x in self._parents:
+                        continue
+                    self._parents[x] = parent
+                    self._tree.create_node(x, x, parent=parent)
+                    if x in targets:
+                        return(next_frontier, x)
+                    next_frontier.append(x)
+        return(next_frontier, None)
+
+    def expand_backward(self, frontier):
+        """Asks the backlink source for the pages linking to each page in the
+        frontier and queues those not reached backward yet.
+
+        Parameters
+        ----------
+        frontier : deque
+            URLs of the pages at the current backward level.
+        Returns
+        -------
+        tuple
+            The frontier for the next backward level and the URL where the
+            backward search met the forward search, or None if they did not.
+        """
+        next_frontier = deque()
+        get_backlinks = self.metrics.profiled(self._backlinks.get_backlinks)
+        with closing(self.iter_retry(lambda x: self._fetcher.map_unordered(get_backlinks, x), frontier)) as results:
+            for child, urls in results:
+                self.metrics.count('backlink_pages')
+                for x in urls:
+                    x = self._index.canonical(x)
+                    if x in self._children:
+                        continue
+                    self._children[x] = child
+                    if x in self._parents:
+                        return(next_frontier, x)
+                    next_frontier.append(x)
+        return(next_frontier, None)
+
+    def iter_retry(self, read, urls):
+        """Reads many pages with the module's iter_retry. Pages which still
+        cannot be read are added to failed_urls and counted in a message.
+
+        Parameters
+        ----------
+        read : callable
+            Called with a list of URLs, yields (url, result, error) tuples
+            as LinkReader.iter_links does.
+        urls : iterable
+            URLs of the pages to read.
+        Yields
+        ------
+        tuple
+            (url, result) for every page read.
+        """
+        failed = []
+        with closing(iter_retry(read, urls, failed, self.metrics)) as results:
+            for result in results:
+                yield(result)
+        if len(failed) > 0:
+            self.failed_urls.extend(failed)
+            print('Could Not Read {} Pages, Listed in failed_urls'.format(len(failed)))
+
+    def reach_redirect(self, alias, page):
+        """Records a page as reached through a redirect to it, in as many
+        clicks as the redirect, so paths go through the page itself and its
+        links are found from it. The page is added to the tree under the
+        redirect.
+
+        Parameters
+        ----------
+        alias : str
+            URL of the redirect read.
+        page : str
+            URL of the page the redirect leads to.
+        Returns
+        -------
+        str
+            The URL of the page.
+        """
+        self._parents[page] = self._parents[alias]
+        self._tree.create_node(page, page, parent=alias)
+        return(page)
+
+    def build_path(self, url):
+        """Rebuilds the path from start_url to a reached page by following
+        the parent map built during the search.
+
+        Parameters
+        ----------
+        url : str
+            URL of a page reached by the search.
+        Returns
+        -------
+        list
+            Ordered list of URLs from start_url to url.
+        """
+        return(build_path(self._parents, url))
+
+    def save_tree(self, finished=False):
+        """Saves the tree for backup purposes and upon search completion.
+        Saves the tree as a crawl directory in the following format, 'hashed
+        start_url'-'hashed end_url'.crawl This is to prevent the special
+        characters in the URLs from causing the save to raise an error. Each
+        save only appends the pages reached since the last one. The header of
+        the directory holds the URLs, whether the search was completed and
+        the path found.
+
+        Parameters
+        ----------
+        finished : bool
+            True or False, whether or not the search has been completed
+        """
+        filename = self.hash_url(self._start_url[30:])+'-'+self.hash_url(self._end_url[30:])
+        header = {
+            'start_url': self._start_url,
+            'end_url': self._end_url,
+            'completed': finished,
+            'path': self.url_path if finished is True else None,
+            'strategy': self._strategy,
+            'max_iter': self._max_iter
+        }
+        with self.metrics.timer('checkpoint'):
+            self._tree.save('{}.crawl'.format(self._save_path + filename), header)
+        self.metrics.gauge('tree_size', self._tree.size())
+        self.metrics.report(force=True)
+        print('Tree Saved as "{}.crawl"'.format(filename))
+
+    def hash_url(self, input_url):
+        """Hashes URL into characters.
+
+        Parameters
+        ----------
+        url : str
+            URL which needs to be hashed.
+        """
+        """Hash URL For Filename"""
+        hasher = hashlib.new('ripemd160')
+        hasher.update(input_url.encode('utf-8'))
+        return(hasher.hexdigest())
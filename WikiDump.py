@@ -1,214 +1,595 @@
-# !/usr/bin/env python3
-# Author: Austin Smith - https://github.com/aws24689
-# PEP-8
-
-# Import Dependencies
-import requests
-from bs4 import BeautifulSoup
-import pickle
-import networkx as nx
-import time
-
-
-class WikiDump:
-    """Class to Create Networkx Digraph With a Node for Every Single Wiki Page.
-    Pulls every single Wikipedia page starting at a seed page specified by
-    user. It loops through all pages until it reaches a max number of nodes. It
-    can be restarted so it doesn't need to be run at once. This script can take
-    a very long time to run, and is very memory intensive.
-
-    Parameters
-    ----------
-    stop_count : int
-        The number at which to stop looping. As of February 2017, there are
-        5,323,885 pages on Wikipedia. The default value is set to 5,000,000.
-        Additionally, this can be run again with a higher stop_count. The
-        algorithm will likely stop slightly higher than the stop_count, due to
-        the way the iterations work.
-    seed_page : str
-        The page to start the network from. Chose a page with a large quantity
-        of links on it for this, the default is:
-        'https://en.wikipedia.org/wiki/United_States'. If an invalid URL is
-        entered, the program will initialize with a random seed_page.
-    rand_seed : bool
-        True or False. If True, it will ignore the seed_page parameter and
-        initialize with a random seed.
-    save_path : str
-        The path for which the output should be saved. It defaults to
-        'Data/fullnet1.pickle'. This must end in *.pickle.
-    new_dump : bool
-        True or False, default is True. If True, it will start from the seed,
-        if False it will start with a user specified previous run.
-    previous_path : str
-        If starting from a previously created file enter the filepath here
-        including the *.pickle portion.
-    save_increment : int
-        The approximate value for how frequently the data is saved. Default is
-        100,000, however, it may be better to use smaller to avoid losing data
-        in between saves. On save, it prints the current time and whether or
-        not it was successfully written. It will save as close to this interval
-        as possible but may be slightly over due to the nature of the scraping
-        process.
-    suppress_output : bool
-        True or False, if set to True, the script will run silent and only
-        display a message to indicate it has reached the stop_count.
-    Examples
-    --------
-    >>> # Start New Dump
-    >>> WD = WikiDump(save_path = "Data/Full_WIKI.pickle")
-    >>> WD.start_dump()
-    [OUTPUT]
-    >>> # Restart Previous Dump
-    >>> NWD = WikiDump(stop_count=5000000, rand_seed=False,
-    >>> save_path="Data/Full_WIKI1.pickle", new_dump=False,
-    >>> previous_path="Data/Full_WIKI.pickle",
-    >>> save_increment=10000, suppress_output=False)
-    >>> NWD.start_dump()
-    [OUTPUT]
-
-    """
-    def __init__(self, stop_count=5000000, seed_page='https://en.wikipedia.org/wiki/United_States', rand_seed=False, save_path='Data/fullnet1.pickle', new_dump=True, previous_path=None, save_increment=100000, suppress_output=False):
-        self.__suppress_output = suppress_output
-        self._stop_count = stop_count
-        # Setting Seed
-        self._seed = seed_page
-        if rand_seed is not True:
-            # Check if Valid, If not Use random
-            if self.verify_url(seed_page) is True:
-                self._seed = seed_page
-            if self.verify_url(self._seed) is not True:
-                self.alert("Invalid Seed Page! Using Random Page")
-                self._seed = self.rand_wiki()
-        if rand_seed is True:
-            self._seed = self.rand_wiki()
-
-        self._save_path = save_path
-        self._new = new_dump
-        self._save_inc = save_increment
-        self._previous = previous_path
-
-        if new_dump is not False:
-            self.alert("Seed Page Set to: {}".format(self._seed))
-
-        # Initializing DiGraph
-        if self._new is True:
-            self._G = nx.DiGraph()
-            self._G.add_node(self._seed)
-            self._viewed = dict()
-        if self._new is False:
-            try:
-                self.alert("Initializing Previous Network...")
-                with open(self._previous, 'rb') as handle:
-                    self._G = pickle.load(handle)
-
-                with open(self._previous[:-7]+'dict'+'.pickle', 'rb') as handle:
-                    self._viewed = pickle.load(handle)
-                self.alert("Previous Network Initialized With {} Nodes".format(len(self._G.nodes())))
-            except:
-                self.alert("Graph Initialization Failed!")
-
-    def get_urls(self, url):
-        """Searches through webpage for any link between <p> tags.
-
-        Parameters
-        ----------
-        url : str
-            URL of page to search for links.
-        Returns
-        -------
-        list
-            List of URLs on page.
-        """
-        # Get/Parse Website
-        resp = requests.get(url)
-        page = BeautifulSoup(resp.text, "lxml")
-        # Emptry Links list
-        links = []
-        # Loop Through the p Tags
-        for x in page.find_all('p'):
-            # Parse URLS Into List
-            l = [g.get('href') for g in x.find_all('a') if 'en.wikipedia.org' not in g.get('href')]
-            l = [k for k in l if ':Citation_needed' not in k]
-            l = [k for k in l if '//' not in k]
-            l = ['https://en.wikipedia.org' + k for k in l if '#' not in k]
-            # Append Valid URLS Into Links List
-            [links.append(r) for r in l]
-        # Return List of Links
-        return(links)
-
-    def rand_wiki(self):
-        """Returns verified URL for random Wikipedia page.
-
-        Parameters
-        ----------
-        None.
-        Returns
-        -------
-        str
-            Full Wikipedia URL
-        """
-
-        resp = requests.get('https://en.wikipedia.org/wiki/Special:Random')
-        page = BeautifulSoup(resp.text, "lxml")
-        url = 'https://en.wikipedia.org'+page.find_all('a', {'accesskey': 'c'})[0].get('href')
-        if verify_url(url) is True:
-            return(url)
-
-    def verify_url(self, url):
-        """Checks to see if a URL is a valid Wikipedia page.
-        Parameters
-        ----------
-        url : str
-            url to verify
-        Returns
-        -------
-        bool
-            True or False
-        """
-        if 'https://en.wikipedia.org/wiki/' in url:
-            return(True)
-
-    def alert(self, message):
-        """Prints Message if User Has Not Suppressed the Outputs
-        Checks to determine whether or not the user has the suppressed_outputs
-        parameter set to True, if not, it prints the message passed to the
-        function.
-
-        Parameters
-        ----------
-        url : str
-            URL to verify
-        """
-        if self.__suppress_output is not True:
-            print(message)
-
-    def start_dump(self):
-        """Starts Building Network of Wikipedia Pages"""
-        nds_save = 0
-        while len(self._G.nodes()) < self._stop_count:
-            for i in self._G.nodes():
-                nds = len(self._G.nodes())
-                if i not in self._viewed:
-                    temp = self.get_urls(i)
-                    for j in temp:
-                        self._G.add_edge(i, j)
-                    self._viewed[i] = 1
-                if nds > nds_save:
-                    nds_save = nds+self._save_inc
-                    self.alert(time.ctime(time.time()))
-
-                    with open(self._save_path, 'wb') as handle:
-                        pickle.dump(self._G, handle, protocol=pickle.HIGHEST_PROTOCOL)
-                    with open(self._save_path[:-7]+'dict'+'.pickle', 'wb') as handle:
-                        pickle.dump(self._viewed, handle, protocol=pickle.HIGHEST_PROTOCOL)
-                    self.alert("File Saved! # of Nodes:{}".format(nds))
-
-                if nds > self._stop_count:
-                    break
-        print("Program Complete! Node Count Reached {}".format(self._stop_count))
-        with open(self._save_path, 'wb') as handle:
-            pickle.dump(self._G, handle, protocol=pickle.HIGHEST_PROTOCOL)
-        with open(self._save_path[:-7]+'dict'+'.pickle', 'wb') as handle:
-            pickle.dump(viewed, handle, protocol=pickle.HIGHEST_PROTOCOL)
-            print(time.ctime(time.time()))
-            print("File Saved! # of Nodes:{}".format(nds))
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+from bs4 import BeautifulSoup
+import pickle
+import networkx as nx
+import time
+import os
+from contextlib import closing
+from PageFetcher import PageFetcher
+from LinkSource import APILinkSource, LinkReader
+from XMLDump import XMLDumpReader
+from CSRGraph import CSRGraph
+from CheckpointLog import CheckpointLog
+from WorkQueue import WorkQueue
+from TitleIndex import TitleIndex, merge_redirects
+from Metrics import Metrics
+
+
+class WikiDump:
+    """Class to Create Networkx Digraph With a Node for Every Single Wiki Page.
+    Pulls every single Wikipedia page starting at a seed page specified by
+    user. It loops through all pages until it reaches a max number of nodes. It
+    can be restarted so it doesn't need to be run at once. This script can take
+    a very long time to run, and is very memory intensive.
+
+    Parameters
+    ----------
+    stop_count : int
+        The number at which to stop looping. As of February 2017, there are
+        5,323,885 pages on Wikipedia. The default value is set to 5,000,000.
+        Additionally, this can be run again with a higher stop_count. The
+        algorithm will likely stop slightly higher than the stop_count, due to
+        the way the iterations work.
+    seed_page : str
+        The page to start the network from. Chose a page with a large quantity
+        of links on it for this, the default is:
+        'https://en.wikipedia.org/wiki/United_States'. If an invalid URL is
+        entered, the program will initialize with a random seed_page.
+    rand_seed : bool
+        True or False. If True, it will ignore the seed_page parameter and
+        initialize with a random seed.
+    save_path : str
+        The path for which the output should be saved. It defaults to
+        'Data/fullnet1.pickle'. This must end in *.pickle. Progress is
+        checkpointed to an append-only log in a directory next to it, e.g.
+        'Data/fullnet1.log'.
+    new_dump : bool
+        True or False, default is True. If True, it will start from the seed,
+        if False it will start with a user specified previous run.
+    previous_path : str
+        If starting from a previously created file enter the filepath here
+        including the *.pickle portion. If its checkpoint log exists, the log
+        is replayed, otherwise the pickles themselves are loaded.
+    save_increment : int
+        The approximate value for how frequently the data is saved. Default is
+        100,000, however, it may be better to use smaller to avoid losing data
+        in between saves. Each save only appends the pages crawled since the
+        last one to the checkpoint log. On save, it prints the current time
+        and whether or not it was successfully written. It will save as
+        close to this interval as possible but may be slightly over due to
+        the nature of the scraping process.
+    suppress_output : bool
+        True or False, if set to True, the script will run silent and only
+        display a message to indicate it has reached the stop_count.
+    workers : int
+        The number of pages downloaded at once. Default is 8.
+    base_url : str
+        Sends requests for 'https://en.wikipedia.org' to another host, such
+        as a local stand-in server. Default is None.
+    cache : LinkCache
+        An on-disk cache of page titles and links shared between runs and
+        crawl classes. Default is None, which downloads every page.
+    parser : str
+        The LinkExtractor backend used to read links from pages. Default is
+        'lxml', the fastest.
+    link_source : str
+        Where the links of each page come from. 'html', the default, reads
+        the links between <p> tags of the page itself. 'api' asks the
+        MediaWiki API for the links of 50 pages per request, which is much
+        cheaper but also returns links outside the paragraphs, such as those
+        in infoboxes and navigation boxes.
+    priority : str
+        The order pages are crawled in. 'fifo', the default, crawls them in
+        the order they were discovered. 'indegree' crawls the pages linked
+        from the most crawled pages first, so a partial crawl covers the most
+        linked pages. The queue of pages to crawl is kept on disk next to the
+        checkpoint log and survives restarts.
+    index : TitleIndex
+        The index of page titles and redirects. It is filled as pages are
+        read and links to redirects are merged into the page they point to.
+        Default is None, which starts an empty index. One built from a dump
+        with TitleIndex.from_dump knows every redirect in advance.
+    metrics : Metrics
+        Where the dump's timers and counters are kept: downloads, parsing,
+        link extraction, graph inserts, checkpoints and cache hits. Every
+        checkpoint reports them. Default is None, which keeps them in memory
+        only, in the metrics attribute.
+    scheduler : Scheduler
+        Paces and retries every request. Default is None, which retries
+        failed requests with backoff and backs off when the server
+        throttles, with no rate limit.
+    processes : int
+        The number of processes parsing the pages read as HTML. Pages then
+        flow through a Pipeline, downloaded on the worker threads and parsed
+        in these processes while the next ones download. Default is None,
+        which parses each page on the thread that downloaded it.
+    Examples
+    --------
+    >>> # Start New Dump
+    >>> WD = WikiDump(save_path = "Data/Full_WIKI.pickle")
+    >>> WD.start_dump()
+    [OUTPUT]
+    >>> # Restart Previous Dump
+    >>> NWD = WikiDump(stop_count=5000000, rand_seed=False,
+    >>> save_path="Data/Full_WIKI1.pickle", new_dump=False,
+    >>> previous_path="Data/Full_WIKI.pickle",
+    >>> save_increment=10000, suppress_output=False)
+    >>> NWD.start_dump()
+    [OUTPUT]
+    >>> # Build From a Downloaded Dump Without Crawling
+    >>> XWD = WikiDump(save_path="Data/Full_WIKI.pickle")
+    >>> XWD.ingest_dump("Data/enwiki-latest-pages-articles.xml.bz2", workers=4)
+    [OUTPUT]
+    >>> XWD.save_csr("Data/Full_WIKI.csr")
+    >>> # Read Again Only the Pages Edited Since the Dump or the Last Refresh
+    >>> RWD = WikiDump(save_path="Data/Full_WIKI.pickle", new_dump=False,
+    >>> previous_path="Data/Full_WIKI.pickle")
+    >>> RWD.refresh(since='last')
+    [OUTPUT]
+    >>> # Write Metrics Every Minute and Profile Pages 10,000 to 12,000
+    >>> MWD = WikiDump(save_path="Data/Full_WIKI.pickle",
+    >>> metrics=Metrics('Data/Full_WIKI.metrics.jsonl', profile_path='Data/Full_WIKI.prof',
+    >>> profile_window=(10000, 12000)))
+
+    """
+    def __init__(self, stop_count=5000000, seed_page='https://en.wikipedia.org/wiki/United_States', rand_seed=False, save_path='Data/fullnet1.pickle', new_dump=True, previous_path=None, save_increment=100000, suppress_output=False, workers=8, base_url=None, cache=None, parser='lxml', link_source='html', priority='fifo', index=None, metrics=None, scheduler=None, processes=None):
+        self.__suppress_output = suppress_output
+        self.metrics = metrics if metrics is not None else Metrics()
+        self._fetcher = PageFetcher(workers=workers, base_url=base_url, metrics=self.metrics, scheduler=scheduler)
+        self._workers = int(workers)
+        self._index = index if index is not None else TitleIndex()
+        # Keeps the Version of Each Page Downloaded Until the Dump's Loop Records It
+        self._reader = LinkReader(self._fetcher, self._index, parser, link_source, cache=cache, processes=processes,
+                                  revisions=True, metrics=self.metrics)
+        self._stop_count = stop_count
+        # Setting Seed
+        self._seed = seed_page
+        if rand_seed is not True:
+            # Check if Valid, If not Use random
+            if self.verify_url(seed_page) is True:
+                self._seed = seed_page
+            if self.verify_url(self._seed) is not True:
+                self.alert("Invalid Seed Page! Using Random Page")
+                self._seed = self.rand_wiki()
+        if rand_seed is True:
+            self._seed = self.rand_wiki()
+
+        self._save_path = save_path
+        self._new = new_dump
+        self._save_inc = save_increment
+        self._previous = previous_path
+        self._log = CheckpointLog(self._save_path[:-7]+'.log')
+        self._queue = WorkQueue(self._save_path[:-7]+'.log/queue.sqlite', priority=priority)
+
+        if new_dump is not False:
+            self.alert("Seed Page Set to: {}".format(self._seed))
+
+        # Initializing DiGraph
+        if self._new is True:
+            self._G = nx.DiGraph()
+            self._G.add_node(self._seed)
+            self._viewed = dict()
+            self._log.reset()
+            self._log.record_refresh(time.time())
+            self._log.record_node(self._seed)
+            self._queue.reset()
+            self._queue.push([self._seed])
+            self._queue.commit()
+        if self._new is False:
+            try:
+                self.alert("Initializing Previous Network...")
+                previous_log = self._previous[:-7]+'.log'
+                refreshed = None
+                redirects = dict()
+                if os.path.isdir(previous_log):
+                    previous = CheckpointLog(previous_log)
+                    self._G, self._viewed = previous.replay()
+                    refreshed = previous.last_refresh()
+                    redirects = previous.redirects()
+                else:
+                    with open(self._previous, 'rb') as handle:
+                        self._G = pickle.load(handle)
+
+                    with open(self._previous[:-7]+'dict'+'.pickle', 'rb') as handle:
+                        self._viewed = pickle.load(handle)
+                # Start a New Log From a Snapshot of the Previous Network
+                if os.path.abspath(previous_log) != os.path.abspath(self._save_path[:-7]+'.log'):
+                    self._log.reset()
+                    self._log.compact(self._G, self._viewed, refreshed)
+                    for alias in redirects:
+                        self._log.record_redirect(alias, redirects[alias])
+                    self._log.checkpoint()
+                    self._queue.reset()
+                # Links to Redirects Found Before Are Merged as They Are Read
+                for alias in redirects:
+                    self._index.add_redirect(alias, redirects[alias])
+                # Rebuild the Queue Once if the Previous Run Had None
+                if self._queue.waiting() == 0:
+                    self.enqueue(self._G.nodes())
+                    for i in self._viewed:
+                        self._queue.done(i)
+                    self._queue.commit()
+                self.alert("Previous Network Initialized With {} Nodes".format(len(self._G.nodes())))
+            except:
+                self.alert("Graph Initialization Failed!")
+
+    def get_urls(self, url):
+        """Searches through webpage for any link between <p> tags.
+
+        Parameters
+        ----------
+        url : str
+            URL of page to search for links.
+        Returns
+        -------
+        list
+            List of URLs on page.
+        """
+        return(self._reader.get_urls(url))
+
+    def rand_wiki(self):
+        """Returns verified URL for random Wikipedia page.
+
+        Parameters
+        ----------
+        None.
+        Returns
+        -------
+        str
+            Full Wikipedia URL
+        """
+
+        resp = self._fetcher.get('https://en.wikipedia.org/wiki/Special:Random')
+        page = BeautifulSoup(resp.text, "lxml")
+        url = 'https://en.wikipedia.org'+page.find_all('a', {'accesskey': 'c'})[0].get('href')
+        self._reader.parse_soup(url, page)
+        if self.verify_url(url) is True:
+            return(url)
+
+    def verify_url(self, url):
+        """Checks to see if a URL is a valid Wikipedia page.
+        Parameters
+        ----------
+        url : str
+            url to verify
+        Returns
+        -------
+        bool
+            True or False
+        """
+        if 'https://en.wikipedia.org/wiki/' in url:
+            return(True)
+
+    def alert(self, message):
+        """Prints Message if User Has Not Suppressed the Outputs
+        Checks to determine whether or not the user has the suppressed_outputs
+        parameter set to True, if not, it prints the message passed to the
+        function.
+
+        Parameters
+        ----------
+        url : str
+            URL to verify
+        """
+        if self.__suppress_output is not True:
+            print(message)
+
+    def start_dump(self):
+        """Starts Building Network of Wikipedia Pages
+        Takes the next pages from the work queue, downloads them several at a
+        time and adds their links as edges as the downloads finish. Pages are
+        only queued the first time they are discovered. Pages which fail to
+        download are queued again behind the others. Pages which turn out to
+        be redirects are merged into the page they lead to, which is queued.
+        """
+        nds_save = 0
+        nds = len(self._G)
+        try:
+            while nds < self._stop_count:
+                batch = self.next_batch()
+                if len(batch) == 0:
+                    break
+                with closing(self._reader.iter_links(batch)) as results:
+                    for i, temp, error in results:
+                        revision = self._reader.revisions.pop(i, None)
+                        if error is None and self._index.canonical(i) != i:
+                            # The Page Was a Redirect, Fold It Into the Page It Leads to
+                            self.merge_redirect(i, self._index.canonical(i))
+                            self.enqueue([self._index.canonical(i)])
+                            self._queue.done(i)
+                        elif error is None:
+                            with self.metrics.timer('insert'):
+                                for j in temp:
+                                    self._G.add_edge(i, j)
+                                self._viewed[i] = revision if revision is not None else 1
+                                self._log.record_page(i, temp, revision)
+                            with self.metrics.timer('enqueue'):
+                                self.enqueue(temp)
+                                self._queue.done(i)
+                            self.metrics.count('links', len(temp))
+                            self.metrics.tick()
+                        else:
+                            # Queued Again Behind the Others Until the Queue Gives Up on It
+                            self._queue.fail(i)
+                            self.metrics.count('errors')
+                            self.alert('Could Not Read {}: {!r}'.format(i, error))
+                        nds = len(self._G)
+                        self.metrics.gauge('nodes', nds)
+                        if nds > nds_save:
+                            nds_save = nds+self._save_inc
+                            self.alert(time.ctime(time.time()))
+                            self.checkpoint()
+                            self.alert("Checkpoint Saved! # of Nodes:{}".format(nds))
+
+                        if nds > self._stop_count:
+                            break
+        finally:
+            # The Parsing Processes Must Not Outlive a Failed Dump
+            self._reader.close()
+            # Versions of Pages Read After the Dump Stopped Short Are Not Recorded
+            self._reader.revisions.clear()
+        # Pages Taken From the Queue but Not Crawled Wait for the Next Run
+        self._queue.release()
+        print("Program Complete! Node Count Reached {}".format(len(self._G)))
+        failed = self._queue.failed()
+        if len(failed) > 0:
+            print("Gave Up on {} Pages, Listed by failed_urls()".format(len(failed)))
+        self.checkpoint()
+        self.save_graph()
+        print(time.ctime(time.time()))
+        print("File Saved! # of Nodes:{}".format(len(self._G)))
+
+    def refresh(self, since=None):
+        """Brings the Links of Pages Already Crawled Up to Date
+        Reads again only the pages which changed since they were crawled and
+        replaces their links in place, removing the edges to pages no longer
+        linked and adding the new ones. The version of every page read, its
+        ETag or Last-Modified date, is kept with the dump, so each page is
+        asked for with a conditional request and the server answers 304 Not
+        Modified, without sending the page, if it has not changed. With since,
+        the MediaWiki recent changes feed first narrows the pages asked for
+        to those edited in the meantime, a small share of them for a daily
+        refresh. Pages newly linked are queued for the next start_dump. The
+        log is checkpointed as for a crawl and the graph saved at the end.
+
+        Parameters
+        ----------
+        since : float or str
+            Seconds since the epoch. Only pages the recent changes feed lists
+            as edited since then are read, so it must be within the 30 days
+            the feed covers. 'last' uses the time the dump or the last
+            refresh without failures started. Default is None, which asks
+            for every page crawled.
+        Returns
+        -------
+        dict
+            The number of pages 'checked', 'changed', 'unchanged' and
+            'failed'.
+        """
+        start = time.time()
+        if since == 'last':
+            since = self._log.last_refresh()
+            if since is None:
+                self.alert("No Previous Refresh Saved, Checking Every Page")
+        if since is not None:
+            source = self._reader.api if self._reader.api is not None else APILinkSource(self._fetcher)
+            changed = source.recent_changes(since)
+            urls = list(dict.fromkeys(x for x in (self._index.canonical(u) for u in changed) if x in self._viewed))
+            self.alert("{} Crawled Pages Changed Since {}".format(len(urls), time.ctime(since)))
+        else:
+            urls = list(self._viewed)
+        if self._reader.api is None:
+            results = self._fetcher.map_unordered(self.metrics.profiled(self.check_page), urls)
+        else:
+            results = ((i, (None, temp) if error is None else None, error) for i, temp, error in self._reader.iter_links(urls))
+        counts = {'checked': 0, 'changed': 0, 'unchanged': 0, 'failed': 0}
+        with closing(results):
+            for i, found, error in results:
+                counts['checked'] += 1
+                if error is not None:
+                    counts['failed'] += 1
+                    self.metrics.count('errors')
+                    self.alert('Could Not Read {}: {!r}'.format(i, error))
+                elif found is None:
+                    counts['unchanged'] += 1
+                    self.metrics.count('not_modified')
+                elif self._index.canonical(i) != i:
+                    # The Page Became a Redirect, Fold It Into the Page It Leads to
+                    self.merge_redirect(i, self._index.canonical(i))
+                    self.enqueue([self._index.canonical(i)])
+                    counts['changed'] += 1
+                elif self.replace_links(i, found[1], found[0]) is True:
+                    counts['changed'] += 1
+                else:
+                    counts['unchanged'] += 1
+                if counts['checked'] % self._save_inc == 0:
+                    self.checkpoint()
+                    self.alert("Checkpoint Saved! # of Pages Checked:{}".format(counts['checked']))
+        self.checkpoint()
+        if counts['failed'] == 0:
+            self._log.record_refresh(start)
+        self.save_graph()
+        print("Refresh Complete! Checked {checked}, Changed {changed}, Unchanged {unchanged}, "
+              "Failed {failed}".format(**counts))
+        return(counts)
+
+    def check_page(self, url):
+        """Downloads a page crawled before, unless a conditional request
+        naming the version read last finds it unchanged.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+        Returns
+        -------
+        tuple
+            (revision, links) for a page which changed, or None for one
+            which did not.
+        """
+        revision = self._viewed.get(url)
+        resp = self._fetcher.get(url, headers=self._fetcher.conditional(revision if isinstance(revision, str) else None))
+        if resp.status_code == 304:
+            return(None)
+        found = self._reader.parse(url, resp)
+        return((found[3], found[1]))
+
+    def replace_links(self, url, links, revision=None):
+        """Replaces the links of a page read again with those it has now,
+        only touching the edges which differ, and queues pages newly linked.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+        links : list
+            URLs the page links to now.
+        revision : str
+            The version of the page read. Default is None.
+        Returns
+        -------
+        bool
+            True if any link was added or removed.
+        """
+        with self.metrics.timer('insert'):
+            old = set(self._G.successors(url))
+            new = set(links)
+            self._G.remove_edges_from([(url, j) for j in old - new])
+            self._G.add_edges_from((url, j) for j in links if j not in old)
+            self._viewed[url] = revision if revision is not None else 1
+            if old != new or revision is not None:
+                self._log.record_page(url, links, revision, replace=True)
+        self.metrics.count('links_removed', len(old - new))
+        self.metrics.count('links_added', len(new - old))
+        if old != new:
+            self.enqueue([j for j in links if j not in old])
+        return(old != new)
+
+    def next_batch(self):
+        """Takes the next pages to crawl from the work queue.
+
+        Returns
+        -------
+        list
+            URLs to crawl. An empty list ends the crawl.
+        """
+        return(self._queue.pop(max(64, 8*self._workers)))
+
+    def enqueue(self, urls):
+        """Queues the links found on a crawled page.
+
+        Parameters
+        ----------
+        urls : list
+            URLs linked from the page.
+        """
+        self._queue.push(urls)
+
+    def checkpoint(self):
+        """Appends the pages crawled since the last checkpoint to the log,
+        commits the work queue to match and reports the metrics."""
+        with self.metrics.timer('checkpoint'):
+            self._log.checkpoint()
+            self._queue.commit()
+        self.metrics.gauge('queued', self._queue.waiting())
+        self.metrics.report(force=True)
+
+    def failed_urls(self):
+        """Returns the URLs the dump gave up on after every retry, to be
+        queued again later with retry_failed."""
+        return(self._queue.failed())
+
+    def retry_failed(self):
+        """Queues the URLs the dump gave up on again, behind the pages
+        already waiting, for the next start_dump."""
+        count = self._queue.retry_failed()
+        self._queue.commit()
+        self.alert("Queued {} Failed Pages Again".format(count))
+
+    def merge_redirect(self, alias, target):
+        """Merges a page found to be a redirect into the page it leads to.
+
+        Parameters
+        ----------
+        alias : str
+            URL of the redirect.
+        target : str
+            URL of the page it redirects to.
+        """
+        self._index.add_redirect(alias, target)
+        merge_redirects(self._G, {alias: target})
+        self._viewed.pop(alias, None)
+        self._log.record_redirect(alias, target)
+
+    def ingest_dump(self, dump_path, workers=1):
+        """Builds Network of Wikipedia Pages Offline From an XML Dump
+        Streams a pages-articles.xml(.bz2) dump instead of crawling, adding an
+        edge for every [[wikilink]] in each article. Links to redirect pages
+        are moved onto the page they redirect to once the whole dump has been
+        read, and are added to the title index. Progress is checkpointed
+        every save_increment articles, and the log is compacted and the graph
+        saved at the end.
+
+        Parameters
+        ----------
+        dump_path : str
+            Path of the dump, e.g. 'enwiki-latest-pages-articles.xml.bz2'.
+        workers : int
+            Number of processes extracting links from the article text.
+            Default is 1.
+        """
+        redirects = dict()
+        count = 0
+        for url, redirect, links in XMLDumpReader(dump_path, workers=workers).iter_links():
+            if redirect is not None:
+                redirects[url] = redirect
+                continue
+            self._G.add_node(url)
+            for j in links:
+                self._G.add_edge(url, j)
+            self._viewed[url] = 1
+            self._log.record_page(url, links)
+            count += 1
+            if count % self._save_inc == 0:
+                self.alert(time.ctime(time.time()))
+                self._log.checkpoint()
+                self.alert("Checkpoint Saved! # of Articles:{}".format(count))
+
+        # Merge Redirect Pages Into Their Targets
+        self.alert("Resolving {} Redirects...".format(len(redirects)))
+        for alias in redirects:
+            self._index.add_redirect(alias, redirects[alias])
+        merge_redirects(self._G, redirects)
+        # Removed Redirect Nodes Can Only Be Saved by a Snapshot
+        self.compact()
+        self.save_graph()
+        self.alert(time.ctime(time.time()))
+        self.alert("Dump Ingested! # of Articles:{} # of Nodes:{}".format(count, len(self._G)))
+
+    def compact(self):
+        """Folds the checkpoint log into a single snapshot of the network so
+        resuming does not have to replay every segment."""
+        self._log.compact(self._G, self._viewed)
+        self.alert("Checkpoint Log Compacted! # of Nodes:{}".format(len(self._G)))
+
+    def save_graph(self):
+        """Pickles the graph and the dict of viewed pages to save_path."""
+        with open(self._save_path, 'wb') as handle:
+            pickle.dump(self._G, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(self._save_path[:-7]+'dict'+'.pickle', 'wb') as handle:
+            pickle.dump(self._viewed, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def save_csr(self, path):
+        """Saves the graph as a compact, memory-mappable CSRGraph.
+
+        Parameters
+        ----------
+        path : str
+            Directory to write the .npy files to, e.g. 'Data/Full_WIKI.csr'.
+        """
+        CSRGraph.from_networkx(self._G).save(path)
+        self.alert("CSR Graph Saved to {}".format(path))
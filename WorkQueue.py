@@ -0,0 +1,132 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import sqlite3
+
+
+class WorkQueue:
+    """Persistent Frontier of Pages Waiting to Be Crawled.
+    Every URL is added once, when it is first discovered, and then moves from
+    waiting to in flight to done, so the crawl never rescans pages it already
+    has. The queue lives in an SQLite database. Changes are only made durable
+    by commit, which WikiDump calls at every checkpoint, so after a crash the
+    queue matches the checkpointed graph. Pages still in flight when the queue
+    is reopened go back to waiting.
+
+    Parameters
+    ----------
+    path : str
+        The path of the queue database.
+    priority : str
+        'fifo', the default, crawls pages in the order they were discovered.
+        'indegree' crawls the pages linked from the most crawled pages first,
+        so a partial crawl covers the most linked pages.
+    max_tries : int
+        Number of times a page that fails to download is queued again before
+        it is given up on. Default is 3.
+    Examples
+    --------
+    >>> queue = WorkQueue('Data/Full_WIKI.log/queue.sqlite', priority='indegree')
+    >>> queue.push(['https://en.wikipedia.org/wiki/United_States'])
+    >>> batch = queue.pop(100)
+
+    """
+    def __init__(self, path, priority='fifo', max_tries=3):
+        if priority not in ('fifo', 'indegree'):
+            raise ValueError('Unknown Queue Priority: {}'.format(priority))
+        self._priority = priority
+        self._max_tries = max_tries
+        self._db = sqlite3.connect(path, timeout=60)
+        # States: 0 Waiting, 1 In Flight, 2 Done, 3 Given Up
+        self._db.execute('CREATE TABLE IF NOT EXISTS queue (url TEXT PRIMARY KEY, '
+                         'priority INTEGER, seq INTEGER, state INTEGER, tries INTEGER)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS queue_order ON queue (state, priority DESC, seq)')
+        self.release()
+        self._db.commit()
+        self._seq = self._db.execute('SELECT COALESCE(MAX(seq), 0) FROM queue').fetchone()[0]
+
+    def push(self, urls):
+        """Adds newly discovered URLs. URLs already in the queue are skipped,
+        or in 'indegree' mode have their priority raised if still waiting.
+
+        Parameters
+        ----------
+        urls : iterable
+            URLs linked from a crawled page.
+        """
+        rows = []
+        for url in urls:
+            self._seq += 1
+            rows.append((url, self._seq))
+        if self._priority == 'indegree':
+            self._db.executemany('INSERT INTO queue VALUES (?, 1, ?, 0, 0) ON CONFLICT(url) '
+                                 'DO UPDATE SET priority = priority + 1 WHERE state = 0', rows)
+        else:
+            self._db.executemany('INSERT OR IGNORE INTO queue VALUES (?, 0, ?, 0, 0)', rows)
+
+    def pop(self, n):
+        """Takes up to n waiting URLs, highest priority first, and marks them
+        as in flight.
+
+        Parameters
+        ----------
+        n : int
+            The largest number of URLs to return.
+        Returns
+        -------
+        list
+            URLs to crawl.
+        """
+        urls = [x[0] for x in self._db.execute(
+            'SELECT url FROM queue WHERE state = 0 ORDER BY priority DESC, seq LIMIT ?', (n,))]
+        self._db.executemany('UPDATE queue SET state = 1 WHERE url = ?', [(x,) for x in urls])
+        return(urls)
+
+    def done(self, url):
+        """Marks a URL as crawled."""
+        self._db.execute('UPDATE queue SET state = 2 WHERE url = ?', (url,))
+
+    def fail(self, url):
+        """Queues a URL that failed to download again, behind the pages
+        already waiting, or gives up on it after max_tries."""
+        self._seq += 1
+        self._db.execute('UPDATE queue SET tries = tries + 1, seq = ?, '
+                         'state = CASE WHEN tries + 1 >= ? THEN 3 ELSE 0 END WHERE url = ?',
+                         (self._seq, self._max_tries, url))
+
+    def retry_failed(self):
+        """Puts every URL given up on back to waiting, behind the pages
+        already waiting, with its tries reset.
+
+        Returns
+        -------
+        int
+            The number of URLs queued again.
+        """
+        self._seq += 1
+        return(self._db.execute('UPDATE queue SET state = 0, tries = 0, seq = ? WHERE state = 3',
+                                (self._seq,)).rowcount)
+
+    def release(self):
+        """Puts every URL still in flight back to waiting."""
+        self._db.execute('UPDATE queue SET state = 0 WHERE state = 1')
+
+    def commit(self):
+        """Makes every change since the last commit durable."""
+        self._db.commit()
+
+    def reset(self):
+        """Empties the queue."""
+        self._db.execute('DELETE FROM queue')
+        self._db.commit()
+        self._seq = 0
+
+    def waiting(self):
+        """Returns the number of URLs waiting to be crawled."""
+        return(self._db.execute('SELECT COUNT(*) FROM queue WHERE state = 0').fetchone()[0])
+
+    def failed(self):
+        """Returns the URLs given up on after max_tries."""
+        return([x[0] for x in self._db.execute('SELECT url FROM queue WHERE state = 3')])
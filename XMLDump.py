@@ -0,0 +1,201 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import bz2
+import re
+from collections import deque
+from multiprocessing import Pool
+from lxml import etree
+from Backlinks import title_to_url
+
+# Markup Whose Links Never Show Up in an Article's Paragraphs
+COMMENT = re.compile(r'<!--.*?-->', re.S)
+REF = re.compile(r'<ref[^>/]*/>|<ref[^>]*>.*?</ref>', re.S | re.I)
+TEMPLATE = re.compile(r'\{\{[^{}]*\}\}|\{\|.*?\|\}', re.S)
+WIKILINK = re.compile(r'\[\[([^\[\]|]+)(?:\|[^\[\]]*)?\]\]')
+INTERWIKI = re.compile(r'^[a-z][a-z\-]*$')
+# Other Names English Wikipedia Accepts for Its Namespaces, Missing From siteinfo
+NAMESPACE_ALIASES = frozenset(['image', 'image talk', 'project', 'project talk', 'wp', 'wt', 'tm', 'cat',
+                               'h', 'p', 'mos', 'media'])
+
+
+def normalize_title(title):
+    """Puts a link target or page title in the form MediaWiki stores it.
+
+    Parameters
+    ----------
+    title : str
+        Title as written in wikitext, e.g. 'alan  turing'.
+    Returns
+    -------
+    str
+        Canonical title, e.g. 'Alan turing'.
+    """
+    title = ' '.join(title.replace('_', ' ').split())
+    return(title[:1].upper() + title[1:])
+
+
+def extract_wikilinks(text, namespaces=()):
+    """Pulls the [[wikilinks]] out of an article's wikitext. Comments,
+    references, templates and tables are removed first, so what remains is
+    close to the paragraph links the HTML crawlers follow. Like the HTML
+    crawlers, links to a section ('#') and links into another namespace or
+    wiki are dropped.
+
+    Parameters
+    ----------
+    text : str
+        The article's wikitext.
+    namespaces : iterable
+        Lower case names of the wiki's namespaces other than articles, e.g.
+        'file', 'category'. Those in NAMESPACE_ALIASES, such as 'image' and
+        'wp', are always dropped as well.
+    Returns
+    -------
+    list
+        Canonical titles of the linked articles, in order.
+    """
+    text = COMMENT.sub('', text)
+    text = REF.sub('', text)
+    # Strip Nested Templates From the Inside Out
+    while True:
+        text, n = TEMPLATE.subn('', text)
+        if n == 0:
+            break
+    links = []
+    for target in WIKILINK.findall(text):
+        if '#' in target or target.startswith(':'):
+            continue
+        if ':' in target:
+            prefix = ' '.join(target.split(':', 1)[0].replace('_', ' ').split())
+            if prefix.lower() in namespaces or prefix.lower() in NAMESPACE_ALIASES or INTERWIKI.match(prefix):
+                continue
+        target = normalize_title(target)
+        if target:
+            links.append(target)
+    return(links)
+
+
+def parse_page(page):
+    """Worker function turning one page into URLs.
+
+    Parameters
+    ----------
+    page : tuple
+        (title, redirect, text, namespaces) as read from the dump.
+    Returns
+    -------
+    tuple
+        (url, redirect url or None, list of linked URLs)
+    """
+    title, redirect, text, namespaces = page
+    url = title_to_url(normalize_title(title))
+    if redirect is not None:
+        return((url, title_to_url(normalize_title(redirect)), []))
+    return((url, None, [title_to_url(x) for x in extract_wikilinks(text, namespaces)]))
+
+
+def parse_pages(pages):
+    """Worker function turning a chunk of pages into URLs, as parse_page
+    does for one."""
+    return([parse_page(x) for x in pages])
+
+
+class XMLDumpReader:
+    """Streams the Link Graph Out of a Wikipedia pages-articles XML Dump.
+    Reads a pages-articles.xml or pages-articles.xml.bz2 file one page at a
+    time, clearing each page from memory once read, so memory use stays flat
+    no matter how large the dump is. Only articles (namespace 0) are read.
+    Link extraction can be spread over several worker processes while the
+    main process decompresses and reads the XML. Pages are handed to them in
+    chunks, and no more than two chunks per worker are read ahead of what
+    the caller has taken, so a slow caller holds the reading back.
+
+    Parameters
+    ----------
+    path : str
+        Path of the dump file. Files ending in .bz2 are decompressed on the
+        fly.
+    workers : int
+        Number of processes extracting links. Default is 1, which extracts
+        them in the main process.
+    chunk_size : int
+        Number of pages handed to a worker at once. Default is 64.
+    Examples
+    --------
+    >>> dump = XMLDumpReader('enwiki-latest-pages-articles.xml.bz2', workers=8)
+    >>> for url, redirect, links in dump.iter_links():
+    >>>     print(url, len(links))
+
+    """
+    def __init__(self, path, workers=1, chunk_size=64):
+        self._path = path
+        self._workers = int(workers)
+        self._chunk_size = int(chunk_size)
+        self._namespaces = frozenset()
+
+    def open(self):
+        """Opens the dump, decompressing it if needed."""
+        if self._path.endswith('.bz2'):
+            return(bz2.open(self._path, 'rb'))
+        return(open(self._path, 'rb'))
+
+    def iter_pages(self):
+        """Reads the articles from the dump one at a time.
+
+        Yields
+        ------
+        tuple
+            (title, redirect, text, namespaces) where redirect is the title
+            the page redirects to, or None.
+        """
+        with self.open() as handle:
+            for event, elem in etree.iterparse(handle, events=('end',), tag=('{*}page', '{*}siteinfo')):
+                if elem.tag.endswith('siteinfo'):
+                    self._namespaces = frozenset(
+                        x.text.lower() for x in elem.iterfind('.//{*}namespace')
+                        if x.text and x.get('key') != '0')
+                elif elem.findtext('{*}ns') == '0':
+                    redirect = elem.find('{*}redirect')
+                    yield((elem.findtext('{*}title'),
+                           redirect.get('title') if redirect is not None else None,
+                           elem.findtext('{*}revision/{*}text') or '',
+                           self._namespaces))
+                # Free the Page and Everything Read Before It
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+    def iter_links(self):
+        """Reads the links of every article in the dump.
+
+        Yields
+        ------
+        tuple
+            (url, redirect, links) where redirect is the URL the page
+            redirects to, or None, and links is the list of linked URLs.
+        """
+        if self._workers <= 1:
+            for page in self.iter_pages():
+                yield(parse_page(page))
+            return
+        pending = deque()
+        chunk = []
+        with Pool(self._workers) as pool:
+            for page in self.iter_pages():
+                chunk.append(page)
+                if len(chunk) < self._chunk_size:
+                    continue
+                pending.append(pool.apply_async(parse_pages, (chunk,)))
+                chunk = []
+                # Results Come Back in Order, Reading Waits on the Oldest Chunk
+                if len(pending) >= 2 * self._workers:
+                    for result in pending.popleft().get():
+                        yield(result)
+            if len(chunk) > 0:
+                pending.append(pool.apply_async(parse_pages, (chunk,)))
+            while len(pending) > 0:
+                for result in pending.popleft().get():
+                    yield(result)
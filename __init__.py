@@ -1 +1 @@
-__all__ = ['WikiCrawl', 'ExportViz', 'WikiDump']
+__all__ = ['WikiCrawl', 'ExportViz', 'WikiDump', 'Backlinks', 'PageFetcher', 'StandIn', 'LinkCache', 'LinkExtract', 'XMLDump', 'CSRGraph', 'CheckpointLog', 'WorkQueue', 'ShardedDump', 'LinkSource', 'TitleIndex', 'BatchCrawl', 'PathQuery', 'Separation', 'CrawlFile', 'Benchmark', 'Metrics', 'Scheduler', 'Scorers', 'Pipeline']
@@ -0,0 +1,50 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import sys
+import pytest
+
+# The Modules Import Each Other as Top-Level Names
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from StandIn import WikiStandIn
+
+
+def tree_graph(depth=6):
+    """Builds a binary tree of pages, each also linking back to the root, so
+    the shortest path from the root to any page is unique.
+
+    Parameters
+    ----------
+    depth : int
+        Clicks from the root to the deepest pages. Default is 6.
+    Returns
+    -------
+    dict
+        Maps each page name to the page names it links to.
+    """
+    n = 2 ** (depth + 1) - 1
+    return({'Page_{}'.format(i): ['Page_{}'.format(j) for j in (2*i + 1, 2*i + 2) if j < n] + ['Page_0']
+            for i in range(n)})
+
+
+@pytest.fixture
+def site():
+    """A stand-in serving tree_graph with 20 ms of latency per request."""
+    server = WikiStandIn(tree_graph(), latency=0.02)
+    server.base_url = server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def redirect_site():
+    """A stand-in where Old_C redirects to C, linked first from A and again
+    from E, several clicks later."""
+    graph = {'A': ['Old_C'], 'C': ['D'], 'D': ['E'], 'E': ['Old_C', 'A']}
+    server = WikiStandIn(graph, redirects={'Old_C': 'C'})
+    server.base_url = server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,41 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import pytest
+from StandIn import WikiStandIn
+from PageFetcher import PageFetcher
+from LinkSource import APILinkSource
+from WikiCrawl import WikiCrawl
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+@pytest.fixture
+def hub_site():
+    """A stand-in where one hub page links to 1,200 leaves, more than the
+    500 links the API returns per response."""
+    graph = {'Hub': ['Leaf_{}'.format(i) for i in range(1200)]}
+    graph.update({'Leaf_{}'.format(i): ['Hub'] for i in range(1200)})
+    server = WikiStandIn(graph)
+    server.base_url = server.start()
+    yield server
+    server.stop()
+
+
+def test_get_links_follows_plcontinue(hub_site):
+    source = APILinkSource(PageFetcher(base_url=hub_site.base_url))
+    urls = [URL + 'Hub'] + [URL + 'Leaf_{}'.format(i) for i in range(49)]
+    found = source.get_links(urls)
+    # Three Responses Are Needed for the Hub's Links
+    assert hub_site.requests == 3
+    assert found[URL + 'Hub'] == ('Hub - Wikipedia', [URL + 'Leaf_{}'.format(i) for i in range(1200)])
+    assert all(found[u] == (u[30:].replace('_', ' ') + ' - Wikipedia', [URL + 'Hub']) for u in urls[1:])
+
+
+def test_crawl_with_api_links(hub_site, tmp_path):
+    wiki = WikiCrawl(start_url=URL + 'Leaf_0', end_url=URL + 'Leaf_1199', save_path=str(tmp_path) + '/',
+                     base_url=hub_site.base_url, link_source='api')
+    wiki.find_path()
+    assert wiki.url_path == [URL + 'Leaf_0', URL + 'Hub', URL + 'Leaf_1199']
@@ -0,0 +1,48 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+from StandIn import WikiStandIn
+from BatchCrawl import BatchCrawl
+from WikiCrawl import WikiCrawl
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+def test_batch_matches_crawl(site, tmp_path):
+    pairs = [(URL + 'Page_0', URL + 'Page_126'), (URL + 'Page_0', URL + 'Page_45'), (URL + 'Page_3', URL + 'Page_20'),
+             (URL + 'Page_5', URL + 'Page_5')]
+    found = BatchCrawl(workers=8, base_url=site.base_url).run(pairs)
+    for (start, end), r in zip(pairs, found):
+        wiki = WikiCrawl(start_url=start, end_url=end, save_path=str(tmp_path) + '/', workers=8, base_url=site.base_url)
+        wiki.find_path()
+        assert (r['start_url'], r['end_url']) == (start, end)
+        assert r['path'] == wiki.url_path
+        assert r['clicks'] == len(wiki.url_path) - 1
+        assert r['failed_urls'] == []
+
+
+def test_shared_start_crawled_once(site):
+    before = site.requests
+    BatchCrawl(workers=1, base_url=site.base_url).run([(URL + 'Page_0', URL + 'Page_126')])
+    alone = site.requests - before
+    before = site.requests
+    found = BatchCrawl(workers=1, base_url=site.base_url).run([(URL + 'Page_0', URL + 'Page_126'),
+                                                               (URL + 'Page_0', URL + 'Page_125'),
+                                                               (URL + 'Page_0', URL + 'Page_30')])
+    assert site.requests - before == alone
+    assert [r['clicks'] for r in found] == [6, 6, 4]
+    assert found[0]['pages_downloaded'] == alone
+
+
+def test_missing_pages_in_failed_urls():
+    server = WikiStandIn({'A': ['B', 'Missing'], 'B': ['C'], 'C': ['A']})
+    try:
+        found = BatchCrawl(workers=2, base_url=server.start()).run([(URL + 'A', URL + 'C'), (URL + 'A', URL + 'D')])
+    finally:
+        server.stop()
+    assert found[0]['path'] == [URL + 'A', URL + 'B', URL + 'C']
+    assert found[1]['path'] is None
+    assert [x[0] for x in found[1]['failed_urls']] == [URL + 'Missing']
+    assert '404' in found[1]['failed_urls'][0][1]
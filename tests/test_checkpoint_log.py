@@ -0,0 +1,69 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+from CheckpointLog import CheckpointLog
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+def write_log(path):
+    """Writes two segments: A and B crawled, then C crawled and Old_C found
+    to redirect to C."""
+    log = CheckpointLog(path)
+    log.record_page(URL + 'A', [URL + 'B', URL + 'Old_C'], revision='"1"')
+    log.record_page(URL + 'B', [URL + 'A'])
+    log.checkpoint()
+    log.record_page(URL + 'C', [URL + 'A'], revision='"3"')
+    log.record_redirect(URL + 'Old_C', URL + 'C')
+    log.record_page(URL + 'D', [URL + 'Diamond'])
+    log.checkpoint()
+    return(log)
+
+
+def test_replay_stops_at_torn_record(tmp_path):
+    path = str(tmp_path / 'dump.log')
+    log = write_log(path)
+    last = log.segment_path(log.segments()[-1])
+    with open(last, 'rb') as handle:
+        data = handle.read()
+    # Cut the Last Segment Mid-Way Through the Last Link of D
+    with open(last, 'wb') as handle:
+        handle.write(data[:data.rindex(b'Diamond') + 3])
+    G, viewed = CheckpointLog(path).replay()
+    assert set(G.edges()) == {(URL + 'A', URL + 'B'), (URL + 'A', URL + 'C'), (URL + 'B', URL + 'A'),
+                              (URL + 'C', URL + 'A')}
+    assert viewed == {URL + 'A': '"1"', URL + 'B': 1, URL + 'C': '"3"'}
+    assert CheckpointLog(path).redirects() == {URL + 'Old_C': URL + 'C'}
+
+
+def test_segments_written_atomically(tmp_path):
+    path = str(tmp_path / 'dump.log')
+    log = write_log(path)
+    assert sorted(os.listdir(path)) == ['segment-00000001.log', 'segment-00000002.log']
+    # A Temporary File Left by a Crash Is Never Read
+    with open(log.segment_path(3) + '.tmp', 'w') as handle:
+        handle.write('E\t' + URL + 'A\t' + URL + 'Z\n')
+    reopened = CheckpointLog(path)
+    assert reopened.segments() == [1, 2]
+    assert (URL + 'A', URL + 'Z') not in reopened.replay()[0].edges()
+    assert reopened.checkpoint() == 0
+
+
+def test_compact_replays_the_same(tmp_path):
+    path = str(tmp_path / 'dump.log')
+    log = write_log(path)
+    G, viewed = log.replay()
+    log.compact(G, viewed, refreshed=1000.0)
+    assert not any(os.path.exists(log.segment_path(x)) for x in (1, 2))
+    reopened = CheckpointLog(path)
+    assert set(reopened.replay()[0].edges()) == set(G.edges())
+    assert reopened.replay()[1] == viewed
+    assert reopened.redirects() == {URL + 'Old_C': URL + 'C'}
+    assert reopened.last_refresh() == 1000.0
+    # Segments Written After Compaction Are Replayed on Top of the Snapshot
+    reopened.record_page(URL + 'E', [URL + 'C'])
+    reopened.checkpoint()
+    assert (URL + 'E', URL + 'C') in CheckpointLog(path).replay()[0].edges()
@@ -0,0 +1,70 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import time
+from LinkCache import LinkCache
+from LinkSource import LinkReader
+from PageFetcher import PageFetcher
+from TitleIndex import TitleIndex
+from WikiCrawl import WikiCrawl
+from WikiDump import WikiDump
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+def crawl(site, tmp_path, workers, strategy='bfs'):
+    """Finds the path from the root to the last page, returning it and the
+    seconds taken."""
+    start = time.perf_counter()
+    wiki = WikiCrawl(start_url=URL + 'Page_0', end_url=URL + 'Page_126', save_path=str(tmp_path) + '/',
+                     strategy=strategy, workers=workers, base_url=site.base_url)
+    wiki.find_path()
+    return(wiki.url_path, time.perf_counter() - start)
+
+
+def dump(site, tmp_path, workers):
+    """Dumps every page, returning the edges and the seconds taken."""
+    start = time.perf_counter()
+    WD = WikiDump(stop_count=1000, seed_page=URL + 'Page_0', suppress_output=True, workers=workers,
+                  save_path=str(tmp_path / 'dump{}.pickle'.format(workers)), base_url=site.base_url)
+    WD.start_dump()
+    return(set(WD._G.edges()), time.perf_counter() - start)
+
+
+def test_crawl_concurrent_same_path_faster(site, tmp_path):
+    path1, seconds1 = crawl(site, tmp_path, workers=1)
+    path8, seconds8 = crawl(site, tmp_path, workers=8)
+    assert path1 == [URL + 'Page_{}'.format(x) for x in (0, 2, 6, 14, 30, 62, 126)]
+    assert path8 == path1
+    assert seconds8 < seconds1 / 2
+
+
+def test_dump_concurrent_same_graph_faster(site, tmp_path):
+    edges1, seconds1 = dump(site, tmp_path, workers=1)
+    edges8, seconds8 = dump(site, tmp_path, workers=8)
+    assert len(edges1) == sum(len(x) for x in site._graph.values())
+    assert edges8 == edges1
+    assert seconds8 < seconds1 / 2
+
+
+def test_pipeline_counts_downloads(site, tmp_path):
+    fetcher = PageFetcher(workers=4, base_url=site.base_url)
+    reader = LinkReader(fetcher, TitleIndex(), cache=LinkCache(str(tmp_path / 'cache.sqlite')), processes=2)
+    urls = [URL + 'Page_{}'.format(i) for i in range(7)]
+    try:
+        assert len(list(reader.iter_links(urls))) == 7
+        assert reader.downloads == 7
+        # Pages Read Back From the Cache Are Not Downloads
+        assert len(list(reader.iter_links(urls))) == 7
+        assert reader.downloads == 7
+    finally:
+        reader.close()
+        fetcher.close()
+
+
+def test_bidirectional_same_path_as_bfs(site, tmp_path):
+    path, _ = crawl(site, tmp_path, workers=8)
+    # The Stand-In's Backlinks Are Exactly the Links in Its Paragraphs
+    assert crawl(site, tmp_path, workers=8, strategy='bidirectional')[0] == path
@@ -0,0 +1,69 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import random
+import numpy as np
+from CrawlFile import CrawlTree, CrawlFile
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+def random_tree(n=300, seed=0):
+    """Builds a tree of n pages where each page is reached from a random
+    earlier one, returning it and the parent of each page."""
+    rng = random.Random(seed)
+    tree = CrawlTree()
+    names = [URL + 'Page_{}'.format(i) if i % 7 else URL + 'Gödel_{}'.format(i) for i in range(n)]
+    parents = [-1] + [rng.randrange(i) for i in range(1, n)]
+    tree.create_node(names[0], names[0])
+    for i in range(1, n):
+        tree.create_node(names[i], names[i], parent=names[parents[i]])
+    return(tree, names, parents)
+
+
+def test_saved_levels_read_back_memory_mapped(tmp_path):
+    path = str(tmp_path / 'start-end.crawl')
+    names, parents = random_tree()[1:]
+    # Saved as WikiCrawl Does, the Pages of Each Save Appended
+    partial = CrawlTree()
+    for i in range(len(names)):
+        partial.create_node(names[i], names[i], parent=names[parents[i]] if parents[i] >= 0 else None)
+        if i in (0, 99, 200):
+            partial.save(path, {'start_url': names[0], 'end_url': names[-1], 'completed': False})
+    partial.save(path, {'start_url': names[0], 'end_url': names[-1], 'completed': True})
+    crawl = CrawlFile(path)
+    assert isinstance(crawl.parents, np.memmap)
+    assert crawl.header['completed'] is True
+    assert crawl.size() == len(names)
+    assert [crawl.url(i) for i in range(crawl.size())] == names
+    assert crawl.parents.tolist() == parents
+    depths = [0]
+    for p in parents[1:]:
+        depths.append(depths[p] + 1)
+    assert crawl.depths.tolist() == depths
+    assert crawl.header['levels'] == max(depths) + 1
+    assert crawl.find(names[150]) == 150
+    path_to = [names[-1]]
+    while parents[names.index(path_to[-1])] >= 0:
+        path_to.append(names[parents[names.index(path_to[-1])]])
+    assert crawl.path_to(names[-1]) == path_to[::-1]
+    offsets, children = crawl.children()
+    for i in range(len(names)):
+        assert children[offsets[i]:offsets[i+1]].tolist() == [j for j in range(len(names)) if parents[j] == i]
+
+
+def test_unfinished_save_ignored(tmp_path):
+    path = str(tmp_path / 'start-end.crawl')
+    tree, names, parents = random_tree(50)
+    tree.save(path, {'start_url': names[0], 'end_url': names[-1], 'completed': False})
+    # Columns Written by a Save Which Crashed Before Its Header
+    for name in ('names', 'name_offsets', 'parents', 'depths'):
+        with open(os.path.join(path, name + '.bin'), 'ab') as handle:
+            handle.write(b'\x07' * 24)
+    crawl = CrawlFile(path)
+    assert crawl.size() == 50
+    assert crawl.url(49) == names[49]
+    assert crawl.path_to(names[0]) == [names[0]]
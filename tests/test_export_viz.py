@@ -0,0 +1,90 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import csv
+import pytest
+import networkx as nx
+from test_crawl_file import random_tree
+from ExportViz import ExportViz
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+@pytest.fixture
+def saved_tree(tmp_path):
+    """A random tree saved as a crawl directory, with the path to its last
+    page in the header."""
+    tree, names, parents = random_tree()
+    path = [names[-1]]
+    while parents[names.index(path[-1])] >= 0:
+        path.append(names[parents[names.index(path[-1])]])
+    tree.save(str(tmp_path / 'start-end.crawl'), {'start_url': names[0], 'end_url': names[-1], 'completed': True,
+                                                  'path': path[::-1]})
+    return(str(tmp_path / 'start-end.crawl'), names, parents, set(path))
+
+
+@pytest.mark.parametrize('fmt', ['gexf', 'graphml'])
+def test_stream_export_parses_back(saved_tree, tmp_path, fmt):
+    crawl, names, parents, path = saved_tree
+    out = ExportViz(crawl).export_stream(fmt=fmt, path=str(tmp_path / ('tree.' + fmt)))
+    if fmt == 'gexf':
+        G = nx.read_gexf(out, node_type=int)
+        key = lambda i: i
+    else:
+        G = nx.read_graphml(out)
+        key = lambda i: 'n{}'.format(i)
+    assert G.is_directed()
+    assert set(G.edges()) == {(key(p), key(i)) for i, p in enumerate(parents) if p >= 0}
+    for i, url in enumerate(names):
+        node = G.nodes[key(i)]
+        assert node['label'] == url[30:].replace('_', ' ')
+        assert node['url'] == url
+        assert node['on_path'] == (url in path)
+    assert G.nodes[key(len(names) - 1)]['depth'] == len(path) - 1
+
+
+def test_stream_export_csv_parses_back(saved_tree, tmp_path):
+    crawl, names, parents, path = saved_tree
+    out = ExportViz(crawl).export_stream(fmt='csv', path=str(tmp_path / 'tree.edges.csv'))
+    with open(out, encoding='utf-8', newline='') as handle:
+        rows = list(csv.reader(handle))
+    assert rows[0] == ['source', 'target']
+    assert {tuple(x) for x in rows[1:]} == {(names[p], names[i]) for i, p in enumerate(parents) if p >= 0}
+    with open(str(tmp_path / 'tree.nodes.csv'), encoding='utf-8', newline='') as handle:
+        rows = list(csv.DictReader(handle))
+    assert [x['url'] for x in rows] == names
+    assert {x['url'] for x in rows if x['on_path'] == 'True'} == path
+
+
+def per_node_bfs(names, parents, path, nearest):
+    """The pruning export_gexf did before, one search down from each page on
+    the path, returning the (path page, page kept) pairs."""
+    children = {i: [j for j in range(len(names)) if parents[j] == i] for i in range(len(names))}
+    kept = set()
+    for p in path:
+        level = [names.index(p)]
+        for k in range(nearest):
+            level = [c for i in level for c in children[i]]
+            kept.update((names.index(p), c) for c in level)
+    return(kept)
+
+
+@pytest.mark.parametrize('nearest', [1, 2, 3])
+def test_prune_matches_per_node_bfs(saved_tree, nearest):
+    crawl, names, parents, path = saved_tree
+    order, near, owner = ExportViz(crawl).prune(nearest, max_nodes=len(names))
+    assert [names[i] for i in order.tolist()] == sorted(path, key=lambda x: names.index(x))
+    kept = per_node_bfs(names, parents, path, nearest)
+    assert set(near.tolist()) | set(order.tolist()) == {c for p, c in kept} | {names.index(x) for x in path}
+    # Each Page Is Owned by the Nearest Page on the Path Above It
+    for c, p in zip(near.tolist(), owner.tolist()):
+        assert (p, c) in kept
+        assert names[c] not in path
+        x = parents[c]
+        while names[x] not in path:
+            x = parents[x]
+        assert x == p
+    # A Smaller Budget Samples What Is Left of the Level Over It
+    assert len(ExportViz(crawl).prune(nearest, max_nodes=len(path) + 5)[1]) == min(5, len(near))
@@ -0,0 +1,54 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import os
+import pytest
+from bs4 import BeautifulSoup
+from LinkExtract import LinkExtractor, compare_backends
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PAGES = sorted(x for x in os.listdir(FIXTURES) if x.endswith('.html'))
+
+
+def read(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as handle:
+        return(handle.read())
+
+
+def baseline_links(html):
+    """The crawlers' get_urls before LinkExtractor, kept as the reference."""
+    page = BeautifulSoup(html, "lxml")
+    links = []
+    for x in page.find_all('p'):
+        l = [g.get('href') for g in x.find_all('a') if 'en.wikipedia.org' not in g.get('href')]
+        l = [k for k in l if ':Citation_needed' not in k]
+        l = [k for k in l if '//' not in k]
+        l = ['https://en.wikipedia.org' + k for k in l if '#' not in k]
+        [links.append(r) for r in l]
+    return(links)
+
+
+@pytest.mark.parametrize('backend', LinkExtractor.BACKENDS)
+@pytest.mark.parametrize('name', PAGES)
+def test_backend_matches_baseline(name, backend):
+    html = read(name)
+    title, links = LinkExtractor(backend).extract(html)
+    assert title == BeautifulSoup(html, "lxml").title.get_text()
+    assert links == baseline_links(html)
+
+
+def test_fixture_rules():
+    links = baseline_links(read('Entscheidungsproblem.html'))
+    assert 'https://en.wikipedia.org/wiki/David_Hilbert' in links
+    assert all(x.startswith('https://en.wikipedia.org/') for x in links)
+    assert not any(':Citation_needed' in x or '#' in x or '//' in x[8:] for x in links)
+    # Red Links and Help Pages Inside Paragraphs Are Kept, as They Always Were
+    assert 'https://en.wikipedia.org/w/index.php?title=Paul_Bernays_(mathematician)&action=edit&redlink=1' in links
+
+
+def test_compare_backends():
+    report = compare_backends([read(x) for x in PAGES], repeat=1)
+    assert set(report) == set(LinkExtractor.BACKENDS)
+    assert all(x['mismatches'] == 0 and x['pages_per_sec'] > 0 for x in report.values())
@@ -0,0 +1,37 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import networkx as nx
+from CSRGraph import CSRGraph
+from PathQuery import PathQuery
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+def save_graph(tmp_path):
+    """Saves a graph where A leads to C in two clicks and nothing leads to
+    D, with a landmark on every page."""
+    G = nx.DiGraph([(URL + 'A', URL + 'B'), (URL + 'B', URL + 'C'), (URL + 'C', URL + 'A'), (URL + 'D', URL + 'A')])
+    path = str(tmp_path / 'graph.csr')
+    CSRGraph.from_networkx(G).save(path)
+    PathQuery(path).build_landmarks(4)
+    return(path)
+
+
+def test_find_path_with_landmarks(tmp_path):
+    query = PathQuery(save_graph(tmp_path))
+    assert query.find_path(URL + 'A', URL + 'C') == [URL + 'A', URL + 'B', URL + 'C']
+    assert query.find_path(URL + 'D', URL + 'C', max_clicks=1) is None
+
+
+def test_unreachable_pair_ends_without_searching(tmp_path):
+    query = PathQuery(save_graph(tmp_path))
+
+    def expand(*args):
+        raise AssertionError('Searched an Unreachable Pair')
+    query.expand = expand
+    assert query.find_path(URL + 'A', URL + 'D') is None
+    # Without Landmarks the Search Runs and Finds Nothing
+    assert PathQuery(CSRGraph.load(str(tmp_path / 'graph.csr'))).find_path(URL + 'A', URL + 'D') is None
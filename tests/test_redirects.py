@@ -0,0 +1,28 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import pytest
+from BatchCrawl import BatchCrawl
+from WikiCrawl import WikiCrawl
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+@pytest.mark.parametrize('strategy', ['bfs', 'bidirectional', 'best'])
+@pytest.mark.parametrize('end, path', [('C', ['A', 'C']), ('E', ['A', 'C', 'D', 'E'])])
+def test_crawl_path_goes_through_redirect_target(redirect_site, tmp_path, strategy, end, path):
+    wiki = WikiCrawl(start_url=URL + 'A', end_url=URL + end, save_path=str(tmp_path) + '/', strategy=strategy,
+                     workers=1, base_url=redirect_site.base_url)
+    wiki.find_path()
+    assert wiki.url_path == [URL + x for x in path]
+    assert wiki._tree.contains(URL + 'C')
+
+
+def test_batch_path_goes_through_redirect_target(redirect_site):
+    batch = BatchCrawl(workers=1, base_url=redirect_site.base_url)
+    found = batch.run([(URL + 'A', URL + 'C'), (URL + 'A', URL + 'E')])
+    assert found[0]['path'] == [URL + 'A', URL + 'C']
+    assert found[0]['clicks'] == 1
+    assert found[1]['path'] == [URL + 'A', URL + 'C', URL + 'D', URL + 'E']
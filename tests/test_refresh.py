@@ -0,0 +1,53 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+from CheckpointLog import CheckpointLog
+from WikiDump import WikiDump
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+def dump(site, path, **kwargs):
+    """Builds a WikiDump of the stand-in saved to path."""
+    return(WikiDump(stop_count=1000, seed_page=URL + 'Page_0', suppress_output=True, workers=8,
+                    save_path=str(path), base_url=site.base_url, **kwargs))
+
+
+def test_edit_then_refresh_since_last(site, tmp_path):
+    WD = dump(site, tmp_path / 'dump.pickle')
+    WD.start_dump()
+    assert CheckpointLog(str(tmp_path / 'dump.log')).last_refresh() is not None
+    site.edit('Page_5', ['Page_1', 'Page_0'])
+    requests = site.requests
+    counts = WD.refresh(since='last')
+    # The Recent Changes Feed Narrows the Refresh to the One Page Edited
+    assert counts == {'checked': 1, 'changed': 1, 'unchanged': 0, 'failed': 0}
+    assert site.requests - requests == 2
+    assert set(WD._G.successors(URL + 'Page_5')) == {URL + 'Page_1', URL + 'Page_0'}
+    assert WD._G.has_node(URL + 'Page_11')
+    # The Log Replays the Replaced Links
+    G, viewed = CheckpointLog(str(tmp_path / 'dump.log')).replay()
+    assert set(G.edges()) == set(WD._G.edges())
+    assert viewed == WD._viewed
+    assert WD.refresh(since='last')['changed'] == 0
+
+
+def test_refresh_without_feed_uses_conditional_requests(site, tmp_path):
+    WD = dump(site, tmp_path / 'dump.pickle')
+    WD.start_dump()
+    site.edit('Page_9', ['Page_0'])
+    counts = WD.refresh()
+    assert counts == {'checked': 127, 'changed': 1, 'unchanged': 126, 'failed': 0}
+    assert site.not_modified == 126
+
+
+def test_resume_to_new_path_keeps_refresh_time(site, tmp_path):
+    WD = dump(site, tmp_path / 'old.pickle')
+    WD.start_dump()
+    refreshed = CheckpointLog(str(tmp_path / 'old.log')).last_refresh()
+    RWD = dump(site, tmp_path / 'new.pickle', new_dump=False, previous_path=str(tmp_path / 'old.pickle'))
+    assert CheckpointLog(str(tmp_path / 'new.log')).last_refresh() == refreshed
+    site.edit('Page_3', ['Page_0'])
+    assert RWD.refresh(since='last')['checked'] == 1
@@ -0,0 +1,30 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import pytest
+from CheckpointLog import CheckpointLog
+from WikiDump import WikiDump
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+@pytest.mark.parametrize('new_path', [False, True])
+def test_resume_keeps_redirects(redirect_site, tmp_path, new_path):
+    first = str(tmp_path / 'first.pickle')
+    # Stops Once C Is Read, After Old_C Was Found to Be a Redirect
+    WD = WikiDump(stop_count=3, seed_page=URL + 'A', save_path=first, suppress_output=True, workers=1,
+                  base_url=redirect_site.base_url)
+    WD.start_dump()
+    assert set(WD._G.edges()) == {(URL + 'A', URL + 'C'), (URL + 'C', URL + 'D')}
+    second = str(tmp_path / 'second.pickle') if new_path is True else first
+    RWD = WikiDump(stop_count=1000, save_path=second, new_dump=False, previous_path=first, suppress_output=True,
+                   workers=1, base_url=redirect_site.base_url)
+    assert CheckpointLog(second[:-7] + '.log').redirects() == {URL + 'Old_C': URL + 'C'}
+    RWD.start_dump()
+    assert set(RWD._G.edges()) == {(URL + 'A', URL + 'C'), (URL + 'C', URL + 'D'), (URL + 'D', URL + 'E'),
+                                   (URL + 'E', URL + 'C'), (URL + 'E', URL + 'A')}
+    log = CheckpointLog(second[:-7] + '.log')
+    assert log.redirects() == {URL + 'Old_C': URL + 'C'}
+    assert set(log.replay()[0].edges()) == set(RWD._G.edges())
@@ -0,0 +1,91 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import time
+import pytest
+import requests
+from email.utils import formatdate
+from Metrics import Metrics
+from Scheduler import Scheduler
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+def response(status, retry_after=None):
+    """Builds a response with a status and an optional Retry-After header."""
+    resp = requests.Response()
+    resp.status_code = status
+    resp.url = URL + 'A'
+    if retry_after is not None:
+        resp.headers['Retry-After'] = retry_after
+    return(resp)
+
+
+def sender(*responses):
+    """Returns a send callable answering with each response in turn, and
+    the list of times it was called."""
+    calls = []
+
+    def send():
+        calls.append(time.monotonic())
+        return(responses[min(len(calls), len(responses)) - 1])
+    return(send, calls)
+
+
+def test_retry_after_capped_at_max_backoff():
+    scheduler = Scheduler(max_backoff=5)
+    assert scheduler.retry_after(response(429, '2')) == 2.0
+    assert scheduler.retry_after(response(429, '3600')) == 5.0
+    assert 4 < scheduler.retry_after(response(503, formatdate(time.time() + 86400, usegmt=True))) <= 5.0
+    assert scheduler.retry_after(response(503, 'soon')) is None
+    assert scheduler.retry_after(response(503)) is None
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_throttling_waits_capped_retry_after(status):
+    metrics = Metrics()
+    scheduler = Scheduler(rate=100, max_concurrency=8, max_backoff=0.3, metrics=metrics)
+    send, calls = sender(response(status, '3600'), response(200))
+    assert scheduler.request(URL + 'A', send).status_code == 200
+    assert 0.25 < calls[1] - calls[0] < 1
+    assert scheduler.concurrency < 5
+    counters = metrics.snapshot()['counters']
+    assert counters['throttled'] == 1 and counters['retries'] == 1
+    assert scheduler.dead_letters() == []
+
+
+def test_server_error_waits_without_throttling():
+    scheduler = Scheduler(max_concurrency=8, max_backoff=0.3)
+    send, calls = sender(response(502, '1'), response(200))
+    assert scheduler.request(URL + 'A', send).status_code == 200
+    assert 0.25 < calls[1] - calls[0] < 1
+    assert scheduler.concurrency == 8
+
+
+def test_dead_letters():
+    metrics = Metrics()
+    scheduler = Scheduler(rate=100, max_retries=2, backoff=0.01, metrics=metrics)
+    send, calls = sender(response(503))
+    with pytest.raises(requests.HTTPError):
+        scheduler.request(URL + 'A', send)
+    assert len(calls) == 3
+    dead = scheduler.dead_letters()
+    assert [(x['url'], x['attempts']) for x in dead] == [(URL + 'A', 3)]
+    assert '503' in dead[0]['error']
+    assert metrics.snapshot()['counters']['dead_letters'] == 1
+    # Missing Pages Fail at Once and Are Not Dead Letters
+    send, calls = sender(response(404))
+    with pytest.raises(requests.HTTPError):
+        scheduler.request(URL + 'B', send)
+    assert len(calls) == 1
+    assert len(scheduler.dead_letters()) == 1
+    # A Later Success Takes a Page Off the List
+    scheduler.request(URL + 'A', sender(response(200))[0])
+    assert scheduler.dead_letters(clear=True) == []
+    send, calls = sender(response(504))
+    with pytest.raises(requests.HTTPError):
+        scheduler.request(URL + 'C', send)
+    assert [x['url'] for x in scheduler.dead_letters(clear=True)] == [URL + 'C']
+    assert scheduler.dead_letters() == []
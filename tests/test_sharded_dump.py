@@ -0,0 +1,39 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import pytest
+from conftest import tree_graph
+from StandIn import WikiStandIn
+from ShardedDump import ShardedDump
+from WikiDump import WikiDump
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+@pytest.fixture
+def aliased_site():
+    """A stand-in serving tree_graph where some links go through redirects."""
+    graph = tree_graph(depth=5)
+    graph['Page_40'].append('Old_Page_5')
+    graph['Page_9'].append('Page_Twelve')
+    server = WikiStandIn(graph, redirects={'Old_Page_5': 'Page_5', 'Page_Twelve': 'Page_12'})
+    server.base_url = server.start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.parametrize('shards', [2, 3])
+def test_shards_merge_to_single_dump(aliased_site, tmp_path, shards):
+    WD = WikiDump(stop_count=1000, seed_page=URL + 'Page_0', save_path=str(tmp_path / 'single.pickle'),
+                  suppress_output=True, workers=4, base_url=aliased_site.base_url)
+    WD.start_dump()
+    SD = ShardedDump(shards=shards, stop_count=1000, seed_page=URL + 'Page_0', save_dir=str(tmp_path / 'shards'),
+                     save_increment=8, suppress_output=True, workers=4, base_url=aliased_site.base_url)
+    SD.start_dump()
+    G = SD.merge(str(tmp_path / 'merged.pickle'))
+    assert (URL + 'Page_40', URL + 'Page_5') in G.edges()
+    assert URL + 'Old_Page_5' not in G and URL + 'Page_Twelve' not in G
+    assert set(G.edges()) == set(WD._G.edges())
+    assert set(G.nodes()) == set(WD._G.nodes())
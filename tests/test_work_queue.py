@@ -0,0 +1,50 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+from WorkQueue import WorkQueue
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+
+def test_queue_survives_reopening(tmp_path):
+    path = str(tmp_path / 'queue.sqlite')
+    queue = WorkQueue(path)
+    queue.push([URL + x for x in 'ABCD'])
+    assert queue.pop(2) == [URL + 'A', URL + 'B']
+    queue.done(URL + 'A')
+    queue.commit()
+    # B Was Still in Flight, so It Waits Again in Its Place
+    reopened = WorkQueue(path)
+    assert reopened.waiting() == 3
+    # Pages Already Done Are Not Queued Again
+    reopened.push([URL + 'A', URL + 'E'])
+    assert reopened.waiting() == 4
+    assert reopened.pop(10) == [URL + x for x in 'BCDE']
+
+
+def test_indegree_order_survives_reopening(tmp_path):
+    path = str(tmp_path / 'queue.sqlite')
+    queue = WorkQueue(path, priority='indegree')
+    queue.push([URL + 'A', URL + 'B', URL + 'C'])
+    assert queue.pop(1) == [URL + 'A']
+    queue.done(URL + 'A')
+    queue.push([URL + 'C', URL + 'A'])
+    queue.commit()
+    reopened = WorkQueue(path, priority='indegree')
+    assert reopened.waiting() == 2
+    assert reopened.pop(10) == [URL + 'C', URL + 'B']
+
+
+def test_failed_pages_given_up_then_retried(tmp_path):
+    queue = WorkQueue(str(tmp_path / 'queue.sqlite'), max_tries=2)
+    queue.push([URL + 'A', URL + 'B'])
+    assert queue.pop(1) == [URL + 'A']
+    queue.fail(URL + 'A')
+    # Queued Again Behind B
+    assert queue.pop(10) == [URL + 'B', URL + 'A']
+    queue.fail(URL + 'A')
+    assert queue.failed() == [URL + 'A']
+    assert queue.retry_failed() == 1
+    assert queue.pop(10) == [URL + 'A']
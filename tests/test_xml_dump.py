@@ -0,0 +1,75 @@
+# !/usr/bin/env python3
+# Author: Austin Smith - https://github.com/aws24689
+# PEP-8
+
+# Import Dependencies
+import bz2
+from XMLDump import XMLDumpReader, extract_wikilinks
+from WikiDump import WikiDump
+from CheckpointLog import CheckpointLog
+
+URL = 'https://en.wikipedia.org/wiki/'
+
+PAGE = '''  <page>
+    <title>{title}</title>
+    <ns>{ns}</ns>{redirect}
+    <revision>
+      <text xml:space="preserve">{text}</text>
+    </revision>
+  </page>
+'''
+
+
+def write_dump(path, pages):
+    """Writes a small pages-articles dump of (title, ns, redirect, text) pages."""
+    body = ['<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/">\n  <siteinfo>\n    <namespaces>\n',
+            '      <namespace key="0" />\n      <namespace key="6">File</namespace>\n',
+            '      <namespace key="14">Category</namespace>\n      <namespace key="4">Wikipedia</namespace>\n',
+            '    </namespaces>\n  </siteinfo>\n']
+    for title, ns, redirect, text in pages:
+        body.append(PAGE.format(title=title, ns=ns, text=text,
+                                redirect='\n    <redirect title="{}" />'.format(redirect) if redirect else ''))
+    body.append('</mediawiki>\n')
+    with bz2.open(path, 'wt', encoding='utf-8') as handle:
+        handle.write(''.join(body))
+
+
+def test_namespace_aliases():
+    text = ('[[Alan Turing]] [[File:Turing.jpg|thumb]] [[Image:Turing.jpg]] [[WP:NPOV]] [[Image_talk:X]] '
+            '[[Category:Logic]] [[de:Alan Turing]] [[Halting problem#Proof|proof]] [[:Category:Logic]] '
+            '[[computability  theory]] [[Star Trek: Voyager]]')
+    links = extract_wikilinks(text, namespaces={'file', 'category', 'wikipedia'})
+    assert links == ['Alan Turing', 'Computability theory', 'Star Trek: Voyager']
+
+
+def test_bounded_workers_keep_order(tmp_path):
+    path = str(tmp_path / 'pages-articles.xml.bz2')
+    pages = [('Page {}'.format(i), 0, None, '[[Page {}]] [[Image:P{}.png]] {{{{cite|[[Page 0]]}}}}'.format(i + 1, i))
+             for i in range(500)]
+    pages += [('Talk:Page 1', 1, None, '[[Page 2]]'), ('Page one', 0, 'Page 1', '#REDIRECT [[Page 1]]')]
+    write_dump(path, pages)
+    serial = list(XMLDumpReader(path).iter_links())
+    assert len(serial) == 501
+    assert serial[0] == ('https://en.wikipedia.org/wiki/Page_0', None, ['https://en.wikipedia.org/wiki/Page_1'])
+    assert serial[-1] == ('https://en.wikipedia.org/wiki/Page_one', 'https://en.wikipedia.org/wiki/Page_1', [])
+    assert list(XMLDumpReader(path, workers=2, chunk_size=16).iter_links()) == serial
+
+
+def test_ingest_dump(tmp_path):
+    path = str(tmp_path / 'pages-articles.xml.bz2')
+    write_dump(path, [('Alan Turing', 0, None, "[[Enigma machine]] [[Turing's proof|proof]] [[Image:Turing.jpg]]"),
+                      ("Turing's proof", 0, 'Halting problem', '#REDIRECT [[Halting problem]]'),
+                      ('Halting problem', 0, None, '[[Alan Turing]] [[Category:Logic]]'),
+                      ('Enigma machine', 0, None, '{{Infobox|[[Germany]]}} [[alan_Turing]]'),
+                      ('Category:Logic', 14, None, '[[Alan Turing]]')])
+    WD = WikiDump(seed_page=URL + 'Alan_Turing', save_path=str(tmp_path / 'dump.pickle'), suppress_output=True)
+    WD.ingest_dump(path, workers=2)
+    assert set(WD._G.edges()) == {(URL + 'Alan_Turing', URL + 'Enigma_machine'),
+                                  (URL + 'Alan_Turing', URL + 'Halting_problem'),
+                                  (URL + 'Halting_problem', URL + 'Alan_Turing'),
+                                  (URL + 'Enigma_machine', URL + 'Alan_Turing')}
+    assert WD._index.canonical(URL + "Turing's_proof") == URL + 'Halting_problem'
+    # The Log Compacted at the End Replays the Same Graph
+    G, viewed = CheckpointLog(str(tmp_path / 'dump.log')).replay()
+    assert set(G.edges()) == set(WD._G.edges())
+    assert set(viewed) == {URL + 'Alan_Turing', URL + 'Halting_problem', URL + 'Enigma_machine'}